@@ -0,0 +1,35 @@
+"""
+Documentation of the options of one ganeti instance definition
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type  # pylint: disable=invalid-name
+
+
+class ModuleDocFragment:  # pylint: disable=too-few-public-methods
+    """Options of one instance, shared by the gnt-instance modules
+    """
+
+    DOCUMENTATION = r'''
+options:
+    name:
+        description: The name of instance
+        required: true
+        type: str
+    state:
+        description: Instance must be present of absent
+        required: false
+        type: str
+    admin_state:
+        description: Health cycle of instance
+        required: false
+        type: str
+    reboot_if_have_any_change:
+        description: Reboot the instance if have modification onto instance
+        required: false
+        type: bool
+    options:
+        description: Ganeti instance options
+        required: false
+        type: dict
+'''
@@ -1,9 +1,13 @@
 """
-Module contains the arguments spec of gnt-instance module
+Module contains the arguments spec of gnt-instance modules
 """
 from collections import UserDict
 from ansible_collections.lecontesteur.ganeti_cli.plugins.\
     module_utils.builder_command_options.builders import DEFAULT_VALUE
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.gnt_instance_args_spec import GNT_INSTANCE_OPTIONS_ARGS_SPEC
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.rapi import RAPI_PORT_DEFAULT
 
 
 MAX_NICS = 8
@@ -214,3 +218,61 @@ ganeti_instance_args_spec = {
     "name_check": ArgumentSpec(type='bool', default=False, gnt_list_ignore=True),
     "ip_check": ArgumentSpec(type='bool', default=False, gnt_list_ignore=True),
 }
+
+state_choices = ['present', 'absent']
+admin_state_choices = ['restarted', 'started', 'stopped']
+
+
+def gnt_instance_module_args(options_args_spec: dict) -> dict:
+    """Build the arguments spec of one instance for the gnt-instance modules
+
+    Args:
+        options_args_spec (dict): The arguments spec of instance options
+
+    Returns:
+        dict: The arguments spec
+    """
+    return {
+        "name": {"type": 'str', "required": True, "aliases": ['instance_name']},
+        "state": {
+            "type": 'str', "required": False, "default": 'present', "choices": state_choices
+        },
+        "options": options_args_spec,
+        "admin_state": {
+            "type": 'str', "required": False, "default": 'started', "choices": admin_state_choices
+        },
+        "reboot_if_have_any_change": {"type": 'bool', "required": False, "default": False},
+    }
+
+
+GNT_INSTANCE_MODULE_ARGS = gnt_instance_module_args(GNT_INSTANCE_OPTIONS_ARGS_SPEC)
+
+GNT_INSTANCES_MODULE_ARGS = {
+    "instances": {
+        "type": 'list',
+        "elements": 'dict',
+        "required": True,
+        "options": GNT_INSTANCE_MODULE_ARGS,
+    },
+    "max_workers": {"type": 'int', "required": False, "default": 1},
+    "max_per_node": {"type": 'int', "required": False, "default": 1},
+    "batch_create": {"type": 'bool', "required": False, "default": False},
+    "opportunistic_locking": {"type": 'bool', "required": False, "default": False},
+    "max_resubmit": {"type": 'int', "required": False, "default": 3},
+    "config_data": {"type": 'str', "required": False},
+    "luxi_socket": {"type": 'str', "required": False},
+    "rapi": {
+        "type": 'dict',
+        "required": False,
+        "options": {
+            "host": {"type": 'str', "required": True},
+            "port": {"type": 'int', "required": False, "default": RAPI_PORT_DEFAULT},
+            "scheme": {
+                "type": 'str', "required": False, "default": 'https', "choices": ['http', 'https']
+            },
+            "username": {"type": 'str', "required": False},
+            "password": {"type": 'str', "required": False, "no_log": True},
+            "verify": {"type": 'bool', "required": False, "default": True},
+        },
+    },
+}
@@ -5,7 +5,8 @@ import copy
 from enum import Enum
 from functools import wraps
 from itertools import chain, zip_longest
-from typing import Any, Dict, Iterator, List, Callable
+from typing import Any, Dict, Iterator, List, Callable, Tuple
+from collections import namedtuple
 from collections.abc import Iterable
 from ansible_collections.lecontesteur.ganeti_cli.plugins.\
     module_utils.builder_command_options.builder_functions import (
@@ -18,6 +19,7 @@ from ansible_collections.lecontesteur.ganeti_cli.plugins.\
     )
 from ansible_collections.lecontesteur.ganeti_cli.plugins.\
     module_utils.builder_command_options.extractors import (
+        DecodedInfo,
         ValueInfoExtractor,
         ValueParamExtractor,
         recursive_get,
@@ -30,12 +32,32 @@ from ansible_collections.lecontesteur.ganeti_cli.plugins.\
         Prefix,
         PrefixIndex,
         PrefixNone,
+        PrefixTypeEnum,
+        format_prefix,
     )
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.instance_diff import (
+    FieldChange,
+    InstanceDiff,
+)
 
 
 DEFAULT_VALUE = 'default'
 NONE_VALUE = 'None'
 IGNORE_INFO_KEY = object()
+IGNORE_OPCODE_KEY = object()
+
+
+class Opcode(namedtuple('Opcode', ['key', 'value'])):
+    """Mapping of a spec into the instance creation opcode, used by batch-create.
+    The key is the opcode parameter name, the value converts the param value
+    """
+    __slots__ = ()
+
+    def __new__(cls, key: str = None, value: Callable[[Any], Any] = None):
+        return super().__new__(cls, key, value)
+
+
+IGNORE_OPCODE = Opcode(IGNORE_OPCODE_KEY)
 
 PrefixBuilder = Callable[[Any, Any], Prefix]
 
@@ -84,6 +106,7 @@ class BuilderCommandOptionsSpecAbstract:
     ) -> None:
         self._name = name
         self._info_key = info_key
+        self._opcode = kwargs.pop('opcode', None) or Opcode()
         self.parent = parent
         self._param_extractor = param_extractor
         self._info_extractor = info_extractor
@@ -135,6 +158,33 @@ class BuilderCommandOptionsSpecAbstract:
             Iterator[str]: The information keys
         """
 
+    @property
+    def opcode_key(self) -> str:
+        """Get the key in the instance creation opcode, used by batch-create.
+        Default is the name with underscore
+
+        Returns:
+            str: The key. None if ignored in opcode
+        """
+        if self._opcode.key == IGNORE_OPCODE_KEY:
+            return None
+        if self._opcode.key:
+            return self._opcode.key
+        return self.name.replace('-', '_') if self.name else None
+
+    def opcode_value(self, value: Any) -> Any:
+        """Convert the param value to the opcode value
+
+        Args:
+            value (Any): The param value
+
+        Returns:
+            Any: The opcode value
+        """
+        if self._opcode.value is None:
+            return value
+        return self._opcode.value(value)
+
     @abc.abstractmethod
     def to_args_spec(self) -> Dict:
         """Generate ansible module args spec
@@ -145,42 +195,54 @@ class BuilderCommandOptionsSpecAbstract:
 
     def to_options(
         self, ansible_param: dict, info: dict, to_command: CommandType = None
-    ) -> Iterator[str]:
-        """Generate command options
+    ) -> List[str]:
+        """Generate command options with the compiled specification
 
         Args:
             ansible_param (dict): The ansible module param
             info (dict): The vm information
-            create (bool): Option when create
+            to_command (CommandType, optional): Type of command. Defaults to None.
 
         Returns:
-           Iterator[str]: The list of command options
-
-        Yields:
-            Iterator[str]: The list of command options
+           List[str]: The list of command options
         """
         if not self.must_generate_option(to_command):
             return []
-        return self._to_options(
-            ansible_param=ansible_param,
-            info=info,
-            to_command=to_command
-        )
+        return plan_options(self.compile(), ansible_param, info, to_command)
+
+    def to_opcode(self, ansible_param: dict) -> Dict:
+        """Generate the parameters of instance creation opcode.
+        Use by batch-create instead of command options
+
+        Args:
+            ansible_param (dict): The ansible module param
+
+        Returns:
+            Dict: The opcode parameters
+        """
+        if not self.must_generate_option(CommandType.CREATE) \
+                or self._opcode.key == IGNORE_OPCODE_KEY:
+            return {}
+        return self._to_opcode(ansible_param)
 
     @abc.abstractmethod
-    def _to_options(self, ansible_param: dict, info: dict, to_command: CommandType) -> Iterator[str]:
-        """Generate command options
+    def _to_opcode(self, ansible_param: dict) -> Dict:
+        """Generate the parameters of instance creation opcode
 
         Args:
             ansible_param (dict): The ansible module param
-            info (dict): The vm information
-            create (bool): Option when create
 
         Returns:
-           Iterator[str]: The list of command options
+            Dict: The opcode parameters
+        """
 
-        Yields:
-            Iterator[str]: The list of command options
+    @abc.abstractmethod
+    def compile(self) -> List['CompiledOption']:
+        """Compile the specification in flat list of options,
+        with the precomputed param and info keys
+
+        Returns:
+            List[CompiledOption]: The compiled options
         """
 
     def must_generate_option(self, to_command: CommandType) -> bool:
@@ -212,8 +274,14 @@ class BuilderCommandOptionsSpec(BuilderCommandOptionsSpecAbstract):
             spec.name: spec.to_args_spec() for spec in self._spec
         }
 
-    def _to_options(self, ansible_param, info, to_command) -> Iterator[str]:
-        return chain(*[spec.to_options(ansible_param, info, to_command) for spec in self._spec])
+    def compile(self) -> List['CompiledOption']:
+        return list(chain.from_iterable(spec.compile() for spec in self._spec))
+
+    def _to_opcode(self, ansible_param) -> Dict:
+        opcode = {}
+        for spec in self._spec:
+            opcode.update(spec.to_opcode(ansible_param))
+        return opcode
 
 
 class BuilderCommandOptionsRootSpec(BuilderCommandOptionsSpec):
@@ -251,21 +319,12 @@ class BuilderCommandOptionsSpecDict(BuilderCommandOptionsSpec):
             'options': super().to_args_spec(),
         }
 
-    def _to_options(self, ansible_param, info, to_command) -> List[str]:
-        prefix = PrefixNone()
-        if self.prefix_builder is not None:
-            prefix = self.prefix_builder(ansible_param, info)
-        option = ','.join(
-            chain.from_iterable(
-                [spec.to_options(ansible_param, info, to_command)
-                 for spec in self._spec]
-            )
-        )
-        return [build_options_with_prefixes(
-            [option] if option else [],
-            option_name=self.name,
-            prefixes=prefix
-        )]
+    def _to_opcode(self, ansible_param) -> Dict:
+        opcode = super()._to_opcode(ansible_param)
+        return {self.opcode_key: opcode} if opcode else {}
+
+    def compile(self) -> List['CompiledOption']:
+        return [CompiledDictOption(self, super().compile())]
 
 
 class BuilderCommandOptionsSpecList(BuilderCommandOptionsSpec):
@@ -277,6 +336,23 @@ class BuilderCommandOptionsSpecList(BuilderCommandOptionsSpec):
     ) -> None:
         super().__init__(*args, **kwargs)
         self.no_option = no_option
+        self._elements = {}
+
+    def element(self, index: int) -> '_BuilderCommandOptionsSpecListElement':
+        """Get the view of sub specifications for the element of index.
+        The view is created once by index, and shared by all generations
+
+        Args:
+            index (int): The index in list
+
+        Returns:
+            _BuilderCommandOptionsSpecListElement: The element view
+        """
+        if index not in self._elements:
+            self._elements[index] = _BuilderCommandOptionsSpecListElement(
+                *self._spec, index=index
+            )
+        return self._elements[index]
 
     def to_args_spec(self) -> Dict:
         return {
@@ -285,45 +361,33 @@ class BuilderCommandOptionsSpecList(BuilderCommandOptionsSpec):
             'options': super().to_args_spec(),
         }
 
-    def _to_options(self, ansible_param, info, to_command) -> Iterator[str]:
-        param_value = self._param_extractor(ansible_param, self.names()) or []
-        info_value = self._info_extractor(info, self.info_keys()) or []
-        size_param_list, size_info_list = len(param_value), len(info_value)
-
-        if to_command == CommandType.CREATE and size_param_list == 0:
-            return [self.no_option] if self.no_option else []
-        if to_command == CommandType.MODIFY and size_param_list == 0:
-            return []
-
-        if to_command == CommandType.CREATE:
-            prefixes = PrefixIndex()
-        else:
-            prefixes = list(build_prefixes_from_count_diff(
-                size_param_list, size_info_list))
+    def _to_opcode(self, ansible_param) -> Dict:
+        param_value = self._param_extractor(ansible_param, self.names())
+        if param_value is None:
+            return {}
+        return {
+            self.opcode_key: [
+                self.element(index).to_opcode(value)
+                for index, value in enumerate(param_value)
+            ]
+        }
 
-        return [
-            build_options_with_prefixes(
-                chain.from_iterable([
-                    _BuilderCommandOptionsSpecListElement(
-                        *self._spec, index=index)
-                    .to_options(value[0], value[1], to_command)
-                    for index, value in enumerate(
-                        zip_longest(param_value, info_value, fillvalue={})
-                    )
-                ]),
-                self.name,
-                prefixes=prefixes
-            )
-        ]
+    def compile(self) -> List['CompiledOption']:
+        return [CompiledListOption(self, [
+            CompiledElementOption(spec, names=[spec.name], info_keys=[spec.info_key])
+            for spec in self._spec
+        ])]
 
 
 class _BuilderCommandOptionsSpecListElement(BuilderCommandOptionsSpecAbstract):
-    """Intermediate Element list builder for remove parent names and information
+    """Intermediate Element list builder for remove parent names and information.
+    The sub specifications are shallow copies: they share the extractors and
+    arguments of list specification, only the parent and index are their own.
     """
 
     def __init__(self, *args: List[BuilderCommandOptionsSpecAbstract], index: int = None) -> None:
         super().__init__(parent=None, name=None, info_key=None)
-        self._spec = copy.deepcopy(args)
+        self._spec = tuple(copy.copy(spec) for spec in args)
         for spec in self._spec:
             spec.parent = self
             spec.set_index(index)
@@ -331,14 +395,19 @@ class _BuilderCommandOptionsSpecListElement(BuilderCommandOptionsSpecAbstract):
     def to_args_spec(self) -> Dict:
         pass
 
-    def _to_options(self, ansible_param, info, to_command) -> Iterator[str]:
-        return [
-            ','.join(
-                chain.from_iterable(
-                    [spec.to_options(ansible_param, info, to_command) for spec in self._spec])
-            )
+    def to_options(self, ansible_param, info, to_command=None) -> List[str]:
+        return [','.join(chain.from_iterable(
+            spec.to_options(ansible_param, info, to_command) for spec in self._spec
+        ))]
 
-        ]
+    def _to_opcode(self, ansible_param) -> Dict:
+        opcode = {}
+        for spec in self._spec:
+            opcode.update(spec.to_opcode(ansible_param))
+        return opcode
+
+    def compile(self) -> List['CompiledOption']:
+        return list(chain.from_iterable(spec.compile() for spec in self._spec))
 
 
 class BuilderCommandOptionsSpecElement(BuilderCommandOptionsSpecAbstract):
@@ -355,15 +424,14 @@ class BuilderCommandOptionsSpecElement(BuilderCommandOptionsSpecAbstract):
     def to_args_spec(self) -> Dict:
         return self._extra_args
 
-    def _to_options(self, ansible_param, info, to_command) -> Iterator[str]:
+    def _to_opcode(self, ansible_param) -> Dict:
         param_value = self._param_extractor(ansible_param, self.names())
-        info_value = self._info_extractor(info, self.info_keys())
-        if param_value == info_value:
-            return []
-        value = self._default or self.default_ganeti
-        if param_value is not None and info_value != param_value:
-            value = param_value
-        return [self.build_function(self.name, value)]
+        if param_value is None:
+            return {}
+        return {self.opcode_key: self.opcode_value(param_value)}
+
+    def compile(self) -> List['CompiledOption']:
+        return [CompiledElementOption(self)]
 
 
 class BuilderCommandOptionsSpecSubElement(BuilderCommandOptionsSpecElement):
@@ -418,6 +486,15 @@ class BuilderCommandOptionsSpecStateElement(BuilderCommandOptionsSpecElement):
                          build_function=build_state_option, **kwargs)
 
 
+class BuilderCommandOptionsSpecActionElement(BuilderCommandOptionsSpecStateElement):
+    """Action flag builder (Ex: --submit). The flag is not a state of instance: it is
+    never compared with the information, and it is added only to a command which runs
+    """
+
+    def compile(self) -> List['CompiledOption']:
+        return [CompiledActionOption(self)]
+
+
 class BuilderCommandOptionsSpecNoStateElement(BuilderCommandOptionsSpecElement):
     """No State builder
     """
@@ -427,11 +504,242 @@ class BuilderCommandOptionsSpecNoStateElement(BuilderCommandOptionsSpecElement):
             type='bool', default=default, build_function=build_no_state_option, **kwargs)
 
 
+# pylint: disable=too-few-public-methods
+class CompiledOption:
+    """Option of compiled specification. The param and info keys are computed
+    once by the compile step, the generation don't walk the specification tree
+    """
+
+    action = False
+
+    def __init__(self, spec: BuilderCommandOptionsSpecAbstract, names=None, info_keys=None) -> None:
+        # pylint: disable=protected-access
+        self.name = spec.name
+        self.names = tuple(filter(None, spec.names() if names is None else names))
+        self.info_keys = tuple(filter(None, spec.info_keys() if info_keys is None else info_keys))
+        self.param_extractor = spec._param_extractor
+        self.info_extractor = spec._info_extractor
+        self.only_commands = tuple(spec._only_commands)
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def options(
+        self, ansible_param: dict, info: dict, to_command: CommandType,
+        changes: List[FieldChange] = None, path: Tuple = ()
+    ) -> List[str]:
+        """Generate command options
+
+        Args:
+            ansible_param (dict): The ansible module param
+            info (dict): The vm information
+            to_command (CommandType): Type of command
+            changes (List[FieldChange], optional): The changed fields are
+                appended in this list. Defaults to None.
+            path (Tuple, optional): Path of parent, for the changed fields. Defaults to ().
+
+        Returns:
+            List[str]: The list of command options
+        """
+        if self.only_commands and to_command not in self.only_commands:
+            return []
+        return self._options(ansible_param, info, to_command, changes, path)
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    @abc.abstractmethod
+    def _options(
+        self, ansible_param: dict, info: dict, to_command: CommandType,
+        changes: List[FieldChange], path: Tuple
+    ) -> List[str]:
+        """Generate command options"""
+
+
+# pylint: disable=too-few-public-methods
+class CompiledElementOption(CompiledOption):
+    """Compiled element, one value compared to the information
+    """
+
+    def __init__(self, spec: BuilderCommandOptionsSpecElement, **kwargs) -> None:
+        super().__init__(spec, **kwargs)
+        # pylint: disable=protected-access
+        self.default = spec._default or spec.default_ganeti
+        self.build_function = spec.build_function
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _options(self, ansible_param, info, to_command, changes, path) -> List[str]:
+        param_value = self.param_extractor(ansible_param, self.names)
+        info_value = self.info_extractor(info, self.info_keys)
+        if param_value == info_value:
+            return []
+        value = self.default
+        if param_value is not None and info_value != param_value:
+            value = param_value
+        option = self.build_function(self.name, value)
+        if option and changes is not None:
+            changes.append(FieldChange(path + self.names, info_value, value, option))
+        return [option]
+
+
+# pylint: disable=too-few-public-methods
+class CompiledActionOption(CompiledElementOption):
+    """Compiled action flag, built from the param only, it is never a change
+    """
+
+    action = True
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _options(self, ansible_param, info, to_command, changes, path) -> List[str]:
+        return [self.build_function(self.name, self.param_extractor(ansible_param, self.names))]
+
+
+# pylint: disable=too-few-public-methods
+class CompiledDictOption(CompiledOption):
+    """Compiled dictionnary, the elements are joined in one option
+    """
+
+    def __init__(self, spec: BuilderCommandOptionsSpecDict, elements: List[CompiledOption]) -> None:
+        super().__init__(spec)
+        self.prefix_builder = spec.prefix_builder
+        self.elements = elements
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _options(self, ansible_param, info, to_command, changes, path) -> List[str]:
+        prefix = PrefixNone()
+        if self.prefix_builder is not None:
+            prefix = self.prefix_builder(ansible_param, info)
+        option = ','.join(chain.from_iterable(
+            element.options(ansible_param, info, to_command, changes, path)
+            for element in self.elements
+        ))
+        return [build_options_with_prefixes(
+            [option] if option else [],
+            option_name=self.name,
+            prefixes=prefix
+        )]
+
+
+class CompiledListOption(CompiledOption):
+    """Compiled list, the elements are compared with the information of same index
+    """
+
+    def __init__(
+        self, spec: BuilderCommandOptionsSpecList, elements: List[CompiledElementOption]
+    ) -> None:
+        super().__init__(spec)
+        self.no_option = spec.no_option
+        self.elements = elements
+        self._indexed = any('{' in key for element in elements for key in element.info_keys)
+        self._indexed_elements = {}
+
+    def elements_at(self, index: int) -> List[CompiledElementOption]:
+        """Elements with the info keys of index, for the keys which depend of index
+
+        Args:
+            index (int): The index in list
+
+        Returns:
+            List[CompiledElementOption]: The elements
+        """
+        if not self._indexed:
+            return self.elements
+        if index not in self._indexed_elements:
+            elements = []
+            for element in self.elements:
+                element = copy.copy(element)
+                element.info_keys = tuple(key.format(index) for key in element.info_keys)
+                elements.append(element)
+            self._indexed_elements[index] = elements
+        return self._indexed_elements[index]
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _options(self, ansible_param, info, to_command, changes, path) -> List[str]:
+        param_value = self.param_extractor(ansible_param, self.names) or []
+        info_value = self.info_extractor(info, self.info_keys) or []
+        size_param_list, size_info_list = len(param_value), len(info_value)
+
+        if to_command == CommandType.CREATE and size_param_list == 0:
+            return [self.no_option] if self.no_option else []
+        if to_command == CommandType.MODIFY and size_param_list == 0:
+            return []
+
+        if to_command == CommandType.CREATE:
+            prefixes = PrefixIndex()
+        else:
+            prefixes = list(build_prefixes_from_count_diff(size_param_list, size_info_list))
+            if changes is not None:
+                changes.extend(
+                    FieldChange(
+                        path + self.names + (index,), info_value[index], None,
+                        '--{} {}'.format(self.name, format_prefix(prefix, index))
+                    )
+                    for index, prefix in enumerate(prefixes)
+                    if prefix.type == PrefixTypeEnum.REMOVE
+                )
+
+        return [
+            build_options_with_prefixes(
+                [
+                    ','.join(chain.from_iterable(
+                        element.options(
+                            value[0], value[1], to_command,
+                            # The options of removed elements are not in command
+                            changes if index < size_param_list else None,
+                            path + self.names + (index,)
+                        )
+                        for element in self.elements_at(index)
+                    ))
+                    for index, value in enumerate(
+                        zip_longest(param_value, info_value, fillvalue={})
+                    )
+                ],
+                self.name,
+                prefixes=prefixes
+            )
+        ]
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def plan_options(
+    plan: List[CompiledOption], ansible_param: dict, info: dict, to_command: CommandType,
+    changes: List[FieldChange] = None
+) -> List[str]:
+    """Generate the options of compiled options. The action flags are added only if
+    the command runs: a creation, or a modification with other options
+
+    Args:
+        plan (List[CompiledOption]): The compiled options
+        ansible_param (dict): The ansible module param
+        info (dict): The vm information
+        to_command (CommandType): Type of command
+        changes (List[FieldChange], optional): The changed fields are
+            appended in this list. Defaults to None.
+
+    Returns:
+        List[str]: The list of command options
+    """
+    options, actions = [], []
+    for option in plan:
+        (actions if option.action else options).extend(
+            option.options(ansible_param, info, to_command, changes)
+        )
+    if to_command != CommandType.MODIFY or any(options):
+        options.extend(actions)
+    return options
+
+
 class BuilderCommand:
-    """Generate final command options"""
+    """Generate final command options.
+    The specification is compiled at first generation, the plan is reused by next generations
+    """
 
     def __init__(self, spec: BuilderCommandOptionsSpec) -> None:
         self.spec = spec
+        self._plan = None
+
+    @property
+    def plan(self) -> List[CompiledOption]:
+        """The compiled specification, flat list of options"""
+        if self._plan is None:
+            self._plan = self.spec.compile()
+        return self._plan
 
     def generate_args_spec(self) -> Dict:
         """Generate Args spec"""
@@ -444,13 +752,38 @@ class BuilderCommand:
         info_data: dict,
         to_command: CommandType = None
     ) -> str:
-        """Generate Options"""
-        return ' '.join(
-            filter(
-                lambda x: x,
-                chain(
-                    extra_options,
-                    self.spec.to_options(module_params, info_data, to_command)
-                )
-            )
-        )
+        """Generate Options. The information is decoded once before the comparisons"""
+        info_data = DecodedInfo.decode(info_data)
+        if not self.spec.must_generate_option(to_command):
+            return ' '.join(filter(lambda x: x, extra_options))
+        options = list(extra_options)
+        options.extend(plan_options(self.plan, module_params, info_data, to_command))
+        return ' '.join(filter(lambda x: x, options))
+
+    def diff(
+        self, module_params: dict, info_data: dict, to_command: CommandType = CommandType.MODIFY
+    ) -> InstanceDiff:
+        """Compute the difference between module params and information, in one generation
+
+        Args:
+            module_params (dict): The module params
+            info_data (dict): The vm information
+            to_command (CommandType, optional): Type of command. Defaults to CommandType.MODIFY.
+
+        Returns:
+            InstanceDiff: The options and the changed fields. The path of fields
+                is relative to the root specification
+        """
+        info_data = DecodedInfo.decode(info_data)
+        changes = []
+        options = []
+        if self.spec.must_generate_option(to_command):
+            options = plan_options(self.plan, module_params, info_data, to_command, changes)
+        for change in changes:
+            if change.path[:1] == (self.spec.name,):
+                change.path = change.path[1:]
+        return InstanceDiff(' '.join(filter(lambda x: x, options)), changes)
+
+    def generate_opcode(self, module_params: dict) -> Dict:
+        """Generate the parameters of instance creation opcode"""
+        return self.spec.to_opcode(module_params)
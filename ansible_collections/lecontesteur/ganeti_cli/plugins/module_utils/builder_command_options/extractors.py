@@ -3,11 +3,65 @@
 import re
 from functools import reduce
 from typing import List, Any, Callable, Dict
-import yaml
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.parse_info_response import (
+    load_scalar,
+)
 
 DefaultValidator = Callable[[str], bool]
 
 
+class DecodedInfo(dict):
+    """Snapshot of vm information with typed values. The strings are decoded
+    once when the snapshot is built, the raw strings are kept for the default validators.
+    The decode of repeated raw strings (Ex: default (None)) is memoized by load_scalar.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.raw = {}
+
+    @classmethod
+    def decode(cls, info: Any) -> Any:
+        """Build the snapshot of information
+
+        Args:
+            info (Any): The vm information, as parsed from ganeti output
+
+        Returns:
+            Any: The snapshot. The information is returned if already decoded
+        """
+        if isinstance(info, DecodedInfo):
+            return info
+        if isinstance(info, dict):
+            decoded = cls()
+            for key, value in info.items():
+                if isinstance(value, str):
+                    decoded.raw[key] = value
+                    value = load_scalar(value)
+                decoded[key] = cls.decode(value)
+            return decoded
+        if isinstance(info, list):
+            return [cls.decode(value) for value in info]
+        return info
+
+    def value(self, key: str, default_validator: DefaultValidator = None) -> Any:
+        """Get typed value
+
+        Args:
+            key (str): The key
+            default_validator (DefaultValidator, optional): Default validator,
+                called with the raw string. Defaults to None.
+
+        Returns:
+            Any: Value. None if is a default value
+        """
+        raw = self.raw.get(key)
+        if default_validator and raw is not None and default_validator(raw):
+            return None
+        return self.get(key)
+
+
 def dict_get(data: dict, key: str) -> Any:
     """Get element in dict
 
@@ -33,7 +87,8 @@ def recursive_get(data: dict, keys: List[str]) -> Any:
     Returns:
         Any: _description_
     """
-    keys = list(keys)
+    if not isinstance(keys, (list, tuple)):
+        keys = list(keys)
     if len(keys) == 0:
         return None
     return reduce(dict_get, keys, data)
@@ -80,12 +135,19 @@ def value_info_extractor(data: dict, keys: List[str], default_validator: Default
     Returns:
         Any: Value. None if is a default value
     """
+    if isinstance(data, DecodedInfo):
+        if not isinstance(keys, (list, tuple)):
+            keys = list(keys)
+        parent = recursive_get(data, keys[:-1]) if len(keys) > 1 else data
+        if not keys or not isinstance(parent, DecodedInfo):
+            return None
+        return parent.value(keys[-1], default_validator)
     value = recursive_get(data, keys)
     if not isinstance(value, str):
         return value
     if default_validator and default_validator(value):
         return None
-    return yaml.safe_load(value)
+    return load_scalar(value)
 
 
 def size_param_info_extractor(data: dict, keys: List[str]) -> Any:
@@ -1,8 +1,13 @@
 """
 Contains all commands of gnt-instance except gnt-instance list
 """
-from typing import Callable, Any, List, Union
+from typing import Callable, Any, Iterable, Iterator, List, Union
 from abc import ABC
+import io
+import re
+import shlex
+import subprocess
+import tempfile
 
 
 def build_ganeti_cmd(*args: List[str], binary: str, cmd: str) -> str:
@@ -20,6 +25,50 @@ class RunCommandException(Exception):
     """Exception after run_command"""
 
 
+class StreamCommandException(RunCommandException):
+    """Exception of streamed command which exit with error"""
+
+    def __init__(self, cmd: str, code: int, stderr: str) -> None:
+        super().__init__('Command "{}" failed with (code={}, stderr={})'.format(cmd, code, stderr))
+        self.cmd = cmd
+        self.code = code
+        self.stderr = stderr
+
+
+def iter_command_lines(cmd: str) -> Iterator[str]:
+    """Run the command and yield the lines of its output while it runs. The output
+    is never read in full. If the iteration is stopped, the command is terminated
+
+    Args:
+        cmd (str): The command, split like run_command without shell
+
+    Raises:
+        StreamCommandException: The command exit with error, after its last line
+
+    Yields:
+        Iterator[str]: Each line of output
+    """
+    with tempfile.TemporaryFile(mode='w+') as stderr:
+        # pylint: disable=consider-using-with
+        process = subprocess.Popen(
+            shlex.split(cmd), stdout=subprocess.PIPE, stderr=stderr, universal_newlines=True
+        )
+        finished = False
+        try:
+            yield from process.stdout
+            finished = True
+        finally:
+            process.stdout.close()
+            if not finished and process.poll() is None:
+                process.terminate()
+            process.wait()
+        if process.returncode != 0:
+            stderr.seek(0)
+            raise StreamCommandException(
+                cmd, process.returncode, stderr.read()
+            )
+
+
 def run_ganeti_cmd(
     *args,
     builder: Callable,
@@ -57,6 +106,18 @@ def parse_ganeti_cmd_output(*_, stdout: str, **__):
     """
     return None
 
+
+def parse_job_id(*_, stdout: str, **__) -> int:
+    """
+    Parser of the job id printed by ganeti cmd with --submit option
+    """
+    match = re.search(r'JobID:\s*(?P<job_id>\d+)', stdout or '')
+    if not match:
+        raise RunCommandException(
+            'No job id in output of submitted command: {}'.format(stdout)
+        )
+    return int(match.group('job_id'))
+
 # pylint: disable=too-few-public-methods
 
 
@@ -65,10 +126,12 @@ class GntCommand(ABC):
     Generic class for ganeti commands
     """
 
-    def __init__(self, run_function: Callable, error_function: Callable, binary: str = None) -> None:
+    def __init__(self, run_function: Callable, error_function: Callable, binary: str = None,
+                 stream_function: Callable = None) -> None:
         self.run_function = run_function
         self.error_function = error_function
         self.binary = binary
+        self.stream_function = stream_function
 
     def _run_command(self,
                      *args, command: str, parser: Callable = None, return_none_if_error=False,
@@ -97,3 +160,65 @@ class GntCommand(ABC):
                 )
             )
         return parser(*args, stdout=stdout, **kwargs)
+
+    def _stream_command(self, *args, command: str, parser: Callable, **kwargs) -> Iterator[Any]:
+        """
+        Run ganeti command and yield the items parsed while its output is read.
+        Raise StreamCommandException if the command failed
+        """
+        cmd = build_ganeti_cmd(*args, cmd=command, binary=self.binary)
+        lines = self._command_lines(cmd)
+        try:
+            yield from parser(*args, stdout=lines, **kwargs)
+        finally:
+            if hasattr(lines, 'close'):
+                lines.close()
+
+    def _command_lines(self, cmd: str) -> Iterable[str]:
+        """Lines of command output. They are streamed by stream_function if it is set
+        (Ex: iter_command_lines), else the command is run by run_function
+
+        Raises:
+            StreamCommandException: The command run by run_function failed
+        """
+        if self.stream_function is not None:
+            return self.stream_function(cmd)
+        code, stdout, stderr = self.run_function(cmd, check_rc=False)
+        if code != 0:
+            raise StreamCommandException(cmd, code, stderr)
+        return io.StringIO(stdout)
+
+    def _stream_error(self, error: StreamCommandException) -> Any:
+        if self.error_function:
+            return self.error_function(
+                error.code, '', error.stderr, msg='Command "{}" failed'.format(error.cmd)
+            )
+        raise error
+
+    def _iter_command(self,
+                      *args, command: str, parser: Callable, return_none_if_error=False,
+                      **kwargs) -> Iterator[Any]:
+        """
+        Generic runner function for ganeti command with streamed output.
+        The parser get an iterable of lines and yield the parsed items
+        """
+        try:
+            yield from self._stream_command(*args, command=command, parser=parser, **kwargs)
+        except StreamCommandException as error:
+            if not return_none_if_error:
+                self._stream_error(error)
+
+    def _collect_command(self,
+                         *args, command: str, parser: Callable, return_none_if_error=False,
+                         **kwargs) -> Union[None, List[Any]]:
+        """
+        Same as _run_command, the parser get an iterable of lines and the items are
+        collected while the output is read. With stream_function, the output is never
+        in memory
+        """
+        try:
+            return list(self._stream_command(*args, command=command, parser=parser, **kwargs))
+        except StreamCommandException as error:
+            if return_none_if_error:
+                return None
+            return self._stream_error(error)
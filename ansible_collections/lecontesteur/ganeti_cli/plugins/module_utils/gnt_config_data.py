@@ -0,0 +1,329 @@
+"""
+Read only query backend on the ganeti configuration file.
+Serve gnt-instance list and info --static records without run ganeti commands
+"""
+import json
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list import (
+    field_headers,
+    subheaders,
+)
+
+
+CONFIG_DATA_PATH_DEFAULT = '/var/lib/ganeti/config.data'
+MAX_LIST_INDEX = 8
+
+
+class ConfigDataError(Exception):
+    """Exception raise when the configuration file can't be read
+    """
+
+
+def format_size(size: int) -> str:
+    """Format a size in MiB like ganeti do for human output
+
+    Args:
+        size (int): The size in MiB
+
+    Returns:
+        str: The size with unit. Ex: 10.0G
+    """
+    if size < 1024:
+        return '{}M'.format(int(size))
+    if size < 1024 * 1024:
+        return '{:0.1f}G'.format(size / 1024.0)
+    return '{:0.1f}T'.format(size / 1024.0 / 1024.0)
+
+
+def parse_vlan(vlan: str) -> int:
+    """Parse the vlan of nic params. Ex: '.100' or ':100'
+
+    Args:
+        vlan (str): The vlan
+
+    Returns:
+        int: The vlan id. None if not set
+    """
+    vlan = (vlan or '').lstrip('.:')
+    if not vlan.isdigit():
+        return None
+    return int(vlan)
+
+
+def fill_params(defaults: Dict, params: Dict) -> Dict:
+    """Merge params of instance over the cluster defaults
+
+    Args:
+        defaults (Dict): The cluster defaults
+        params (Dict): The params of instance
+
+    Returns:
+        Dict: The effective params
+    """
+    filled = dict(defaults or {})
+    filled.update(params or {})
+    return filled
+
+
+def info_params(defaults: Dict, params: Dict) -> Dict:
+    """Format params like gnt-instance info: the value not set on instance
+    are 'default (value)'
+
+    Args:
+        defaults (Dict): The cluster defaults
+        params (Dict): The params of instance
+
+    Returns:
+        Dict: The params. None if empty
+    """
+    params = params or {}
+    formatted = OrderedDict()
+    for key in sorted(set(defaults or {}) | set(params)):
+        if key in params:
+            formatted[key] = params[key]
+        else:
+            formatted[key] = 'default ({})'.format(defaults[key])
+    return formatted or None
+
+
+def none_to_str(value):
+    """gnt-instance info print None for missing value
+
+    Args:
+        value (Any): The value
+
+    Returns:
+        Any: The value, 'None' if missing
+    """
+    return 'None' if value is None else value
+
+
+class GanetiConfigData:
+    """Load the ganeti configuration file and build records of instances.
+
+    The file is read again only when its modification time change, and records are
+    rebuilt only when the serial number of configuration change.
+    The runtime fields (oper_state, actual state) are not in configuration, they are None.
+    """
+
+    def __init__(
+        self, path: str = None, opener: Callable = open, stat: Callable = os.stat
+    ) -> None:
+        self.path = path or CONFIG_DATA_PATH_DEFAULT
+        self._opener = opener
+        self._stat = stat
+        self._mtime = None
+        self._config = None
+        self._records = None
+
+    @property
+    def serial_no(self) -> int:
+        return self.load().get('serial_no')
+
+    def load(self) -> Dict:
+        """Load the configuration, from cache if the file have not changed
+
+        Raises:
+            ConfigDataError: The file can't be read or is not a ganeti configuration
+
+        Returns:
+            Dict: The configuration
+        """
+        try:
+            mtime = self._stat(self.path).st_mtime
+            if self._config is not None and mtime == self._mtime:
+                return self._config
+            with self._opener(self.path) as config_file:
+                config = json.load(config_file)
+        except (OSError, ValueError) as exception:
+            raise ConfigDataError(
+                'Can\'t read ganeti configuration {}: {}'.format(self.path, exception)
+            ) from exception
+        if not isinstance(config, dict) or 'instances' not in config:
+            raise ConfigDataError('{} is not a ganeti configuration'.format(self.path))
+
+        self._mtime = mtime
+        if self._config is None or config.get('serial_no') != self._config.get('serial_no'):
+            self._config = config
+            self._records = None
+        return self._config
+
+    def _node_name(self, uuid: str) -> str:
+        node = self._config.get('nodes', {}).get(uuid)
+        return node['name'] if node else uuid
+
+    def _network_name(self, uuid: str) -> str:
+        network = self._config.get('networks', {}).get(uuid)
+        return network['name'] if network else uuid
+
+    def _disks(self, instance: Dict) -> List[Dict]:
+        # Since ganeti 2.16, instance have disk uuids, disks are in the top of configuration
+        disks = self._config.get('disks', {})
+        return [
+            disks[disk] if isinstance(disk, str) else disk
+            for disk in instance.get('disks') or []
+        ]
+
+    def _instances(self) -> Dict[str, Dict]:
+        if self._records is None:
+            self._records = OrderedDict(
+                (instance['name'], instance)
+                for instance in sorted(
+                    self._config['instances'].values(), key=lambda x: x['name']
+                )
+            )
+        return self._records
+
+    def instances(self, *names: List[str]) -> List[Dict]:
+        """Get the configuration of instances. Unknown names are ignored
+
+        Args:
+            names (List[str]): Name of instances. All instances if empty
+
+        Returns:
+            List[Dict]: The configuration of instances, sorted by name
+        """
+        self.load()
+        instances = self._instances()
+        if not names:
+            return list(instances.values())
+        return [instances[name] for name in sorted(set(names)) if name in instances]
+
+    def _list_fields(self, instance: Dict) -> Dict:
+        cluster = self._config.get('cluster', {})
+        hypervisor = instance.get('hypervisor')
+        beparams = fill_params(
+            cluster.get('beparams', {}).get('default'), instance.get('beparams')
+        )
+        hvparams = fill_params(
+            cluster.get('hvparams', {}).get(hypervisor), instance.get('hvparams')
+        )
+        disks = self._disks(instance)
+        nics = instance.get('nics') or []
+        fields = {
+            'name': instance['name'],
+            'admin_state': instance.get('admin_state'),
+            'oper_state': None,
+            'pnode': self._node_name(instance.get('primary_node')),
+            'os_type': instance.get('os'),
+            'hypervisor': hypervisor,
+            'disk_template': instance.get('disk_template'),
+            'hvparams': hvparams,
+            'hypervisor_params.kernel_args': hvparams.get('kernel_args'),
+            'hypervisor_params.kernel_path': hvparams.get('kernel_path'),
+            'backend_param.memory': beparams.get('maxmem', beparams.get('memory')),
+            'backend_param.vcpus': beparams.get('vcpus'),
+            'disk_count': len(disks),
+            'disk_sizes': [format_size(disk['size']) for disk in disks],
+            'nic_count': len(nics),
+            'nic_names': [nic.get('name') for nic in nics],
+            'nic_modes': [nic.get('nicparams', {}).get('mode') for nic in nics],
+            'nic_vlans': [nic.get('nicparams', {}).get('vlan') for nic in nics],
+        }
+        for index, disk in enumerate(disks[:MAX_LIST_INDEX]):
+            fields['disks.{}.size'.format(index)] = disk.get('size')
+            fields['disks.{}.spindles'.format(index)] = disk.get('spindles')
+        for index, nic in enumerate(nics[:MAX_LIST_INDEX]):
+            nicparams = nic.get('nicparams', {})
+            fields['nics.{}.ip'.format(index)] = nic.get('ip')
+            fields['nics.{}.mac'.format(index)] = nic.get('mac')
+            fields['nics.{}.mode'.format(index)] = nicparams.get('mode')
+            fields['nics.{}.link'.format(index)] = nicparams.get('link')
+            fields['nics.{}.vlan'.format(index)] = parse_vlan(nicparams.get('vlan'))
+            fields['nics.{}.network'.format(index)] = self._network_name(nic.get('network'))
+        return fields
+
+    def list(self, *names: List[str], header_names: List[str] = None) -> List[Dict]:
+        """Records of instances with the keys of gnt-instance list parser
+
+        Args:
+            names (List[str]): Name of instances. All instances if empty
+            header_names (List[str], optional): Column to get. Defaults to None, all columns.
+
+        Returns:
+            List[Dict]: The instances, one dict by instance
+        """
+        headers = subheaders(*header_names) if header_names else field_headers
+        records = []
+        for instance in self.instances(*names):
+            fields = self._list_fields(instance)
+            records.append(OrderedDict(
+                (header, fields.get(header)) for header in headers
+            ))
+        return records
+
+    def _info_nics(self, instance: Dict) -> List[Dict]:
+        nics = []
+        for index, nic in enumerate(instance.get('nics') or []):
+            nicparams = nic.get('nicparams', {})
+            nics.append({
+                'nic/{}'.format(index): None,
+                'MAC': none_to_str(nic.get('mac')),
+                'IP': none_to_str(nic.get('ip')),
+                'mode': nicparams.get('mode'),
+                'link': nicparams.get('link'),
+                'vlan': nicparams.get('vlan') or None,
+                'network': none_to_str(nic.get('network') and self._network_name(nic['network'])),
+                'UUID': nic.get('uuid'),
+                'name': none_to_str(nic.get('name')),
+            })
+        return nics or None
+
+    def _info_disks(self, instance: Dict) -> List[Dict]:
+        disks = []
+        for index, disk in enumerate(self._disks(instance)):
+            logical_id = disk.get('logical_id') or []
+            disks.append({
+                'disk/{}'.format(index): '{}, size {}'.format(
+                    disk.get('dev_type'), format_size(disk['size'])
+                ),
+                'access mode': disk.get('params', {}).get('access', 'rw'),
+                'logical_id': ', '.join(str(value) for value in logical_id),
+                'name': none_to_str(disk.get('name')),
+                'UUID': disk.get('uuid'),
+            })
+        return disks or None
+
+    def _info_record(self, instance: Dict) -> Dict:
+        cluster = self._config.get('cluster', {})
+        hypervisor = instance.get('hypervisor')
+        return {
+            'Instance name': instance['name'],
+            'UUID': instance.get('uuid'),
+            'Serial number': instance.get('serial_no'),
+            'State': 'configured to be {}'.format(instance.get('admin_state')),
+            'Nodes': [
+                {'primary': self._node_name(instance.get('primary_node'))},
+                {'secondaries': [
+                    self._node_name(node) for node in instance.get('secondary_nodes') or []
+                ] or None},
+            ],
+            'Operating system': instance.get('os'),
+            'Hypervisor': hypervisor,
+            'Hypervisor parameters': info_params(
+                cluster.get('hvparams', {}).get(hypervisor), instance.get('hvparams')
+            ),
+            'Back-end parameters': info_params(
+                cluster.get('beparams', {}).get('default'), instance.get('beparams')
+            ),
+            'NICs': self._info_nics(instance),
+            'Disk template': instance.get('disk_template'),
+            'Disks': self._info_disks(instance),
+            'name': instance['name'],
+            'admin_state': instance.get('admin_state'),
+            'state': None,
+        }
+
+    def info(self, *names: List[str]) -> List[Dict]:
+        """Records of instances with the keys of gnt-instance info --static parser
+
+        Args:
+            names (List[str]): Name of instances. All instances if empty
+
+        Returns:
+            List[Dict]: Instances information
+        """
+        return [self._info_record(instance) for instance in self.instances(*names)]
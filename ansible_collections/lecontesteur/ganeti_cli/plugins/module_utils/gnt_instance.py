@@ -1,25 +1,54 @@
 """
 Class GntInstance
 """
-from typing import Callable, Dict, List, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
+import json
+import operator
+import os
 import re
+import tempfile
 
 
 from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_command import (
     GntCommand,
+    parse_ganeti_cmd_output,
+    parse_job_id,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_executor import (
+    GntInstanceExecutor,
+    InstanceOperation,
+    InstanceOperationsResult,
 )
 from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list import (
     build_gnt_instance_list_arguments,
-    parse_ganeti_list_output
+    count_headers,
+    field_headers,
+    fill_missing_headers,
+    have_list_element_headers,
+    iter_ganeti_list_output,
+    max_list_counts,
+    parse_ganeti_list_output,
+    query_list,
+    subheaders,
+    to_compact_rows,
+    trim_list_element_headers,
 )
 
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.instance_diff import (
+    InstanceDiff,
+)
 from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.parse_info_response import (
-    parse_from_stdout
+    iter_from_stdout,
+    split_records
 )
 
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.builder_command_options.extractors import recursive_get
 from ansible_collections.lecontesteur.ganeti_cli.plugins.\
     module_utils.builder_command_options.builders import (
         BuilderCommand,
+        BuilderCommandOptionsSpecActionElement,
         BuilderCommandOptionsRootSpec,
         BuilderCommandOptionsSpecDict,
         BuilderCommandOptionsSpecElement,
@@ -29,47 +58,114 @@ from ansible_collections.lecontesteur.ganeti_cli.plugins.\
         BuilderCommandOptionsSpecNoStateElement,
         BuilderCommandOptionsSpecStateElement,
         BuilderCommandOptionsSpecSubElement,
-        CommandType
+        CommandType,
+        IGNORE_OPCODE,
+        Opcode
     )
 
 
 GNT_INSTALL_CMD_DEFAULT = 'gnt-instance'
+LIVE_STATE_HEADERS = ['name', 'admin_state', 'oper_state']
+INFO_RECORD_NAME = re.compile(r'^-\s+Instance name:\s*(?P<name>.+)$', re.MULTILINE)
 
 
-def parse_state(state: str) -> Tuple[bool, bool]:
-    """Parse the string for extract state and admin_state
+def parse_state(state: str) -> Tuple[str, str]:
+    """Parse the string for extract state and admin_state.
+    The static information have not actual state, the state is None
 
     Args:
         state (str): The string return by ganeti
 
     Returns:
-        Tuple[bool, bool]: state and admin_state
+        Tuple[str, str]: admin_state and state
     """
     match = re.match(
-        r'configured to be (?P<admin_state>\w+), actual state is (?P<state>\w+)',
+        r'configured to be (?P<admin_state>\w+)(, actual state is (?P<state>\w+))?',
         state
     )
     return match.group('admin_state'),  match.group('state')
 
 
-def parse_info_instances(*_, stdout: str, **__) -> List[Dict]:
+def params_have_submit(params: dict) -> bool:
+    """Check if the submit option is set in module params
+
+    Args:
+        params (dict): Param of ansible module
+
+    Returns:
+        bool: The command must be submitted
+    """
+    return bool(recursive_get(params, ['options', 'submit']))
+
+
+def submit_parser(submit: bool):
+    """Get the parser of command output depending of submit mode
+
+    Args:
+        submit (bool): The command is submitted
+
+    Returns:
+        Callable: parse_job_id if submitted, else default parser
+    """
+    return parse_job_id if submit else parse_ganeti_cmd_output
+
+
+def info_record_name(record: str) -> str:
+    """Get the instance name of info record without parse it
+
+    Args:
+        record (str): The text of one record
+
+    Returns:
+        str: The instance name. None if not found
+    """
+    match = INFO_RECORD_NAME.match(record)
+    return match.group('name').strip() if match else None
+
+
+def iter_info_instances(
+    *_, stdout: Union[str, Iterable[str]], names: List[str] = None, **__
+) -> Iterator[Dict]:
+    """Parse info return of ganeti commands, one instance at a time.
+    With names, the other records are not parsed, and the parse
+    stop when all instances are found
+
+    Args:
+        stdout (Union[str, Iterable[str]]): the information, or an iterable of its lines
+        names (List[str], optional): Name of instances to keep. Defaults to None, all.
+
+    Yields:
+        Iterator[Dict]: The information of each instance
+    """
+    missing = set(names) if names else None
+    for record in split_records(stdout):
+        if missing is not None:
+            name = info_record_name(record)
+            if name is not None and name not in missing:
+                continue
+        for info_instance in iter_from_stdout(stdout=record):
+            admin_state, state = parse_state(info_instance['State'])
+            info_instance['name'] = info_instance['Instance name'].strip()
+            info_instance['state'] = state
+            info_instance['admin_state'] = admin_state
+            yield info_instance
+            if missing is not None:
+                missing.discard(info_instance['name'])
+        if missing is not None and not missing:
+            return
+
+
+def parse_info_instances(*_, stdout: str, names: List[str] = None, **__) -> List[Dict]:
     """Parse info return of ganeti commands
 
     Args:
         stdout (str): the information
+        names (List[str], optional): Name of instances to keep. Defaults to None, all.
 
     Returns:
         List[Dict]: Lsit of information parsed
     """
-    info_instances = parse_from_stdout(stdout=stdout)
-    l_info = []
-    for info_instance in info_instances:
-        admin_state, state = parse_state(info_instance['State'])
-        info_instance['name'] = info_instance['Instance name'].strip()
-        info_instance['state'] = state
-        info_instance['admin_state'] = admin_state
-        l_info.append(info_instance)
-    return l_info
+    return list(iter_info_instances(stdout=stdout, names=names))
 
 
 disk_templates = ['sharedfile', 'diskless', 'plain', 'gluster', 'blockdev',
@@ -150,112 +246,141 @@ hypervisor_params_list = [
     "num_ttys",
 ]
 
-disks_options = [
-    BuilderCommandOptionsSpecListSubElement(
-        name='name', type="str", require=True),
-    BuilderCommandOptionsSpecListSubElement(
-        name='size', type="int", require=True, only=CommandType.CREATE),
-    BuilderCommandOptionsSpecListSubElement(
-        name='spindles', type="str", require=True),
-    BuilderCommandOptionsSpecListSubElement(
-        name='metavg', type="str", require=True),
-    BuilderCommandOptionsSpecListSubElement(
-        name='access', type="str", require=True),
-    BuilderCommandOptionsSpecListSubElement(
-        name='access', type="str", require=True),
-]
 
-nics_options = [
-    BuilderCommandOptionsSpecListSubElement(
-        name='name', type="str", require=True),
-    BuilderCommandOptionsSpecListSubElement(
-        name='link', type="str", require=True),
-    BuilderCommandOptionsSpecListSubElement(
-        name='vlan', type="str", require=False),
-    BuilderCommandOptionsSpecListSubElement(
-        name='network', type="str", require=False),
-    BuilderCommandOptionsSpecListSubElement(
-        name='mode', type="str", default='bridged', require=True),
-]
+@lru_cache(maxsize=None)
+def get_builder_gnt_instance_spec() -> BuilderCommandOptionsRootSpec:
+    """Build the specification of gnt-instance add and modify options.
+    The specification is built at first call, only when options are generated.
+    The module argument spec is the static GNT_INSTANCE_OPTIONS_ARGS_SPEC
 
-hypervisor_params = [
-    BuilderCommandOptionsSpecSubElement(name=param, type='str')
-    for param in hypervisor_params_list
-]
+    Returns:
+        BuilderCommandOptionsRootSpec: The specification
+    """
+    disks_options = [
+        BuilderCommandOptionsSpecListSubElement(
+            name='name', type="str", require=True),
+        BuilderCommandOptionsSpecListSubElement(
+            name='size', type="int", require=True, only=CommandType.CREATE),
+        BuilderCommandOptionsSpecListSubElement(
+            name='spindles', type="str", require=True),
+        BuilderCommandOptionsSpecListSubElement(
+            name='metavg', type="str", require=True),
+        BuilderCommandOptionsSpecListSubElement(
+            name='access', type="str", require=True),
+        BuilderCommandOptionsSpecListSubElement(
+            name='access', type="str", require=True),
+    ]
+
+    nics_options = [
+        BuilderCommandOptionsSpecListSubElement(
+            name='name', type="str", require=True),
+        BuilderCommandOptionsSpecListSubElement(
+            name='link', type="str", require=True),
+        BuilderCommandOptionsSpecListSubElement(
+            name='vlan', type="str", require=False),
+        BuilderCommandOptionsSpecListSubElement(
+            name='network', type="str", require=False),
+        BuilderCommandOptionsSpecListSubElement(
+            name='mode', type="str", default='bridged', require=True),
+    ]
+
+    hypervisor_params = [
+        BuilderCommandOptionsSpecSubElement(name=param, type='str')
+        for param in hypervisor_params_list
+    ]
+
+    backend_param = [
+        BuilderCommandOptionsSpecSubElement(name='maxmem', type='int'),
+        BuilderCommandOptionsSpecSubElement(name='minmem', type='int'),
+        BuilderCommandOptionsSpecSubElement(name='memory', type='int'),
+        BuilderCommandOptionsSpecSubElement(name='vcpus', type='int'),
+        BuilderCommandOptionsSpecSubElement(name='always_failover', type='bool'),
+    ]
+
+    return BuilderCommandOptionsRootSpec(
+        BuilderCommandOptionsSpecElement(
+            name='disk-template', type='str', choices=disk_templates,
+            info_key='Disk template'
+        ),
+        BuilderCommandOptionsSpecElement(
+            name='file-driver', type='str',
+            info_key='File driver'
+        ),
+        BuilderCommandOptionsSpecElement(
+            name='file-storage-dir', type='str',
+            info_key='File driver'
+        ),
+        BuilderCommandOptionsSpecList(
+            *disks_options,
+            name='disk',
+            info_key='Disks',
+            opcode=Opcode('disks')
+        ),
+        BuilderCommandOptionsSpecElement(
+            name='hypervisor', type='str', choices=hypervisor_choices,
+            info_key='Hypervisor'
+        ),
+        BuilderCommandOptionsSpecElementOnlyCreate(
+            name='iallocator', type='str', opcode=IGNORE_OPCODE),
+        BuilderCommandOptionsSpecList(
+            *nics_options,
+            name='net',
+            info_key='NICs',
+            opcode=Opcode('nics'),
+            no_option='--no-nics'
+        ),
+        BuilderCommandOptionsSpecElement(
+            name='os-type', type='str', info_key='Operating system'),
+        BuilderCommandOptionsSpecDict(
+            *hypervisor_params,
+            name='hypervisor-parameters',
+            info_key='Hypervisor parameters',
+            opcode=Opcode('hvparams')
+        ),
+        BuilderCommandOptionsSpecDict(
+            *backend_param,
+            name='backend-parameters',
+            info_key='Back-end parameters',
+            opcode=Opcode('beparams')
+        ),
+        BuilderCommandOptionsSpecActionElement(name='submit', opcode=IGNORE_OPCODE),
+        BuilderCommandOptionsSpecStateElement(name='ignore-ipolicy'),
+        BuilderCommandOptionsSpecStateElement(
+            name='opportunistic-locking', only=CommandType.CREATE),
+        BuilderCommandOptionsSpecStateElement(
+            name='offline', only=CommandType.MODIFY),
+        BuilderCommandOptionsSpecStateElement(
+            name='online', only=CommandType.MODIFY),
+        BuilderCommandOptionsSpecStateElement(
+            name='hotplug', only=CommandType.MODIFY),
+        BuilderCommandOptionsSpecStateElement(
+            name='hotplug-if-possible', only=CommandType.MODIFY),
+        BuilderCommandOptionsSpecStateElement(
+            name='force', only=CommandType.MODIFY),
+        BuilderCommandOptionsSpecNoStateElement(
+            name='name-check', only=CommandType.CREATE),
+        BuilderCommandOptionsSpecNoStateElement(
+            name='ip-check', only=CommandType.CREATE),
+        BuilderCommandOptionsSpecNoStateElement(
+            name='conflicts-check', only=CommandType.CREATE),
+        BuilderCommandOptionsSpecNoStateElement(
+            name='install', only=CommandType.CREATE,
+            opcode=Opcode('no_install', operator.not_)),
+        BuilderCommandOptionsSpecNoStateElement(
+            name='start', default=False, only=CommandType.CREATE),
+        BuilderCommandOptionsSpecNoStateElement(name='wait-for-sync'),
+    )
 
-backend_param = [
-    BuilderCommandOptionsSpecSubElement(name='maxmem', type='int'),
-    BuilderCommandOptionsSpecSubElement(name='minmem', type='int'),
-    BuilderCommandOptionsSpecSubElement(name='memory', type='int'),
-    BuilderCommandOptionsSpecSubElement(name='vcpus', type='int'),
-    BuilderCommandOptionsSpecSubElement(name='always_failover', type='bool'),
-]
 
-builder_gnt_instance_spec = BuilderCommandOptionsRootSpec(
-    BuilderCommandOptionsSpecElement(
-        name='disk-template', type='str', choices=disk_templates,
-        info_key='Disk template'
-    ),
-    BuilderCommandOptionsSpecElement(
-        name='file-driver', type='str',
-        info_key='File driver'
-    ),
-    BuilderCommandOptionsSpecElement(
-        name='file-storage-dir', type='str',
-        info_key='File driver'
-    ),
-    BuilderCommandOptionsSpecList(
-        *disks_options,
-        name='disk',
-        info_key='Disks'
-    ),
-    BuilderCommandOptionsSpecElement(
-        name='hypervisor', type='str', choices=hypervisor_choices,
-        info_key='Hypervisor'
-    ),
-    BuilderCommandOptionsSpecElementOnlyCreate(name='iallocator', type='str'),
-    BuilderCommandOptionsSpecList(
-        *nics_options,
-        name='net',
-        info_key='NICs',
-        no_option='--no-nics'
-    ),
-    BuilderCommandOptionsSpecElement(
-        name='os-type', type='str', info_key='Operating system'),
-    BuilderCommandOptionsSpecDict(
-        *hypervisor_params,
-        name='hypervisor-parameters',
-        info_key='Hypervisor parameters'
-    ),
-    BuilderCommandOptionsSpecDict(
-        *backend_param,
-        name='backend-parameters',
-        info_key='Back-end parameters'
-    ),
-    BuilderCommandOptionsSpecStateElement(name='submit'),
-    BuilderCommandOptionsSpecStateElement(name='ignore-ipolicy'),
-    BuilderCommandOptionsSpecStateElement(
-        name='offline', only=CommandType.MODIFY),
-    BuilderCommandOptionsSpecStateElement(
-        name='online', only=CommandType.MODIFY),
-    BuilderCommandOptionsSpecStateElement(
-        name='hotplug', only=CommandType.MODIFY),
-    BuilderCommandOptionsSpecStateElement(
-        name='hotplug-if-possible', only=CommandType.MODIFY),
-    BuilderCommandOptionsSpecStateElement(
-        name='force', only=CommandType.MODIFY),
-    BuilderCommandOptionsSpecNoStateElement(
-        name='name-check', only=CommandType.CREATE),
-    BuilderCommandOptionsSpecNoStateElement(
-        name='ip-check', only=CommandType.CREATE),
-    BuilderCommandOptionsSpecNoStateElement(
-        name='conflicts-check', only=CommandType.CREATE),
-    BuilderCommandOptionsSpecNoStateElement(
-        name='install', only=CommandType.CREATE),
-    BuilderCommandOptionsSpecNoStateElement(
-        name='start', default=False, only=CommandType.CREATE),
-    BuilderCommandOptionsSpecNoStateElement(name='wait-for-sync'),
-)
+@lru_cache(maxsize=None)
+def get_builder_gnt_instance_command() -> BuilderCommand:
+    """Get the command builder of gnt-instance options.
+    Its plan is compiled once by process at the first generation
+
+    Returns:
+        BuilderCommand: The command builder
+    """
+    return BuilderCommand(get_builder_gnt_instance_spec())
 
 
 class GntInstance(GntCommand):
@@ -263,93 +388,261 @@ class GntInstance(GntCommand):
     Class GntInstance
     """
 
-    def __init__(self, run_function: Callable, error_function: Callable, binary: str = None) -> None:
-        super().__init__(run_function, error_function, binary or GNT_INSTALL_CMD_DEFAULT)
+    # Subclasses with a transport of master (luxi, RAPI) define
+    # _query_instances(fields, *names) -> rows, used by list instead of gnt-instance list
+    _query_instances: Callable = None
 
-    def reboot(self, name: str, timeout: bool = 0):
+    def __init__(
+        self, run_function: Callable, error_function: Callable, binary: str = None,
+        query_backend=None, stream_function: Callable = None
+    ) -> None:
+        """
+        Args:
+            run_function (Callable): Function which run the commands
+            error_function (Callable): Function called on command error
+            binary (str, optional): The gnt-instance command. Defaults to None.
+            query_backend (GanetiConfigData, optional): Backend which serve list
+                and info --static without run gnt-instance. Defaults to None.
+            stream_function (Callable, optional): Function which run a command and yield
+                the lines of its output while it runs (Ex: iter_command_lines).
+                Defaults to None, the streamed commands are run by run_function.
+        """
+        super().__init__(
+            run_function, error_function, binary or GNT_INSTALL_CMD_DEFAULT,
+            stream_function=stream_function
+        )
+        self.query_backend = query_backend
+
+    def reboot(self, name: str, timeout: bool = 0, submit: bool = False):
         """
         Builder of options of reboot
         """
         return self._run_command(
             "--shutdown-timeout={}".format(timeout),
+            "--submit" if submit else "",
             name,
             command='reboot',
-
+            parser=submit_parser(submit)
         )
 
-    def stop(self, name: str, timeout: int = 0, force: bool = False):
+    def stop(self, name: str, timeout: int = 0, force: bool = False, submit: bool = False):
         """
         Builder of options of stop
         """
         return self._run_command(
             "--timeout={}".format(timeout),
             "--force" if force else "",
+            "--submit" if submit else "",
             name,
-            command='stop'
+            command='stop',
+            parser=submit_parser(submit)
         )
 
-    def start(self, name: str, start: bool = False):
+    def start(self, name: str, start: bool = False, submit: bool = False):
         """
         Builder of options of start
         """
         return self._run_command(
             "--no-start" if not start else "",
+            "--submit" if submit else "",
             name,
-            command='start'
+            command='start',
+            parser=submit_parser(submit)
         )
 
-    def remove(self, name: str):
+    def remove(self, name: str, submit: bool = False):
         """
         Builder of options of remove
         """
         return self._run_command(
             "--force",
+            "--submit" if submit else "",
             name,
-            command='remove'
+            command='remove',
+            parser=submit_parser(submit)
         )
 
-    def list(self, *names: List[str], header_names: List[str] = None) -> List:
+    def list(self, *names: List[str], header_names: List[str] = None,
+             compact: bool = False, lazy: bool = False) -> List:
         """Run gnt-instance list. Get all information on instances.
 
         Args:
             names (list[str]): name of instances to view
-            headers (List[str]): Column to view for instances.
-                Defaults to None.
+            header_names (List[str]): Column or logical fields to view for instances
+                (Ex: ['nics.name', 'admin_state']), only these columns are requested.
+                Defaults to None, all columns.
+            compact (bool, optional): Return compact read only rows (ListRow), for the
+                results kept in memory. Defaults to False.
+            lazy (bool, optional): Return read only rows (LazyListRow) which decode a column
+                on first access, for the consumers which use few columns. The rows of the
+                luxi and RAPI transports are read only, their values are already decoded.
+                Ignored by the query backend. Defaults to False.
+
+        Returns:
+            List: The instances parsed, one dict by instance
+        """
+        headers = subheaders(*header_names) if header_names else field_headers
+        if self.query_backend is not None:
+            records = self.query_backend.list(*names, header_names=header_names)
+            return to_compact_rows(records, headers) if compact and records is not None else records
+        if self._query_instances is not None:
+            return query_list(
+                lambda fields: self._query_instances(fields, *names),
+                header_names, compact=compact, lazy=lazy
+            )
+        if not have_list_element_headers(headers):
+            return self._list(*names, headers=headers, compact=compact, lazy=lazy)
+        counts = self._list(*names, headers=count_headers(headers))
+        if counts is None:
+            return self._list(*names, headers=headers, compact=compact, lazy=lazy)
+        trimmed = trim_list_element_headers(headers, max_list_counts(counts))
+        if not trimmed:
+            records = to_compact_rows(counts, headers) if compact else counts
+        else:
+            records = self._list(*names, headers=trimmed, compact=compact, lazy=lazy)
+        return None if records is None else fill_missing_headers(records, headers)
+
+    def iter_list(self, *names: List[str], header_names: List[str] = None,
+                  compact: bool = False, lazy: bool = False) -> Iterator:
+        """Run gnt-instance list and yield each instance while the output is read.
+        The whole result is never in memory, the caller can filter the instances.
+        With stream_function, the whole output neither, and the command is terminated
+        if the caller stop early.
+
+        Args:
+            names (list[str]): name of instances to view
+            header_names (List[str]): Column or logical fields to view for instances.
+                Defaults to None, all columns.
+            compact (bool, optional): Yield compact read only rows. Defaults to False.
+            lazy (bool, optional): Yield rows decoded on access. Defaults to False.
+
+        Yields:
+            Iterator: The instances parsed, nothing if the command failed
+        """
+        headers = subheaders(*header_names) if header_names else field_headers
+        if self.query_backend is not None or self._query_instances is not None:
+            yield from self.list(
+                *names, header_names=header_names, compact=compact, lazy=lazy
+            ) or []
+            return
+        trimmed = headers
+        if have_list_element_headers(headers):
+            counts = self._list(*names, headers=count_headers(headers))
+            if counts is not None:
+                trimmed = trim_list_element_headers(headers, max_list_counts(counts))
+            if not trimmed:
+                yield from fill_missing_headers(
+                    to_compact_rows(counts, headers) if compact else counts, headers
+                )
+                return
+        records = self._iter_command(
+            *build_gnt_instance_list_arguments(*names, header_names=list(trimmed)),
+            command='list',
+            parser=iter_ganeti_list_output,
+            return_none_if_error=True,
+            headers=trimmed,
+            compact=compact,
+            lazy=lazy
+        )
+        for record in records:
+            yield record if trimmed is headers else fill_missing_headers([record], headers)[0]
+
+    def _list(self, *names: List[str], headers: Dict, compact: bool = False,
+              lazy: bool = False) -> List:
+        """Run gnt-instance list with the columns of headers
+
+        Args:
+            names (list[str]): name of instances to view
+            headers (Dict): The headers of columns
+            compact (bool, optional): Return compact rows. Defaults to False.
+            lazy (bool, optional): Return rows decoded on access. Defaults to False.
 
         Returns:
-            str: The return of command
+            List: The instances parsed, one dict by instance
         """
         return self._run_command(
-            *build_gnt_instance_list_arguments(*names, header_names=header_names),
+            *build_gnt_instance_list_arguments(*names, header_names=list(headers)),
             command='list',
             parser=parse_ganeti_list_output,
-            return_none_if_error=True
+            return_none_if_error=True,
+            headers=headers,
+            compact=compact,
+            lazy=lazy
         )
 
     def add(self, name: str, params: dict):
         """
-        Run command: gnt-instance add
+        Run command: gnt-instance add.
+        Return the job id if submit option is set
         """
         return self._run_command(
-            BuilderCommand(builder_gnt_instance_spec).generate(
+            get_builder_gnt_instance_command().generate(
                 module_params=params, info_data={}, to_command=CommandType.CREATE
             ),
             name,
-            command='add'
+            command='add',
+            parser=submit_parser(params_have_submit(params))
         )
 
-    def modify(self, name: str, params: dict, vm_info: dict):
+    def batch_create(self, instances: Dict[str, dict], iallocator: str = None):
+        """
+        Run command: gnt-instance batch-create.
+        Create all instances with one command, the master schedule the jobs together.
+        The instances file (opcodes with the creation mode) is written in a temporary
+        file, removed after the command
+
+        Args:
+            instances (Dict[str, dict]): The module params by instance name
+            iallocator (str, optional): The iallocator of all instances. Defaults to None.
+        """
+        entries = [
+            dict(
+                get_builder_gnt_instance_command().generate_opcode(params),
+                instance_name=name,
+                mode='create'
+            )
+            for name, params in instances.items()
+        ]
+        with tempfile.NamedTemporaryFile(
+            mode='w', prefix='gnt-batch-create-', suffix='.json', delete=False
+        ) as instances_file:
+            json.dump(entries, instances_file)
+        try:
+            return self._run_command(
+                "--iallocator={}".format(iallocator) if iallocator else "",
+                instances_file.name,
+                command='batch-create'
+            )
+        finally:
+            os.remove(instances_file.name)
+
+    def modify(self, name: str, params: dict, vm_info: dict, diff: InstanceDiff = None):
         """
-        Run command: gnt-instance modify
+        Run command: gnt-instance modify.
+        The options of diff are used if given, else they are generated from vm_info.
+        Return the job id if submit option is set
         """
+        if diff is None:
+            diff = self.diff(params, vm_info)
         return self._run_command(
-            BuilderCommand(builder_gnt_instance_spec).generate(
-                module_params=params, info_data=vm_info, to_command=CommandType.MODIFY
-            ),
+            diff.options,
             name,
-            command='modify'
+            command='modify',
+            parser=submit_parser(params_have_submit(params))
         )
 
+    def diff(self, params: dict, vm_info: dict) -> InstanceDiff:
+        """Compute the difference between config and remote information
+
+        Args:
+            params (dict): Param of ansible module
+            vm_info (dict): Remote vm information
+
+        Returns:
+            InstanceDiff: The changed fields and the modify options
+        """
+        return get_builder_gnt_instance_command().diff(params, vm_info, CommandType.MODIFY)
+
     def config_and_remote_have_difference(self, params: dict, vm_info) -> bool:
         """Compute different between config and remote information
 
@@ -360,23 +653,78 @@ class GntInstance(GntCommand):
         Returns:
             bool: Have difference
         """
-        options = BuilderCommand(builder_gnt_instance_spec).generate(
-            module_params=params, info_data=vm_info, to_command=CommandType.MODIFY
-        )
-        return bool(options.strip())
+        return self.diff(params, vm_info).changed
+
+    def live_state(self, *names: List[str]) -> List[Dict]:
+        """Return the name, admin_state and oper_state of instances.
+        Cheap query of running state, without the configuration
+
+        Args:
+            names (List[str]): name of instances
+
+        Returns:
+            List[Dict]: Instances state
+        """
+        return self.list(*names, header_names=LIVE_STATE_HEADERS)
 
-    def info(self, name: str) -> List[Dict]:
+    def info(self, *names: List[str], static: bool = False) -> List[Dict]:
         """Return Information of instances
 
         Args:
-            name (str): name of instance
+            names (List[str]): name of instances
+            static (bool, optional): Get only the configuration, without
+                contact nodes for the runtime state. Defaults to False.
 
         Returns:
             List[Dict]: Instances information
         """
-        return self._run_command(
-            name,
+        if self.query_backend is not None and static:
+            return self.query_backend.info(*names)
+        return self._collect_command(
+            "--static" if static else "",
+            *names,
             command='info',
-            parser=parse_info_instances,
+            parser=iter_info_instances,
             return_none_if_error=True
         )
+
+    def primary_nodes(self, *names: List[str]) -> Dict[str, str]:
+        """Get the primary node of instances
+
+        Args:
+            names (List[str]): name of instances
+
+        Returns:
+            Dict[str, str]: The primary node by instance name
+        """
+        return {
+            instance['name']: instance['pnode']
+            for instance in self.list(*names, header_names=['name', 'pnode']) or []
+        }
+
+    def parallel(
+        self, operations: List[InstanceOperation], max_workers: int = 4,
+        max_per_node: int = None, primary_nodes: Dict[str, str] = None
+    ) -> Dict[str, InstanceOperationsResult]:
+        """Run independent operations of instances on a pool of workers.
+        The errors of commands are returned by instance, never sent to error function
+
+        Args:
+            operations (List[InstanceOperation]): The operations
+            max_workers (int, optional): Max concurrent operations. Defaults to 4.
+            max_per_node (int, optional): Max concurrent operations by primary node.
+                Defaults to None, no limit.
+            primary_nodes (Dict[str, str], optional): Primary node by instance name.
+                Get from gnt-instance list of all instances if missing and max_per_node is set.
+
+        Returns:
+            Dict[str, InstanceOperationsResult]: The results by instance name
+        """
+        if max_per_node and primary_nodes is None:
+            primary_nodes = self.primary_nodes()
+        return GntInstanceExecutor(
+            GntInstance(self.run_function, None, self.binary),
+            max_workers=max_workers,
+            max_per_node=max_per_node,
+            primary_nodes=primary_nodes
+        ).run(operations)
@@ -0,0 +1,156 @@
+"""
+Static argument spec of gnt-instance options.
+Generated by tools/generate_args_spec.py from the builder specification, do not edit.
+"""
+
+GNT_INSTANCE_OPTIONS_ARGS_SPEC = {
+    'type': 'dict',
+    'required': False,
+    'options': {
+        'disk-template': {
+            'type': 'str',
+            'choices': [
+                'sharedfile',
+                'diskless',
+                'plain',
+                'gluster',
+                'blockdev',
+                'drbd',
+                'ext',
+                'file',
+                'rbd',
+            ],
+        },
+        'file-driver': {'type': 'str'},
+        'file-storage-dir': {'type': 'str'},
+        'disk': {
+            'type': 'list',
+            'required': False,
+            'options': {
+                'name': {'type': 'str', 'require': True},
+                'size': {'type': 'int', 'require': True},
+                'spindles': {'type': 'str', 'require': True},
+                'metavg': {'type': 'str', 'require': True},
+                'access': {'type': 'str', 'require': True},
+            },
+        },
+        'hypervisor': {
+            'type': 'str',
+            'choices': ['chroot', 'xen-pvm', 'kvm', 'xen-hvm', 'lxc', 'fake'],
+        },
+        'iallocator': {'type': 'str'},
+        'net': {
+            'type': 'list',
+            'required': False,
+            'options': {
+                'name': {'type': 'str', 'require': True},
+                'link': {'type': 'str', 'require': True},
+                'vlan': {'type': 'str', 'require': False},
+                'network': {'type': 'str', 'require': False},
+                'mode': {'type': 'str', 'default': 'bridged', 'require': True},
+            },
+        },
+        'os-type': {'type': 'str'},
+        'hypervisor-parameters': {
+            'type': 'dict',
+            'required': False,
+            'options': {
+                'boot_order': {'type': 'str'},
+                'blockdev_prefix': {'type': 'str'},
+                'floppy_image_path': {'type': 'str'},
+                'cdrom_image_path': {'type': 'str'},
+                'cdrom2_image_path': {'type': 'str'},
+                'nic_type': {'type': 'str'},
+                'vif_type': {'type': 'str'},
+                'disk_type': {'type': 'str'},
+                'cdrom_disk_type': {'type': 'str'},
+                'vnc_bind_address': {'type': 'str'},
+                'vnc_password_file': {'type': 'str'},
+                'vnc_tls': {'type': 'str'},
+                'vnc_x509_path': {'type': 'str'},
+                'vnc_x509_verify': {'type': 'str'},
+                'spice_bind': {'type': 'str'},
+                'spice_ip_version': {'type': 'str'},
+                'spice_password_file': {'type': 'str'},
+                'spice_image_compression': {'type': 'str'},
+                'spice_jpeg_wan_compression': {'type': 'str'},
+                'spice_zlib_glz_wan_compression': {'type': 'str'},
+                'spice_streaming_video': {'type': 'str'},
+                'spice_playback_compression': {'type': 'str'},
+                'spice_use_tls': {'type': 'str'},
+                'spice_tls_ciphers': {'type': 'str'},
+                'spice_use_vdagent': {'type': 'str'},
+                'cpu_type': {'type': 'str'},
+                'acpi': {'type': 'str'},
+                'pae': {'type': 'str'},
+                'viridian': {'type': 'str'},
+                'use_localtime': {'type': 'str'},
+                'kernel_path': {'type': 'str'},
+                'kernel_args': {'type': 'str'},
+                'initrd_path': {'type': 'str'},
+                'root_path': {'type': 'str'},
+                'serial_console': {'type': 'str'},
+                'serial_speed': {'type': 'str'},
+                'disk_cache': {'type': 'str'},
+                'disk_aio': {'type': 'str'},
+                'security_model': {'type': 'str'},
+                'security_domain': {'type': 'str'},
+                'kvm_flag': {'type': 'str'},
+                'mem_path': {'type': 'str'},
+                'use_chroot': {'type': 'str'},
+                'user_shutdown': {'type': 'str'},
+                'migration_downtime': {'type': 'str'},
+                'cpu_mask': {'type': 'str'},
+                'cpu_cap': {'type': 'str'},
+                'cpu_weight': {'type': 'str'},
+                'usb_mouse': {'type': 'str'},
+                'keymap': {'type': 'str'},
+                'reboot_behavior': {'type': 'str'},
+                'cpu_cores': {'type': 'str'},
+                'cpu_threads': {'type': 'str'},
+                'cpu_sockets': {'type': 'str'},
+                'soundhw': {'type': 'str'},
+                'cpuid': {'type': 'str'},
+                'usb_devices': {'type': 'str'},
+                'vga': {'type': 'str'},
+                'kvm_extra': {'type': 'str'},
+                'machine_version': {'type': 'str'},
+                'migration_caps': {'type': 'str'},
+                'kvm_path': {'type': 'str'},
+                'vnet_hdr': {'type': 'str'},
+                'virtio_net_queues': {'type': 'str'},
+                'startup_timeout': {'type': 'str'},
+                'extra_cgroups': {'type': 'str'},
+                'drop_capabilities': {'type': 'str'},
+                'devices': {'type': 'str'},
+                'extra_config': {'type': 'str'},
+                'num_ttys': {'type': 'str'},
+            },
+        },
+        'backend-parameters': {
+            'type': 'dict',
+            'required': False,
+            'options': {
+                'maxmem': {'type': 'int'},
+                'minmem': {'type': 'int'},
+                'memory': {'type': 'int'},
+                'vcpus': {'type': 'int'},
+                'always_failover': {'type': 'bool'},
+            },
+        },
+        'submit': {'type': 'bool', 'default': False},
+        'ignore-ipolicy': {'type': 'bool', 'default': False},
+        'opportunistic-locking': {'type': 'bool', 'default': False},
+        'offline': {'type': 'bool', 'default': False},
+        'online': {'type': 'bool', 'default': False},
+        'hotplug': {'type': 'bool', 'default': False},
+        'hotplug-if-possible': {'type': 'bool', 'default': False},
+        'force': {'type': 'bool', 'default': False},
+        'name-check': {'type': 'bool', 'default': True},
+        'ip-check': {'type': 'bool', 'default': True},
+        'conflicts-check': {'type': 'bool', 'default': True},
+        'install': {'type': 'bool', 'default': True},
+        'start': {'type': 'bool', 'default': False},
+        'wait-for-sync': {'type': 'bool', 'default': True},
+    },
+}
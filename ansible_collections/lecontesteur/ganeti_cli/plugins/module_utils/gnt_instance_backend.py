@@ -0,0 +1,172 @@
+"""
+Class GntInstanceBackend, base of the luxi and RAPI backends of GntInstance
+"""
+import abc
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_command import (
+    RunCommandException,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_config_data import (
+    format_size,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance import (
+    GntInstance,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_job import (
+    JOB_STATUS_SUCCESS,
+    JOB_STATUS_UNKNOWN,
+    is_finalized,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.luxi import (
+    build_names_filter,
+)
+
+
+def _format_sizes(sizes: List[int]) -> List[str]:
+    return [format_size(size) for size in sizes]
+
+
+# Conversion of the values typed by ganeti to the values of gnt-instance list output,
+# by field alias. Ex: the sizes are integer in MiB, gnt-instance list print 10.0G
+QUERY_VALUE_ADAPTERS = {
+    'disk.sizes': _format_sizes,
+}
+
+
+def adapt_query_rows(fields: List[str], rows: List[List]) -> List[List]:
+    """Convert the values queried with luxi or RAPI to the values of gnt-instance list,
+    so the records are the same for all backends
+
+    Args:
+        fields (List[str]): The queried fields (gnt-instance list aliases)
+        rows (List[List]): One list of values by instance
+
+    Returns:
+        List[List]: The rows with the converted values
+    """
+    adapters = [
+        (position, QUERY_VALUE_ADAPTERS[field])
+        for position, field in enumerate(fields) if field in QUERY_VALUE_ADAPTERS
+    ]
+    if not adapters:
+        return rows
+    for row in rows:
+        for position, adapter in adapters:
+            if row[position] is not None:
+                row[position] = adapter(row[position])
+    return rows
+
+
+class GntInstanceBackend(GntInstance):
+    """GntInstance which send the list and power commands to a ganeti daemon
+    (luxi socket, RAPI) instead of run gnt-instance.
+    The add and modify commands still run gnt-instance.
+    """
+
+    # Exception raised by the client, set by the backends
+    backend_error = Exception
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self, run_function: Callable, error_function: Callable, binary: str = None,
+        client: Any = None, poll_interval: float = 1, sleep: Callable = time.sleep,
+        **kwargs
+    ) -> None:
+        """
+        Args:
+            run_function (Callable): Function which run the commands
+            error_function (Callable): Function called on error
+            binary (str, optional): The gnt-instance command. Defaults to None.
+            client (Any): The client of backend, its connections are reused by all calls.
+            poll_interval (float, optional): Time in seconds between two polls of
+                job status, when job is not submitted. Defaults to 1.
+        """
+        super().__init__(run_function, error_function, binary, **kwargs)
+        self.client = client
+        self.poll_interval = poll_interval
+        self.sleep = sleep
+
+    def _error(self, exception: Exception, msg: str):
+        if self.error_function:
+            return self.error_function(
+                getattr(exception, 'code', None) or 1, '', str(exception), msg=msg
+            )
+        raise RunCommandException('{} with ({})'.format(msg, exception)) from exception
+
+    @abc.abstractmethod
+    def _job_statuses(self, job_ids: List[int]) -> List[Tuple[str, List]]:
+        """Get status and result of jobs with the backend
+
+        Args:
+            job_ids (List[int]): The jobs id
+
+        Returns:
+            List[Tuple[str, List]]: Status and opresult of each job. None if job is unknown
+        """
+
+    def job_statuses(self, *job_ids: List[int]) -> Dict[int, Tuple[str, List]]:
+        """Get status and result of jobs
+
+        Args:
+            job_ids (List[int]): The jobs id
+
+        Returns:
+            Dict[int, Tuple[str, List]]: Status and opresult by job id
+        """
+        return OrderedDict(
+            (job_id, (status or JOB_STATUS_UNKNOWN, opresult))
+            for job_id, (status, opresult) in zip(job_ids, self._job_statuses(job_ids))
+        )
+
+    def wait_jobs(self, *job_ids: List[int]):
+        """Wait the end of jobs
+
+        Args:
+            job_ids (List[int]): The jobs id
+
+        Raises:
+            backend_error: One job is not a success
+        """
+        pending = list(job_ids)
+        while pending:
+            statuses = self.job_statuses(*pending)
+            for job_id, (status, opresult) in statuses.items():
+                if is_finalized(status) and status != JOB_STATUS_SUCCESS:
+                    raise self.backend_error('Job {} is {}: {}'.format(job_id, status, opresult))
+            pending = [
+                job_id for job_id, (status, _) in statuses.items() if not is_finalized(status)
+            ]
+            if pending:
+                self.sleep(self.poll_interval)
+
+    @abc.abstractmethod
+    def _query(self, fields: List[str], qfilter: List) -> List[List]:
+        """Query the fields of instances matching the filter
+
+        Args:
+            fields (List[str]): Fields to query (gnt-instance list aliases)
+            qfilter (List): The query filter
+
+        Returns:
+            List[List]: One list of values by instance, typed by ganeti
+        """
+
+    def _query_instances(self, fields: List[str], *names: List[str]) -> Optional[List[List]]:
+        """Query the fields of instances with the backend. The values are
+        converted to the values of gnt-instance list
+
+        Args:
+            fields (List[str]): Fields to query (gnt-instance list aliases)
+            names (list[str]): name of instances to query. Defaults to all.
+
+        Returns:
+            Optional[List[List]]: One list of values by instance. None if query failed
+        """
+        try:
+            rows = self._query(fields, build_names_filter('name', *names))
+        except self.backend_error:  # pylint: disable=broad-exception-caught
+            return None
+        return adapt_query_rows(fields, rows)
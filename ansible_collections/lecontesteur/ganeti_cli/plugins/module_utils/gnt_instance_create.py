@@ -0,0 +1,161 @@
+"""
+Creation of many instances with iallocator and opportunistic locking
+"""
+import copy
+import time
+from collections import OrderedDict
+from typing import Callable, Dict
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_job import (
+    JOB_STATUS_SUCCESS,
+    GntJob,
+    JobWaiter,
+)
+
+# Error code of ganeti when the opportunistic locks don't give enough nodes
+TEMPORARY_ERROR_CODES = ['temp_insufficient_resources']
+
+
+def is_temporary_failure(opresult: str) -> bool:
+    """Check if the job failed for a temporary lack of resources.
+    The job can be resubmitted
+
+    Args:
+        opresult (str): The result of opcodes, as printed by gnt-job list
+
+    Returns:
+        bool: The failure is temporary
+    """
+    return any(code in str(opresult or '') for code in TEMPORARY_ERROR_CODES)
+
+
+def opportunistic_params(params: dict) -> dict:
+    """Copy the module params of instance, with submit and opportunistic locking
+
+    Args:
+        params (dict): The module params of instance
+
+    Returns:
+        dict: The params for the add command
+    """
+    params = copy.deepcopy(params)
+    options = params.get('options') or {}
+    options['submit'] = True
+    options['opportunistic-locking'] = True
+    params['options'] = options
+    return params
+
+
+# pylint: disable=too-few-public-methods
+class CreateResult:
+    """Jobs and error of the creation of one instance
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.jobs = []
+        self.error = None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+
+class OpportunisticCreator:
+    """Submit the add job of all instances at once, with opportunistic locking.
+    The jobs failed because the locked nodes have not enough resources
+    are resubmitted, after the end of the other jobs.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self, gnt_instance, gnt_job: GntJob, max_resubmit: int = 3,
+        timeout: int = 3600, poll_interval: float = 2, sleep: Callable = time.sleep,
+        clock: Callable = time.monotonic
+    ) -> None:
+        """
+        Args:
+            gnt_instance (GntInstance): The gnt-instance command
+            gnt_job (GntJob): The gnt-job command
+            max_resubmit (int, optional): Max resubmission of one instance. Defaults to 3.
+            timeout (int, optional): Max time in seconds to wait jobs of one round.
+                Defaults to 3600.
+            poll_interval (float, optional): Time in seconds between two polls of jobs.
+                Defaults to 2.
+        """
+        self.gnt_instance = gnt_instance
+        self.gnt_job = gnt_job
+        self.max_resubmit = max_resubmit
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.sleep = sleep
+        self.clock = clock
+
+    def submit(
+        self, instances: Dict[str, dict], results: Dict[str, CreateResult]
+    ) -> Dict[int, str]:
+        """Submit the add job of instances
+
+        Args:
+            instances (Dict[str, dict]): The module params by instance name
+            results (Dict[str, CreateResult]): The results by instance name
+
+        Returns:
+            Dict[int, str]: The instance name by job id
+        """
+        jobs = OrderedDict()
+        for name, params in instances.items():
+            job_id = self.gnt_instance.add(name, opportunistic_params(params))
+            results[name].jobs.append(job_id)
+            jobs[job_id] = name
+        return jobs
+
+    def wait(self, jobs: Dict[int, str]) -> Dict[int, str]:
+        """Wait the end of jobs
+
+        Args:
+            jobs (Dict[int, str]): The instance name by job id
+
+        Raises:
+            JobsTimeout: If jobs are not finished before timeout
+
+        Returns:
+            Dict[int, str]: The result of failed jobs by job id
+        """
+        statuses = JobWaiter(
+            self.gnt_job, list(jobs), timeout=self.timeout, poll_interval=self.poll_interval,
+            batch_size=100, sleep=self.sleep, clock=self.clock
+        ).wait()
+        failed = [job_id for job_id, status in statuses.items() if status != JOB_STATUS_SUCCESS]
+        if not failed:
+            return {}
+        opresults = self.gnt_job.results(*failed)
+        return OrderedDict(
+            (job_id, opresults.get(job_id) or statuses[job_id]) for job_id in failed
+        )
+
+    def create(self, instances: Dict[str, dict]) -> Dict[str, CreateResult]:
+        """Create instances
+
+        Args:
+            instances (Dict[str, dict]): The module params by instance name
+
+        Returns:
+            Dict[str, CreateResult]: The results by instance name
+        """
+        results = OrderedDict((name, CreateResult(name)) for name in instances)
+        pending = OrderedDict(instances)
+        for attempt in range(self.max_resubmit + 1):
+            jobs = self.submit(pending, results)
+            failures = self.wait(jobs)
+            retry = OrderedDict()
+            for job_id, opresult in failures.items():
+                name = jobs[job_id]
+                if is_temporary_failure(opresult) and attempt < self.max_resubmit:
+                    retry[name] = pending[name]
+                else:
+                    results[name].error = 'Job {} failed: {}'.format(job_id, opresult)
+            if not retry:
+                break
+            pending = retry
+        return results
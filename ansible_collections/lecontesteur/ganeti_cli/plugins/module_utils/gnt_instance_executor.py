@@ -0,0 +1,187 @@
+"""
+Concurrent execution of independent gnt-instance operations
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import chain, zip_longest
+from typing import Any, Dict, Iterator, List
+
+PARALLEL_METHODS = ['add', 'modify', 'start', 'stop', 'reboot', 'remove']
+
+
+class InstanceOperation:
+    """One call of GntInstance method on an instance
+    """
+
+    def __init__(self, name: str, method: str, *args, **kwargs) -> None:
+        if method not in PARALLEL_METHODS:
+            raise ValueError(
+                'Method {} can\'t be run in parallel. Choices: {}'.format(method, PARALLEL_METHODS)
+            )
+        self.name = name
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self) -> str:
+        return 'InstanceOperation({}, {})'.format(self.name, self.method)
+
+    def run(self, gnt_instance) -> Any:
+        """Run the operation
+
+        Args:
+            gnt_instance (GntInstance): The gnt-instance command
+
+        Returns:
+            Any: The return of GntInstance method
+        """
+        return getattr(gnt_instance, self.method)(self.name, *self.args, **self.kwargs)
+
+
+class InstanceOperationsResult:
+    """Results and error of operations of one instance
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.results = []
+        self.error = None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+    def to_result(self) -> Dict:
+        return {
+            "name": self.name,
+            "results": list(self.results),
+            "error": str(self.error) if self.failed else None,
+        }
+
+
+# pylint: disable=too-few-public-methods
+class NodeLimiter:
+    """Limit the number of concurrent operations on each primary node
+    """
+
+    def __init__(self, max_per_node: int = None) -> None:
+        if max_per_node is not None and max_per_node <= 0:
+            raise ValueError('Max operations by node must be positive')
+        self.max_per_node = max_per_node
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def _semaphore(self, node: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if node not in self._semaphores:
+                self._semaphores[node] = threading.BoundedSemaphore(self.max_per_node)
+            return self._semaphores[node]
+
+    @contextmanager
+    def limit(self, node: str):
+        """Wait a free slot on node. Unknown node is not limited
+
+        Args:
+            node (str): The primary node
+        """
+        if node is None or self.max_per_node is None:
+            yield
+            return
+        semaphore = self._semaphore(node)
+        with semaphore:
+            yield
+
+
+def group_by_instance(operations: List[InstanceOperation]) -> Dict[str, List[InstanceOperation]]:
+    """Group operations by instance. Keep the order of operations
+
+    Args:
+        operations (List[InstanceOperation]): The operations
+
+    Returns:
+        Dict[str, List[InstanceOperation]]: The operations by instance name
+    """
+    grouped = OrderedDict()
+    for operation in operations:
+        grouped.setdefault(operation.name, []).append(operation)
+    return grouped
+
+
+def interleave_by_node(names: List[str], primary_nodes: Dict[str, str]) -> Iterator[str]:
+    """Order instances for alternate the primary nodes. Workers don't wait
+    on a node lock while instances of other nodes are queued
+
+    Args:
+        names (List[str]): Name of instances
+        primary_nodes (Dict[str, str]): Primary node by instance name
+
+    Returns:
+        Iterator[str]: The name of instances
+    """
+    by_node = OrderedDict()
+    for name in names:
+        by_node.setdefault(primary_nodes.get(name), []).append(name)
+    return filter(
+        lambda name: name is not None,
+        chain.from_iterable(zip_longest(*by_node.values()))
+    )
+
+
+# pylint: disable=too-few-public-methods
+class GntInstanceExecutor:
+    """Fan out independent operations of instances on a bounded pool of workers.
+    Operations of one instance are run in order, one after the other.
+    """
+
+    def __init__(
+        self, gnt_instance, max_workers: int = 4, max_per_node: int = None,
+        primary_nodes: Dict[str, str] = None
+    ) -> None:
+        """
+        Args:
+            gnt_instance (GntInstance): The gnt-instance command. Its error function
+                must raise an exception, not exit the process
+            max_workers (int, optional): Max concurrent operations. Defaults to 4.
+            max_per_node (int, optional): Max concurrent operations by primary node.
+                Defaults to None, no limit.
+            primary_nodes (Dict[str, str], optional): Primary node by instance name.
+                Defaults to None.
+        """
+        if max_workers <= 0:
+            raise ValueError('Max workers must be positive')
+        self.gnt_instance = gnt_instance
+        self.max_workers = max_workers
+        self.limiter = NodeLimiter(max_per_node)
+        self.primary_nodes = primary_nodes or {}
+
+    def _run_instance(self, name: str, operations: List[InstanceOperation]):
+        result = InstanceOperationsResult(name)
+        with self.limiter.limit(self.primary_nodes.get(name)):
+            for operation in operations:
+                try:
+                    result.results.append(operation.run(self.gnt_instance))
+                except Exception as exception:  # pylint: disable=broad-except
+                    result.error = exception
+                    break
+        return result
+
+    def run(self, operations: List[InstanceOperation]) -> Dict[str, InstanceOperationsResult]:
+        """Run all operations
+
+        Args:
+            operations (List[InstanceOperation]): The operations
+
+        Returns:
+            Dict[str, InstanceOperationsResult]: The results by instance name
+        """
+        grouped = group_by_instance(operations)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = OrderedDict(
+                (name, executor.submit(self._run_instance, name, grouped[name]))
+                for name in interleave_by_node(list(grouped), self.primary_nodes)
+            )
+        return OrderedDict(
+            (name, futures[name].result()) for name in grouped
+        )
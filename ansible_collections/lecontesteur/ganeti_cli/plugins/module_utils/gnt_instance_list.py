@@ -2,9 +2,13 @@
 Module contains ganeti command list function.
 """
 import ast
+import re
+import sys
 from itertools import chain
-from typing import Dict, List
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from collections import OrderedDict
+from collections.abc import Mapping
 import flatdict
 
 from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.arguments_spec \
@@ -89,28 +93,212 @@ fix_field_headers = {
     'disk_sizes': GntListOption('disk.sizes', 'list_str'),
     'hvparams': GntListOption('hvparams', 'dict'),
     'admin_state': GntListOption('admin_state', 'str'),
+    'oper_state': GntListOption('oper_state', 'boolean'),
     'disk_count': GntListOption('disk.count', 'int'),
     'nic_count': GntListOption('nic.count', 'int'),
 }
 
-field_headers = OrderedDict(
-    sorted(chain(fix_field_headers.items(),
-           ganeti_instance_args_spec_flat_items()), key=lambda x: x[0])
-)
+@lru_cache(maxsize=None)
+def get_field_headers() -> Dict[str, GntListOption]:
+    """Build the field headers of gnt-instance list, sorted by name.
+    Built on first call and cached
+
+    Returns:
+        Dict[str, GntListOption]: The field headers
+    """
+    return OrderedDict(
+        sorted(chain(fix_field_headers.items(),
+               ganeti_instance_args_spec_flat_items()), key=lambda x: x[0])
+    )
+
+
+class LazyFieldHeaders(Mapping):
+    """Read only view of field headers. The headers are built on the first use,
+    so the modules which never list instances don't pay the flattening of arguments spec
+    """
+
+    def __getitem__(self, key: str) -> GntListOption:
+        return get_field_headers()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(get_field_headers())
+
+    def __len__(self) -> int:
+        return len(get_field_headers())
+
+    def __repr__(self) -> str:
+        return 'LazyFieldHeaders({!r})'.format(get_field_headers())
+
+
+field_headers = LazyFieldHeaders()
+
+
+# Logical fields without column of same name in field headers
+LOGICAL_FIELD_ALIASES = {
+    'nics.name': 'nic_names',
+    'nics.count': 'nic_count',
+    'disks.count': 'disk_count',
+}
+
+
+def logical_field(header_name: str) -> str:
+    """Get the logical field of header, without the index of list element.
+    Ex: nics.0.link => nics.link
+
+    Args:
+        header_name (str): The name of header
+
+    Returns:
+        str: The logical field
+    """
+    return '.'.join(part for part in header_name.split('.') if not part.isdigit())
+
+
+def project_field(field: str) -> List[str]:
+    """Get the header names of one requested field. The field is a header name, or a logical
+    field (Ex: nics.link, the link of each nic), or a parent of fields (Ex: backend_param, nics.0)
+
+    Args:
+        field (str): The requested field
+
+    Raises:
+        KeyError: No header for this field
+
+    Returns:
+        List[str]: The header names, in order of field headers
+    """
+    if field in field_headers:
+        return [field]
+    if field in LOGICAL_FIELD_ALIASES:
+        return [LOGICAL_FIELD_ALIASES[field]]
+    prefix = field + '.'
+    names = [
+        name for name in field_headers
+        if name.startswith(prefix)
+        or logical_field(name) == field or logical_field(name).startswith(prefix)
+    ]
+    if not names:
+        raise KeyError(
+            "The header {} is not present in 'field_headers'".format(field))
+    return names
 
 
 def subheaders(*header_names):
     """
     Get sub field headers
-    *header_names > list of headers to use. If empty, return empty dict
+    *header_names > list of headers or logical fields to use, an item can
+        contain several fields separated by comma (Ex: "nics.name, admin_state").
+        Only the columns of these fields are requested. If empty, return empty dict
+    """
+    headers = OrderedDict()
+    for names in header_names:
+        for field in names.split(','):
+            field = field.strip()
+            if not field:
+                continue
+            for name in project_field(field):
+                headers.setdefault(name, field_headers[name])
+    return headers
+
+
+# Count header of each list field, the columns of list elements are indexed (Ex: nics.0.link)
+LIST_COUNT_HEADERS = OrderedDict([
+    ('nics', 'nic_count'),
+    ('disks', 'disk_count'),
+])
+
+
+def list_element_index(header_name: str) -> Tuple[str, int]:
+    """Get the list field and index of element of header.
+    Ex: nics.2.link => ('nics', 2), name => (None, None)
+
+    Args:
+        header_name (str): The name of header
+
+    Returns:
+        Tuple[str, int]: The list field and the index, None if not an element column
     """
-    headers = []
-    for name in header_names:
-        if name not in field_headers:
-            raise KeyError(
-                "The header {} is not present in 'field_headers'".format(name))
-        headers.append((name, field_headers[name]))
-    return OrderedDict(headers)
+    parts = header_name.split('.')
+    if len(parts) > 2 and parts[0] in LIST_COUNT_HEADERS and parts[1].isdigit():
+        return parts[0], int(parts[1])
+    return None, None
+
+
+def have_list_element_headers(headers: Dict[str, GntListOption]) -> bool:
+    """Check if headers have columns of list elements
+    """
+    return any(list_element_index(name)[0] is not None for name in headers)
+
+
+def count_headers(headers: Dict[str, GntListOption]) -> Dict[str, GntListOption]:
+    """Get the count headers of lists with element columns in headers
+
+    Args:
+        headers (Dict[str, GntListOption]): The requested headers
+
+    Returns:
+        Dict[str, GntListOption]: The count headers
+    """
+    fields = {list_element_index(name)[0] for name in headers}
+    return subheaders(*[
+        count_header for field, count_header in LIST_COUNT_HEADERS.items() if field in fields
+    ])
+
+
+def max_list_counts(records: List[Dict]) -> Dict[str, int]:
+    """Get the maximum number of elements of each list field in the instances
+
+    Args:
+        records (List[Dict]): The instances parsed with count headers
+
+    Returns:
+        Dict[str, int]: The maximum by list field. Ex: {'nics': 2, 'disks': 1}
+    """
+    return {
+        field: max([record.get(count_header) or 0 for record in records] or [0])
+        for field, count_header in LIST_COUNT_HEADERS.items()
+    }
+
+
+def trim_list_element_headers(
+    headers: Dict[str, GntListOption],
+    counts: Dict[str, int]
+) -> Dict[str, GntListOption]:
+    """Remove the columns of list elements over the maximum number of elements
+
+    Args:
+        headers (Dict[str, GntListOption]): The requested headers
+        counts (Dict[str, int]): The maximum number of elements by list field
+
+    Returns:
+        Dict[str, GntListOption]: The headers to request
+    """
+    trimmed = OrderedDict()
+    for name, option in headers.items():
+        field, index = list_element_index(name)
+        if field is None or index < counts.get(field, index + 1):
+            trimmed[name] = option
+    return trimmed
+
+
+def fill_missing_headers(records: List[Dict], headers: Dict[str, GntListOption]) -> List[Dict]:
+    """Add the columns not requested to records, with None value like empty columns
+
+    Args:
+        records (List[Dict]): The parsed instances
+        headers (Dict[str, GntListOption]): All headers
+
+    Returns:
+        List[Dict]: The instances with all headers, compact if records are compact
+    """
+    if records and isinstance(records[0], ListRow):
+        return to_compact_rows(records, headers)
+    if records and isinstance(records[0], LazyListRow):
+        return [record.with_headers(headers) for record in records]
+    return [
+        OrderedDict((name, record.get(name)) for name in headers)
+        for record in records
+    ]
 
 
 def get_keys_to_change_module_params_and_result(options, remote):
@@ -165,18 +353,82 @@ def parse_list_str(value):
     return value.split(',')
 
 
+# Scalar of python literal without escape: string, None, boolean, int or float
+_SCALAR = r"""(?:u?'[^'\\]*'|u?"[^"\\]*"|None|True|False|-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?)"""
+_SCALAR_TOKEN = re.compile(_SCALAR)
+_SIMPLE_LIST = re.compile(r'\[\s*(?:{s}(?:\s*,\s*{s})*\s*,?)?\s*\]'.format(s=_SCALAR))
+_SIMPLE_DICT = re.compile(
+    r'\{{\s*(?:{s}\s*:\s*{s}(?:\s*,\s*{s}\s*:\s*{s})*\s*,?)?\s*\}}'.format(s=_SCALAR)
+)
+_CONSTANTS = {'None': None, 'True': True, 'False': False}
+
+
+def _scalar(token: str):
+    if token in _CONSTANTS:
+        return _CONSTANTS[token]
+    if token[-1] in '\'"':
+        return token[token.index(token[-1]) + 1:-1]
+    if '.' in token:
+        return float(token)
+    return int(token)
+
+
+def _literal_eval_simple(value: str):
+    """Evaluate a list or dict of scalars without building the AST
+
+    Returns:
+        The value, or ast.literal_eval result if the value is not simple
+    """
+    if _SIMPLE_LIST.fullmatch(value):
+        return [_scalar(token) for token in _SCALAR_TOKEN.findall(value)]
+    if _SIMPLE_DICT.fullmatch(value):
+        tokens = [_scalar(token) for token in _SCALAR_TOKEN.findall(value)]
+        return dict(zip(tokens[::2], tokens[1::2]))
+    return ast.literal_eval(value)
+
+
+# The same hvparams, nic names and vlans are repeated across instances
+_literal_eval_cached = lru_cache(maxsize=1024)(_literal_eval_simple)
+
+
+def _copy_literal(value):
+    if isinstance(value, list):
+        return [_copy_literal(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_literal(item) for key, item in value.items()}
+    if isinstance(value, set):
+        return set(value)
+    if isinstance(value, tuple):
+        return tuple(_copy_literal(item) for item in value)
+    return value
+
+
+def literal_eval(value: str):
+    """Memoized ast.literal_eval of gnt-instance list column. The lists and dicts of
+    scalars are evaluated without AST. The cached value is shared, so the result is a copy
+    which the caller can change
+
+    Args:
+        value (str): The python literal
+
+    Returns:
+        The value
+    """
+    return _copy_literal(_literal_eval_cached(value))
+
+
 def parse_list(value):
     """
     Parse python list value from gnt-instance list column
     """
-    return ast.literal_eval(value)
+    return literal_eval(value)
 
 
 def parse_dict(value):
     """
     Parse python dict value from gnt-instance list column
     """
-    return ast.literal_eval(value)
+    return literal_eval(value)
 
 
 def parse_boolean(value: str):
@@ -241,19 +493,408 @@ def parse_ganeti_list_output_line(stdout: str, headers: Dict[str, GntListOption]
     )
 
 
+BOOLEAN_VALUES = {'y': True, 'Y': True, 'n': False, 'N': False, '-': None}
+
+
+def _parse_boolean_column(column: Iterable[str]) -> List:
+    try:
+        return [BOOLEAN_VALUES[value] for value in column]
+    except KeyError:
+        return [None if value == '-' else parse_boolean(value) for value in column]
+
+
+# Parsers of one stripped column, '-' is None. The usual types are inlined, without call by cell
+COLUMN_PARSERS = {
+    'str': lambda column: [None if value == '-' else value for value in column],
+    'int': lambda column: [None if value == '-' else int(value) for value in column],
+    'list_str': lambda column: [None if value == '-' else value.split(',') for value in column],
+    'boolean': _parse_boolean_column,
+}
+
+def _column_parser(type_name: str) -> Callable[[Iterable[str]], List]:
+    """Get the parser of one stripped column, '-' is None
+
+    Args:
+        type_name (str): The type of parser. @PARSERS
+
+    Returns:
+        Callable[[Iterable[str]], List]: The parser of column values
+    """
+    if type_name in COLUMN_PARSERS:
+        return COLUMN_PARSERS[type_name]
+    parser = PARSERS[type_name]
+    return lambda column: [None if value == '-' else parser(value) for value in column]
+
+
+def _parse_boolean_cell(value: str):
+    if value in BOOLEAN_VALUES:
+        return BOOLEAN_VALUES[value]
+    return parse_boolean(value)
+
+
+# Parsers of one stripped cell, '-' is None. The repeated strings of compact rows are interned
+CELL_PARSERS = {
+    'str': lambda value: None if value == '-' else value,
+    'int': lambda value: None if value == '-' else int(value),
+    'list_str': lambda value: None if value == '-' else value.split(','),
+    'boolean': _parse_boolean_cell,
+}
+COMPACT_CELL_PARSERS = {
+    'str': lambda value: None if value == '-' else sys.intern(value),
+    'list_str': lambda value: None if value == '-' else list(map(sys.intern, value.split(','))),
+}
+
+
+def _cell_parser(type_name: str, compact: bool = False) -> Callable[[str], Any]:
+    """Get the parser of one stripped cell, '-' is None
+
+    Args:
+        type_name (str): The type of parser. @PARSERS
+        compact (bool, optional): Intern the strings. Defaults to False.
+
+    Returns:
+        Callable[[str], Any]: The parser of cell value
+    """
+    if compact and type_name in COMPACT_CELL_PARSERS:
+        return COMPACT_CELL_PARSERS[type_name]
+    if type_name in CELL_PARSERS:
+        return CELL_PARSERS[type_name]
+    parser = PARSERS[type_name]
+    return lambda value: None if value == '-' else parser(value)
+
+
+class ListRow(Mapping):
+    """Compact read only record of one instance of gnt-instance list.
+    The values are in a tuple, the index of headers is shared by all rows of a result
+    """
+    __slots__ = ('_index', '_values')
+
+    def __init__(self, index: Dict[str, int], values: Tuple) -> None:
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key: str):
+        return self._values[self._index[key]]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return 'ListRow({!r})'.format(dict(self))
+
+    def to_dict(self) -> Dict:
+        """Get the record as dict, for the module result
+
+        Returns:
+            Dict: The values by header
+        """
+        return OrderedDict(zip(self._index, self._values))
+
+
+_UNDECODED = object()
+
+
+class LazyListRow(Mapping):
+    """Read only record of one instance of gnt-instance list, which keeps the raw cells.
+    A column is decoded by its PARSERS function on first access, then the value is cached.
+    An invalid cell raises the error of parser on access
+    """
+    __slots__ = ('_parser', '_cells', '_values')
+
+    def __init__(self, parser: 'CompiledListParser', cells: List[str]) -> None:
+        self._parser = parser
+        self._cells = cells
+        self._values = None
+
+    def __getitem__(self, key: str):
+        position = self._parser.index[key]
+        if self._values is None:
+            self._values = [_UNDECODED] * len(self._cells)
+        value = self._values[position]
+        if value is _UNDECODED:
+            value = parse(self._parser.types[position], self._cells[position].strip())
+            self._values[position] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._parser.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._parser.names)
+
+    def __len__(self) -> int:
+        return len(self._parser.names)
+
+    def __repr__(self) -> str:
+        return 'LazyListRow({!r})'.format(dict(self))
+
+    def to_dict(self) -> Dict:
+        """Get the record as dict, all columns are decoded
+
+        Returns:
+            Dict: The values by header
+        """
+        return OrderedDict(self.items())
+
+    def with_headers(self, headers: Dict[str, GntListOption]) -> 'LazyListRow':
+        """Get the row with the columns of headers, the missing columns are empty ('-')
+
+        Args:
+            headers (Dict[str, GntListOption]): The headers
+
+        Returns:
+            LazyListRow: The row, not decoded
+        """
+        parser = compile_list_parser(headers)
+        index = self._parser.index
+        return LazyListRow(parser, [
+            self._cells[index[name]] if name in index else '-' for name in parser.names
+        ])
+
+
+class CompiledListParser:
+    """Parser of gnt-instance list output compiled once for a set of headers.
+    The rows are parsed line by line with the parser of each cell. The output
+    parsed in columns is split in one pass, then each column is parsed by its parser
+    """
+
+    def __init__(self, names: Tuple[str], types: Tuple[str]) -> None:
+        self.names = names
+        self.types = types
+        self.index = {name: position for position, name in enumerate(names)}
+        self.parsers = tuple(_column_parser(type_name) for type_name in types)
+        self.cell_parsers = tuple(_cell_parser(type_name) for type_name in types)
+        self.compact_cell_parsers = tuple(
+            _cell_parser(type_name, compact=True) for type_name in types
+        )
+
+    def split(self, stdout: str) -> List[List[str]]:
+        """Split the non empty lines of output in cells
+
+        Raises:
+            ValueError: A line has less cells than headers
+        """
+        split_line = self.split_line
+        return [cells for cells in map(split_line, stdout.split('\n')) if cells is not None]
+
+    def split_line(self, line: str) -> List[str]:
+        """Split one line of output in cells, None if the line is empty
+
+        Raises:
+            ValueError: The line has less cells than headers
+        """
+        if not line.strip():
+            return None
+        cells = line.split(SEPARATOR_COL)
+        width = len(self.names)
+        if len(cells) != width:
+            if len(cells) < width:
+                raise ValueError('Line has {} columns, {} expected: {}'.format(
+                    len(cells), width, line
+                ))
+            cells = cells[:width]
+        return cells
+
+    def iter_rows(self, lines: Iterable[str], compact: bool = False,
+                  lazy: bool = False) -> Iterator[Union[Dict, ListRow, LazyListRow]]:
+        """Parse the lines one at a time
+
+        Args:
+            lines (Iterable[str]): The lines of output
+            compact (bool, optional): Yield compact rows. Defaults to False.
+            lazy (bool, optional): Yield rows decoded on access. Defaults to False.
+
+        Yields:
+            Iterator[Union[Dict, ListRow, LazyListRow]]: The parsed values, one row by line
+        """
+        split_line, names, index = self.split_line, self.names, self.index
+        parsers = self.compact_cell_parsers if compact else self.cell_parsers
+        for line in lines:
+            cells = split_line(line)
+            if cells is None:
+                continue
+            if lazy:
+                yield LazyListRow(self, cells)
+                continue
+            values = [parser(cell) for parser, cell in zip(parsers, map(str.strip, cells))]
+            if compact:
+                yield ListRow(index, tuple(values))
+            else:
+                yield OrderedDict(zip(names, values))
+
+    def parse_columns(self, stdout: str) -> Dict[str, List]:
+        """Parse the output in columns
+
+        Args:
+            stdout (str): The output of gnt-instance list
+
+        Returns:
+            Dict[str, List]: The parsed values of each header, in order of rows
+        """
+        rows = self.split(stdout)
+        columns = zip(*rows) if rows else ([] for _ in self.names)
+        return OrderedDict(
+            (name, parser(list(map(str.strip, column))))
+            for name, parser, column in zip(self.names, self.parsers, columns)
+        )
+
+    def parse_rows(self, stdout: str) -> List[Dict]:
+        """Parse the output in rows
+
+        Args:
+            stdout (str): The output of gnt-instance list
+
+        Returns:
+            List[Dict]: The parsed values, one dict by line
+        """
+        return list(self.iter_rows(stdout.split('\n')))
+
+    def parse_lazy_rows(self, stdout: str) -> List[LazyListRow]:
+        """Split the output in rows decoded on access
+
+        Args:
+            stdout (str): The output of gnt-instance list
+
+        Returns:
+            List[LazyListRow]: The rows, one by line
+        """
+        return [LazyListRow(self, cells) for cells in self.split(stdout)]
+
+    def parse_compact_rows(self, stdout: str) -> List[ListRow]:
+        """Parse the output in compact rows, the strings are interned
+
+        Args:
+            stdout (str): The output of gnt-instance list
+
+        Returns:
+            List[ListRow]: The parsed values, one row by line
+        """
+        return list(self.iter_rows(stdout.split('\n'), compact=True))
+
+
+@lru_cache(maxsize=64)
+def _compile_list_parser(names: Tuple[str], types: Tuple[str]) -> CompiledListParser:
+    return CompiledListParser(names, types)
+
+
+def compile_list_parser(headers: Dict[str, GntListOption]) -> CompiledListParser:
+    """Get the compiled parser of headers, compiled once by set of headers
+
+    Args:
+        headers (Dict[str, GntListOption]): The headers of columns
+
+    Returns:
+        CompiledListParser: The parser
+    """
+    return _compile_list_parser(
+        tuple(headers), tuple(option.type for option in headers.values())
+    )
+
+
+def to_compact_rows(records: List[Dict], headers: Dict[str, GntListOption]) -> List[ListRow]:
+    """Convert records to compact rows of headers, the missing columns are None
+
+    Args:
+        records (List[Dict]): The instances
+        headers (Dict[str, GntListOption]): The headers
+
+    Returns:
+        List[ListRow]: The compact rows
+    """
+    index = compile_list_parser(headers).index
+    return [
+        ListRow(index, tuple(record.get(name) for name in index))
+        for record in records
+    ]
+
+
+def query_list(
+    query: Callable[[List[str]], Optional[Iterable[List]]],
+    header_names: List[str] = None,
+    compact: bool = False,
+    lazy: bool = False
+) -> Optional[List[Union[Dict, ListRow]]]:
+    """Records of instances queried by a backend (luxi, RAPI) with the keys of
+    gnt-instance list parser. The values are typed by ganeti, there is nothing to decode:
+    with compact or lazy, the rows are read only views (ListRow) over the query values
+
+    Args:
+        query (Callable[[List[str]], Optional[Iterable[List]]]): Function which query the
+            fields (gnt-instance list aliases) and return one list of values by instance,
+            None if the query failed
+        header_names (List[str], optional): Column or logical fields. Defaults to None, all.
+        compact (bool, optional): Return compact read only rows. Defaults to False.
+        lazy (bool, optional): Return read only rows, like compact. Defaults to False.
+
+    Returns:
+        Optional[List[Union[Dict, ListRow]]]: The instances, one record by instance.
+            None if the query failed
+    """
+    headers = subheaders(*header_names) if header_names else field_headers
+    rows = query([option.alias for option in headers.values()])
+    if rows is None:
+        return None
+    if compact or lazy:
+        index = compile_list_parser(headers).index
+        return [ListRow(index, tuple(row)) for row in rows]
+    return [OrderedDict(zip(headers.keys(), row)) for row in rows]
+
+
 def parse_ganeti_list_output(
     *_: str,
     stdout: str,
-    headers: Dict[str, GntListOption] = None
-) -> list:
+    headers: Dict[str, GntListOption] = None,
+    as_columns: bool = False,
+    compact: bool = False,
+    lazy: bool = False
+) -> Union[List[Dict], Dict[str, List], List[ListRow], List[LazyListRow]]:
     """
     Parse gnt-instance list result
+    as_columns > return the list of values of each header instead of one dict by line
+    compact > return one compact read only ListRow by line instead of dict
+    lazy > return one LazyListRow by line, the columns are decoded on access
+    """
+    if headers is None:
+        headers = field_headers
+    parser = compile_list_parser(headers)
+    if as_columns:
+        return parser.parse_columns(stdout)
+    if lazy:
+        return parser.parse_lazy_rows(stdout)
+    if compact:
+        return parser.parse_compact_rows(stdout)
+    return parser.parse_rows(stdout)
+
+
+def iter_ganeti_list_output(
+    *_: str,
+    stdout: Union[str, Iterable[str]],
+    headers: Dict[str, GntListOption] = None,
+    compact: bool = False,
+    lazy: bool = False
+) -> Iterator[Union[Dict, ListRow, LazyListRow]]:
+    """Parse gnt-instance list result one line at a time, for the output streamed
+    from command. The caller can filter the rows or stop early
+
+    Args:
+        stdout (Union[str, Iterable[str]]): The output, or an iterable of its lines
+        headers (Dict[str, GntListOption], optional): The headers. Defaults to all.
+        compact (bool, optional): Yield compact rows (ListRow). Defaults to False.
+        lazy (bool, optional): Yield rows decoded on access (LazyListRow). Defaults to False.
+
+    Yields:
+        Iterator[Union[Dict, ListRow, LazyListRow]]: The parsed values, one row by line
     """
     if headers is None:
         headers = field_headers
-    gen_list = map(lambda o: parse_ganeti_list_output_line(
-        headers=headers, stdout=o), stdout.strip().split('\n'))
-    return list(gen_list)
+    lines = stdout.split('\n') if isinstance(stdout, str) else stdout
+    yield from compile_list_parser(headers).iter_rows(lines, compact=compact, lazy=lazy)
 
 
 def get_alias(gnt_list_option):
@@ -0,0 +1,88 @@
+"""
+Class GntInstanceLuxi
+"""
+from typing import Dict, List, Tuple
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_backend import (
+    GntInstanceBackend,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.luxi import (
+    LuxiClient,
+    LuxiError,
+)
+
+
+class GntInstanceLuxi(GntInstanceBackend):
+    """GntInstance which use the luxi socket of master for list and power
+    commands, without run gnt-instance. The add and modify commands,
+    and info, still run gnt-instance.
+    """
+
+    backend_error = LuxiError
+
+    def __init__(self, *args, client: LuxiClient = None, **kwargs) -> None:
+        """Same arguments than GntInstanceBackend
+
+        Args:
+            client (LuxiClient, optional): The luxi client, its connection is
+                reused for all calls. Defaults to a client on default socket.
+        """
+        super().__init__(*args, client=client or LuxiClient(), **kwargs)
+
+    def _job_statuses(self, job_ids: List[int]) -> List[Tuple[str, List]]:
+        return self.client.query_jobs(job_ids, ['status', 'opresult'])
+
+    def _run_job(self, opcode: Dict, submit: bool):
+        """Submit a job of one opcode. Wait the end of job if not submit
+
+        Args:
+            opcode (Dict): The opcode
+            submit (bool): Return the job id without wait
+
+        Returns:
+            int: The job id if submit
+        """
+        try:
+            job_id = self.client.submit_job(opcode)
+            if submit:
+                return job_id
+            self.wait_jobs(job_id)
+            return None
+        except LuxiError as exception:
+            return self._error(
+                exception,
+                'Job {} on {} failed'.format(opcode['OP_ID'], opcode['instance_name'])
+            )
+
+    def reboot(self, name: str, timeout: bool = 0, submit: bool = False):
+        return self._run_job({
+            'OP_ID': 'OP_INSTANCE_REBOOT',
+            'instance_name': name,
+            'reboot_type': 'hard',
+            'shutdown_timeout': timeout,
+        }, submit)
+
+    def stop(self, name: str, timeout: int = 0, force: bool = False, submit: bool = False):
+        return self._run_job({
+            'OP_ID': 'OP_INSTANCE_SHUTDOWN',
+            'instance_name': name,
+            'timeout': timeout,
+            'force': force,
+        }, submit)
+
+    # pylint: disable=unused-argument
+    def start(self, name: str, start: bool = False, submit: bool = False):
+        return self._run_job({
+            'OP_ID': 'OP_INSTANCE_STARTUP',
+            'instance_name': name,
+        }, submit)
+
+    def remove(self, name: str, submit: bool = False):
+        return self._run_job({
+            'OP_ID': 'OP_INSTANCE_REMOVE',
+            'instance_name': name,
+            'ignore_failures': False,
+        }, submit)
+
+    def _query(self, fields: List[str], qfilter: List) -> List[List]:
+        return self.client.query('instance', fields, qfilter)
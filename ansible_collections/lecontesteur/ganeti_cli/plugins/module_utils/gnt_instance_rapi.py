@@ -0,0 +1,178 @@
+"""
+Class GntInstanceRapi
+"""
+from typing import Dict, List, Tuple
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_config_data import (
+    format_size,
+    info_params,
+    none_to_str,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_backend import (
+    GntInstanceBackend,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.luxi import (
+    query_result_to_rows,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.rapi import (
+    RapiClient,
+    RapiError,
+    rapi_path,
+)
+
+
+def _nics_info(data: Dict) -> List[Dict]:
+    nics = []
+    macs = data.get('nic.macs') or []
+    for index, mac in enumerate(macs):
+        def nic_value(field, index=index):
+            values = data.get(field) or []
+            return values[index] if index < len(values) else None
+        nics.append({
+            'nic/{}'.format(index): None,
+            'MAC': none_to_str(mac),
+            'IP': none_to_str(nic_value('nic.ips')),
+            'mode': nic_value('nic.modes'),
+            'link': nic_value('nic.links'),
+            'vlan': nic_value('nic.vlans') or None,
+            'network': none_to_str(nic_value('nic.networks')),
+            'UUID': nic_value('nic.uuids'),
+            'name': none_to_str(nic_value('nic.names')),
+        })
+    return nics or None
+
+
+def _disks_info(data: Dict) -> List[Dict]:
+    disks = []
+    names = data.get('disk.names') or []
+    uuids = data.get('disk.uuids') or []
+    for index, size in enumerate(data.get('disk.sizes') or []):
+        disks.append({
+            'disk/{}'.format(index): '{}, size {}'.format(
+                data.get('disk_template'), format_size(size)
+            ),
+            'name': none_to_str(names[index] if index < len(names) else None),
+            'UUID': uuids[index] if index < len(uuids) else None,
+        })
+    return disks or None
+
+
+def rapi_instance_to_info(data: Dict) -> Dict:
+    """Convert the RAPI instance resource to the record of gnt-instance info --static parser
+
+    Args:
+        data (Dict): The instance resource, /2/instances/[name]
+
+    Returns:
+        Dict: The instance information
+    """
+    return {
+        'Instance name': data['name'],
+        'UUID': data.get('uuid'),
+        'Serial number': data.get('serial_no'),
+        'State': 'configured to be {}'.format(data.get('admin_state')),
+        'Nodes': [
+            {'primary': data.get('pnode')},
+            {'secondaries': data.get('snodes') or None},
+        ],
+        'Operating system': data.get('os'),
+        'Hypervisor': data.get('hypervisor'),
+        'Hypervisor parameters': info_params(data.get('hvparams'), data.get('custom_hvparams')),
+        'Back-end parameters': info_params(data.get('beparams'), data.get('custom_beparams')),
+        'NICs': _nics_info(data),
+        'Disk template': data.get('disk_template'),
+        'Disks': _disks_info(data),
+        'name': data['name'],
+        'admin_state': data.get('admin_state'),
+        'state': None,
+    }
+
+
+class GntInstanceRapi(GntInstanceBackend):
+    """GntInstance which use the ganeti remote API for list, info --static
+    and power commands. The add and modify commands still run gnt-instance.
+    """
+
+    backend_error = RapiError
+
+    def __init__(self, *args, client: RapiClient = None, **kwargs) -> None:
+        """Same arguments than GntInstanceBackend
+
+        Args:
+            client (RapiClient): The RAPI client, its connections are reused by all requests.
+
+        Raises:
+            ValueError: The client is missing
+        """
+        if client is None:
+            raise ValueError('The RAPI client is required')
+        super().__init__(*args, client=client, **kwargs)
+
+    def _job_statuses(self, job_ids: List[int]) -> List[Tuple[str, List]]:
+        """The requests of jobs are pipelined"""
+        jobs = self.client.pipeline([rapi_path('jobs', job_id) for job_id in job_ids])
+        return [(job.get('status'), job.get('opresult')) for job in jobs]
+
+    def _run_job(self, method: str, path: str, submit: bool, body: Dict = None):
+        """Send the request which create a job. Wait the end of job if not submit
+
+        Returns:
+            int: The job id if submit
+        """
+        try:
+            job_id = int(self.client.request(method, path, body=body))
+            if submit:
+                return job_id
+            self.wait_jobs(job_id)
+            return None
+        except RapiError as exception:
+            return self._error(exception, 'Request {} {} failed'.format(method, path))
+
+    def reboot(self, name: str, timeout: bool = 0, submit: bool = False):
+        return self._run_job(
+            'POST',
+            rapi_path(
+                'instances', name, 'reboot',
+                query={'type': 'hard', 'shutdown_timeout': timeout}
+            ),
+            submit
+        )
+
+    def stop(self, name: str, timeout: int = 0, force: bool = False, submit: bool = False):
+        return self._run_job(
+            'PUT', rapi_path('instances', name, 'shutdown'), submit,
+            body={'timeout': timeout, 'force': force}
+        )
+
+    # pylint: disable=unused-argument
+    def start(self, name: str, start: bool = False, submit: bool = False):
+        return self._run_job('PUT', rapi_path('instances', name, 'startup'), submit)
+
+    def remove(self, name: str, submit: bool = False):
+        return self._run_job('DELETE', rapi_path('instances', name), submit)
+
+    def _query(self, fields: List[str], qfilter: List) -> List[List]:
+        return query_result_to_rows(self.client.query('instance', fields, qfilter))
+
+    def info(self, *names: List[str], static: bool = False) -> List[Dict]:
+        """Return static information of instances. Without names, one bulk request
+        get all instances, else the request of each instance are pipelined.
+        The information with runtime state still run gnt-instance info.
+
+        Args:
+            names (List[str]): name of instances
+            static (bool, optional): Get only the configuration. Defaults to False.
+
+        Returns:
+            List[Dict]: Instances information. None if request failed
+        """
+        if not static or self.query_backend is not None:
+            return super().info(*names, static=static)
+        try:
+            if names:
+                instances = self.client.pipeline([rapi_path('instances', name) for name in names])
+            else:
+                instances = self.client.request('GET', rapi_path('instances', query={'bulk': 1}))
+        except RapiError:
+            return None
+        return [rapi_instance_to_info(instance) for instance in instances]
@@ -0,0 +1,209 @@
+"""
+Class GntJob
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_command import (
+    GntCommand,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list import (
+    SEPARATOR_COL,
+    GntListOption,
+    merge_alias_headers,
+    parse_ganeti_list_output,
+)
+
+
+GNT_JOB_CMD_DEFAULT = 'gnt-job'
+
+JOB_STATUS_SUCCESS = 'success'
+JOB_STATUS_ERROR = 'error'
+JOB_STATUS_CANCELED = 'canceled'
+JOB_STATUS_UNKNOWN = 'unknown'
+JOB_STATUS_FINALIZED = [
+    JOB_STATUS_SUCCESS,
+    JOB_STATUS_ERROR,
+    JOB_STATUS_CANCELED,
+    JOB_STATUS_UNKNOWN,
+]
+
+job_field_headers = OrderedDict([
+    ('id', GntListOption('id', 'int')),
+    ('status', GntListOption('status', 'str')),
+])
+
+job_result_field_headers = OrderedDict([
+    ('id', GntListOption('id', 'int')),
+    ('opresult', GntListOption('opresult', 'str')),
+])
+
+
+def parse_job_list_output(*_, stdout: str, **__) -> List[Dict]:
+    """Parse gnt-job list result. The status of unknown job is 'unknown'
+
+    Args:
+        stdout (str): The output of gnt-job list
+
+    Returns:
+        List[Dict]: The jobs id and status
+    """
+    jobs = parse_ganeti_list_output(stdout=stdout, headers=job_field_headers)
+    for job in jobs:
+        job['status'] = job['status'] or JOB_STATUS_UNKNOWN
+    return jobs
+
+
+def batches(values: List, size: int) -> Iterator[List]:
+    """Split values in list of size elements
+
+    Args:
+        values (List): values to split
+        size (int): max size of each batch
+
+    Yields:
+        Iterator[List]: The batches
+    """
+    if size <= 0:
+        raise ValueError('Batch size must be positive')
+    for index in range(0, len(values), size):
+        yield values[index:index + size]
+
+
+def is_finalized(status: str) -> bool:
+    """Check if the job status is a final status
+
+    Args:
+        status (str): The status of job
+
+    Returns:
+        bool: The job is finished
+    """
+    return status in JOB_STATUS_FINALIZED
+
+
+class GntJob(GntCommand):
+    """
+    Class GntJob
+    """
+
+    def __init__(
+        self, run_function: Callable, error_function: Callable, binary: str = None
+    ) -> None:
+        super().__init__(run_function, error_function, binary or GNT_JOB_CMD_DEFAULT)
+
+    def list(self, *job_ids: List[int]) -> List[Dict]:
+        """Run gnt-job list for get status of jobs
+
+        Args:
+            job_ids (List[int]): The jobs id
+
+        Returns:
+            List[Dict]: The jobs id and status
+        """
+        return self._run_command(
+            '--no-headers',
+            "--separator='{}'".format(SEPARATOR_COL),
+            '--output',
+            merge_alias_headers(job_field_headers),
+            *[str(job_id) for job_id in job_ids],
+            command='list',
+            parser=parse_job_list_output
+        )
+
+    def results(self, *job_ids: List[int]) -> Dict[int, str]:
+        """Get the result of opcodes of jobs, as printed by gnt-job list
+
+        Args:
+            job_ids (List[int]): The jobs id
+
+        Returns:
+            Dict[int, str]: The result by job id. Missing job have None result
+        """
+        results = {job_id: None for job_id in job_ids}
+        jobs = self._run_command(
+            '--no-headers',
+            "--separator='{}'".format(SEPARATOR_COL),
+            '--output',
+            merge_alias_headers(job_result_field_headers),
+            *[str(job_id) for job_id in job_ids],
+            command='list',
+            parser=parse_ganeti_list_output,
+            headers=job_result_field_headers
+        )
+        for job in jobs or []:
+            results[job['id']] = job['opresult']
+        return results
+
+    def statuses(self, *job_ids: List[int], batch_size: int = 100) -> Dict[int, str]:
+        """Get status of jobs with one gnt-job list by batch of jobs
+
+        Args:
+            job_ids (List[int]): The jobs id
+            batch_size (int, optional): Max jobs by gnt-job list. Defaults to 100.
+
+        Returns:
+            Dict[int, str]: Status by job id. Missing job have unknown status
+        """
+        statuses = {job_id: JOB_STATUS_UNKNOWN for job_id in job_ids}
+        for batch in batches(list(job_ids), batch_size):
+            for job in self.list(*batch) or []:
+                statuses[job['id']] = job['status']
+        return statuses
+
+
+class JobsTimeout(Exception):
+    """Exception raise when jobs are not finished before timeout
+    """
+
+
+class JobWaiter:
+    """This class wait the end of a set of jobs
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self, gnt_job: GntJob, job_ids: List[int], timeout: int,
+        poll_interval: float, batch_size: int, sleep=time.sleep, clock=time.monotonic
+    ) -> None:
+        self.gnt_job = gnt_job
+        self.statuses = {job_id: None for job_id in job_ids}
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self.clock = clock
+
+    @property
+    def pending(self) -> List[int]:
+        return [
+            job_id for job_id, status in self.statuses.items()
+            if not is_finalized(status)
+        ]
+
+    def poll(self):
+        self.statuses.update(
+            self.gnt_job.statuses(*self.pending, batch_size=self.batch_size)
+        )
+
+    def wait(self) -> Dict[int, str]:
+        """Wait the end of all jobs
+
+        Raises:
+            JobsTimeout: If jobs are not finished before timeout
+
+        Returns:
+            Dict[int, str]: The status by job id
+        """
+        deadline = self.clock() + self.timeout
+        self.poll()
+        while self.pending:
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                raise JobsTimeout(
+                    'Jobs {} are not finished after {}s'.format(self.pending, self.timeout)
+                )
+            self.sleep(min(self.poll_interval, remaining))
+            self.poll()
+        return self.statuses
@@ -0,0 +1,98 @@
+"""
+Difference between the module options and the configuration of instance
+"""
+import datetime
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+
+def _to_result_value(value: Any) -> Any:
+    """Convert the decoded value for the module result (date are not serializable)"""
+    if isinstance(value, dict):
+        return {str(key): _to_result_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_result_value(item) for item in value]
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+class FieldChange:
+    """One changed field, with the old and new values, and the CLI option of change
+    """
+
+    def __init__(self, path: Tuple, old: Any, new: Any, option: str) -> None:
+        self.path = tuple(path)
+        self.old = old
+        self.new = new
+        self.option = option
+
+    def __repr__(self) -> str:
+        return 'FieldChange({}: {!r} -> {!r})'.format(self.field, self.old, self.new)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FieldChange):
+            return NotImplemented
+        return (self.path, self.old, self.new, self.option) \
+            == (other.path, other.old, other.new, other.option)
+
+    @property
+    def field(self) -> str:
+        """Name of field. Ex: hypervisor-parameters.kernel_args, net.0.link"""
+        return '.'.join(str(part) for part in self.path)
+
+    def to_result(self) -> Dict:
+        return {
+            'field': self.field,
+            'old': _to_result_value(self.old),
+            'new': _to_result_value(self.new),
+            'option': self.option,
+        }
+
+
+class InstanceDiff:
+    """Difference between the module options and the configuration of instance.
+    Computed once, it decides the change, gives the modify options and the diff output
+    """
+
+    def __init__(self, options: str, changes: List[FieldChange]) -> None:
+        self.options = options
+        self.changes = changes
+
+    def __repr__(self) -> str:
+        return 'InstanceDiff({})'.format(self.changes)
+
+    def __bool__(self) -> bool:
+        return self.changed
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.options.strip())
+
+    def to_result(self) -> List[Dict]:
+        """The changes for the module result
+
+        Returns:
+            List[Dict]: The changed fields with old and new values
+        """
+        return [change.to_result() for change in self.changes]
+
+    def to_ansible_diff(self, name: str) -> Dict:
+        """The diff of changed fields, for the ansible --diff mode
+
+        Args:
+            name (str): The name of instance
+
+        Returns:
+            Dict: The before and after of changed fields
+        """
+        before, after = OrderedDict(), OrderedDict()
+        for change in self.changes:
+            before[change.field] = _to_result_value(change.old)
+            after[change.field] = _to_result_value(change.new)
+        return {
+            'before_header': name,
+            'after_header': name,
+            'before': dict(before),
+            'after': dict(after),
+        }
@@ -0,0 +1,100 @@
+"""
+Instance parameters and remote status helpers shared by the instance modules
+"""
+from functools import wraps
+from typing import Any, Dict
+
+
+class Instance:
+    """This class implement method for get information of instance options
+    """
+
+    def __init__(self, params: Dict[str, Any]) -> None:
+        self.params = params
+
+    def must_be(self, attribute: str, value: Any) -> bool:
+        return self.params[attribute] == value
+
+    @property
+    def have_options(self) -> bool:
+        return bool(self.params['options'])
+
+    @property
+    def name(self) -> str:
+        return self.params['name']
+
+    @property
+    def must_be_absent(self) -> bool:
+        return self.must_be('state', 'absent')
+
+    @property
+    def must_be_present(self) -> bool:
+        return self.must_be('state', 'present')
+
+    @property
+    def must_be_reboot_if_have_difference(self) -> bool:
+        return self.params['reboot_if_have_any_change']
+
+    @property
+    def must_be_submitted(self) -> bool:
+        return bool((self.params['options'] or {}).get('submit'))
+
+    @property
+    def must_be_up(self) -> bool:
+        return self.must_be('admin_state', 'started')
+
+    @property
+    def must_be_down(self) -> bool:
+        return self.must_be('admin_state', 'stopped')
+
+    @property
+    def must_be_restarted(self) -> bool:
+        return self.must_be('admin_state', 'restarted')
+
+
+class InstanceStatusMissing(Exception):
+    """Exception raise when status is missing
+
+    Args:
+        Exception (str): The message
+    """
+
+
+def need_status(method):
+    @wraps(method)
+    def _impl(self, *args, **kwargs):
+        if self.status is None:
+            raise InstanceStatusMissing('No Instance status')
+        return method(self, *args, **kwargs)
+    return _impl
+
+
+class InstanceStatus:
+    """This class implement method for get status of remote instance
+    """
+
+    def __init__(self, instance: Instance, status: Dict[str, Any]) -> None:
+        self.instance = instance
+        self.status = status
+
+    @property
+    def name(self) -> str:
+        return self.instance.name
+
+    @property
+    def is_present(self) -> bool:
+        return self.status is not None and self.status['name'] == self.name
+
+    @property
+    def is_absent(self) -> bool:
+        return not self.is_present
+
+    @property
+    @need_status
+    def is_up(self) -> bool:
+        return self.status['admin_state'] == 'up'
+
+    @property
+    @need_status
+    def is_down(self) -> bool:
+        return self.status['admin_state'] == 'down'
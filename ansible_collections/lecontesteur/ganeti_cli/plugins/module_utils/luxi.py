@@ -0,0 +1,167 @@
+"""
+Client of the ganeti luxi protocol, on the unix socket of master daemon
+"""
+import json
+import socket
+from typing import Any, Dict, List
+
+
+LUXI_SOCKET_DEFAULT = '/var/run/ganeti/socket/ganeti-master'
+LUXI_EOM = b'\x03'
+LUXI_KEY_METHOD = 'method'
+LUXI_KEY_ARGS = 'args'
+LUXI_KEY_SUCCESS = 'success'
+LUXI_KEY_RESULT = 'result'
+
+QUERY_RS_NORMAL = 0
+
+
+class LuxiError(Exception):
+    """Exception raise when the luxi call failed
+    """
+
+
+def build_names_filter(field: str, *names: List[str]) -> List:
+    """Build the query filter which select names
+
+    Args:
+        field (str): The name field
+        names (List[str]): The names. No filter if empty
+
+    Returns:
+        List: The query filter
+    """
+    if not names:
+        return None
+    return ['|'] + [['=', field, name] for name in names]
+
+
+def query_result_to_rows(result: Dict) -> List[List]:
+    """Get the values of Query result. The value of field without
+    data (unavailable, offline node...) is None
+
+    Args:
+        result (Dict): The result of Query
+
+    Returns:
+        List[List]: One list of values by object
+    """
+    return [
+        [value if status == QUERY_RS_NORMAL else None for status, value in row]
+        for row in result['data']
+    ]
+
+
+class LuxiClient:
+    """Luxi client. The connection is open on first call and reused for all calls.
+    Not thread safe, use one client by thread.
+    """
+
+    def __init__(
+        self, address: str = None, timeout: float = 60, socket_factory=socket.socket
+    ) -> None:
+        self.address = address or LUXI_SOCKET_DEFAULT
+        self.timeout = timeout
+        self._socket_factory = socket_factory
+        self._socket = None
+        self._buffer = b''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def connect(self):
+        if self._socket is not None:
+            return
+        sock = self._socket_factory(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.address)
+        except OSError as exception:
+            sock.close()
+            raise LuxiError(
+                'Can\'t connect to {}: {}'.format(self.address, exception)
+            ) from exception
+        self._socket = sock
+        self._buffer = b''
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+        self._socket = None
+        self._buffer = b''
+
+    def _recv_message(self) -> bytes:
+        while LUXI_EOM not in self._buffer:
+            data = self._socket.recv(4096)
+            if not data:
+                raise LuxiError('Connection closed by {}'.format(self.address))
+            self._buffer += data
+        message, self._buffer = self._buffer.split(LUXI_EOM, 1)
+        return message
+
+    def call(self, method: str, *args: List[Any]) -> Any:
+        """Call a luxi method
+
+        Args:
+            method (str): The method. Ex: Query, SubmitJob
+            args (List[Any]): The arguments of method
+
+        Raises:
+            LuxiError: The connection or the method failed
+
+        Returns:
+            Any: The result of method
+        """
+        self.connect()
+        request = json.dumps({LUXI_KEY_METHOD: method, LUXI_KEY_ARGS: list(args)})
+        try:
+            self._socket.sendall(request.encode('utf-8') + LUXI_EOM)
+            response = json.loads(self._recv_message().decode('utf-8'))
+        except (OSError, ValueError) as exception:
+            self.close()
+            raise LuxiError('Luxi call {} failed: {}'.format(method, exception)) from exception
+        if not response.get(LUXI_KEY_SUCCESS):
+            raise LuxiError('Luxi call {} failed: {}'.format(method, response.get(LUXI_KEY_RESULT)))
+        return response.get(LUXI_KEY_RESULT)
+
+    def query(self, what: str, fields: List[str], qfilter: List = None) -> List[List]:
+        """Query objects of cluster
+
+        Args:
+            what (str): The object type. Ex: instance, node, job
+            fields (List[str]): The fields, same names than list commands
+            qfilter (List, optional): The query filter. Defaults to None.
+
+        Returns:
+            List[List]: One list of values by object
+        """
+        return query_result_to_rows(self.call('Query', what, fields, qfilter))
+
+    def submit_job(self, *opcodes: List[Dict]) -> int:
+        """Submit a job
+
+        Args:
+            opcodes (List[Dict]): The opcodes of job
+
+        Returns:
+            int: The job id
+        """
+        return int(self.call('SubmitJob', list(opcodes)))
+
+    def query_jobs(self, job_ids: List[int], fields: List[str]) -> List[List]:
+        """Get the fields of jobs. The values of unknown job are None
+
+        Args:
+            job_ids (List[int]): The jobs id
+            fields (List[str]): The fields. Ex: status, opresult
+
+        Returns:
+            List[List]: The fields by job
+        """
+        return [
+            row or [None] * len(fields)
+            for row in self.call('QueryJobs', list(job_ids), fields)
+        ]
@@ -1,13 +1,16 @@
 """
   Parse generic info response
 """
+import io
 import re
-from typing import Dict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
 from enum import Enum
 import yaml
 
 
 DELIMITER = '.'
+TOP_LEVEL_RECORD = re.compile(r'^-\s')
 
 
 def remove_after_dash(key: str, delimiter=DELIMITER) -> str:
@@ -165,11 +168,140 @@ class ParseType(Enum):
 #    return info_flatted
 
 
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)  # pylint: disable=invalid-name
+# Plain scalar can't start with these yaml indicators
+YAML_INDICATORS = frozenset('[]{}#&*!|>\'"%@`,?')
+_RESOLVER = yaml.resolver.Resolver()
+_CONSTRUCTOR = yaml.constructor.SafeConstructor()
+
+
+class InfoFormatError(Exception):
+    """Exception raise when the info output is not in the known layout
+    """
+
+
+@lru_cache(maxsize=4096)
+def _load_plain_scalar(value: str) -> Any:
+    node = yaml.ScalarNode(_RESOLVER.resolve(yaml.ScalarNode, value, (True, False)), value)
+    return _CONSTRUCTOR.yaml_constructors[node.tag](_CONSTRUCTOR, node)
+
+
+def load_scalar(value: str) -> Any:
+    """Load a value like yaml. The plain scalar are typed with the yaml
+    resolver (int, float, bool, null, timestamp), without run the yaml parser.
+    The other values (flow, quoted...) are loaded by yaml.
+
+    Args:
+        value (str): The value
+
+    Returns:
+        Any: The typed value
+    """
+    value = value.strip()
+    if not value:
+        return None
+    if value[0] in YAML_INDICATORS or value.startswith('- ') or ' #' in value \
+            or ': ' in value or value.endswith(':'):
+        return yaml.load(value, Loader=YAML_LOADER)
+    return _load_plain_scalar(value)
+
+
+def _split_key(content: str) -> Tuple[str, str]:
+    if content.endswith(':'):
+        return content[:-1], ''
+    index = content.find(': ')
+    if index <= 0:
+        raise InfoFormatError('No key in line: {}'.format(content))
+    return content[:index], content[index + 2:]
+
+
+def _key(key: str) -> Any:
+    if not key or key[0] in YAML_INDICATORS or ' #' in key:
+        raise InfoFormatError('Unsupported key: {}'.format(key))
+    return load_scalar(key)
+
+
+# pylint: disable=too-few-public-methods
+class InfoLineParser:
+    """Single pass parser of the indentation based layout of ganeti info commands.
+    Support the block mappings and sequences of plain scalars.
+    """
+
+    def __init__(self, info: str) -> None:
+        self.lines = []
+        for line in info.splitlines():
+            content = line.strip()
+            if not content:
+                continue
+            if '\t' in line or content.startswith('#'):
+                raise InfoFormatError('Unsupported line: {}'.format(line))
+            self.lines.append([len(line) - len(line.lstrip(' ')), content])
+        self.index = 0
+
+    def parse(self) -> Any:
+        if not self.lines:
+            return None
+        value = self._block(self.lines[0][0])
+        if self.index != len(self.lines):
+            raise InfoFormatError('Unexpected indentation at line {}'.format(self.index))
+        return value
+
+    def _is_sequence_item(self, index: int) -> bool:
+        content = self.lines[index][1]
+        return content == '-' or content.startswith('- ')
+
+    def _block(self, indent: int) -> Any:
+        if self._is_sequence_item(self.index):
+            return self._sequence(indent)
+        return self._mapping(indent)
+
+    def _sequence(self, indent: int) -> List:
+        items = []
+        while self.index < len(self.lines) and self.lines[self.index][0] == indent \
+                and self._is_sequence_item(self.index):
+            content = self.lines[self.index][1][2:].strip()
+            if not content:
+                self.index += 1
+                items.append(self._nested(indent))
+            elif ': ' in content or content.endswith(':') or content.startswith('- '):
+                # The item is a block which start on the line of dash
+                self.lines[self.index] = [indent + 2, content]
+                items.append(self._block(indent + 2))
+            else:
+                self.index += 1
+                items.append(load_scalar(content))
+        return items
+
+    def _mapping(self, indent: int) -> Dict:
+        mapping = {}
+        while self.index < len(self.lines) and self.lines[self.index][0] == indent \
+                and not self._is_sequence_item(self.index):
+            key, value = _split_key(self.lines[self.index][1])
+            self.index += 1
+            if value.strip():
+                mapping[_key(key)] = load_scalar(value)
+            else:
+                mapping[_key(key)] = self._nested(indent, allow_same_indent_sequence=True)
+        if self.index < len(self.lines) and self.lines[self.index][0] > indent:
+            raise InfoFormatError('Unexpected indentation at line {}'.format(self.index))
+        return mapping
+
+    def _nested(self, indent: int, allow_same_indent_sequence: bool = False) -> Any:
+        if self.index >= len(self.lines):
+            return None
+        next_indent = self.lines[self.index][0]
+        if next_indent > indent:
+            return self._block(next_indent)
+        if allow_same_indent_sequence and next_indent == indent \
+                and self._is_sequence_item(self.index):
+            return self._sequence(indent)
+        return None
+
+
 def parse(info: str) -> Dict:
     """Parse info output.
-    - Using yaml parser.
-    - Flat parsed data
-    - Transform key for directly use it
+    - Using the dedicated line parser of info layout.
+    - Fall back to yaml parser (C loader if available) if the layout is unknown
 
     Args:
         info (str): Data to parse
@@ -177,7 +309,10 @@ def parse(info: str) -> Dict:
     Returns:
         Dict: Dict of data
     """
-    return yaml.safe_load(info)
+    try:
+        return InfoLineParser(info).parse()
+    except InfoFormatError:
+        return yaml.load(info, Loader=YAML_LOADER)
 
 
 def parse_from_stdout(*_, stdout: str, **__) -> Dict:
@@ -190,3 +325,41 @@ def parse_from_stdout(*_, stdout: str, **__) -> Dict:
         FlatterDict: _description_
     """
     return parse(stdout)
+
+
+def split_records(stdout: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Split info output on each top-level record ('- Instance name: ...').
+    Only one record is in memory at a time
+
+    Args:
+        stdout (Union[str, Iterable[str]]): The output, or an iterable of its lines
+
+    Yields:
+        Iterator[str]: The text of each record
+    """
+    lines = io.StringIO(stdout) if isinstance(stdout, str) else stdout
+    record = []
+    for line in lines:
+        if TOP_LEVEL_RECORD.match(line) and record:
+            yield ''.join(record)
+            record = []
+        record.append(line if line.endswith('\n') else line + '\n')
+    if record:
+        yield ''.join(record)
+
+
+def iter_from_stdout(*_, stdout: Union[str, Iterable[str]], **__) -> Iterator[Dict]:
+    """Parse info output record by record
+
+    Args:
+        stdout (Union[str, Iterable[str]]): The output, or an iterable of its lines
+
+    Yields:
+        Iterator[Dict]: Each parsed record
+    """
+    for record in split_records(stdout):
+        parsed = parse(record)
+        if isinstance(parsed, list):
+            yield from parsed
+        elif parsed is not None:
+            yield parsed
@@ -0,0 +1,275 @@
+"""
+Client of the ganeti remote API (RAPI), with a pool of keep-alive connections
+"""
+import base64
+import http.client
+import json
+import ssl
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List
+from urllib.parse import urlencode, quote
+
+
+RAPI_PORT_DEFAULT = 5080
+RAPI_VERSION_PREFIX = '/2'
+
+
+class RapiError(Exception):
+    """Exception raise when the RAPI request failed
+    """
+
+    def __init__(self, msg: str, code: int = None) -> None:
+        super().__init__(msg)
+        self.code = code
+
+
+class _SharedResponseFile:
+    """File of socket shared by the pipelined responses.
+    The response close the file after read, the other responses must keep it.
+    """
+
+    def __init__(self, fp) -> None:
+        self._fp = fp
+
+    def __getattr__(self, name: str):
+        return getattr(self._fp, name)
+
+    def close(self):
+        pass
+
+
+# pylint: disable=too-few-public-methods
+class _PipelineSocket:
+    """Socket given to HTTPResponse, its file is the shared file
+    """
+
+    def __init__(self, fp: _SharedResponseFile) -> None:
+        self._fp = fp
+
+    # pylint: disable=unused-argument
+    def makefile(self, *_, **__):
+        return self._fp
+
+
+def rapi_path(*parts: List[str], query: Dict = None) -> str:
+    """Build the path of RAPI resource
+
+    Args:
+        parts (List[str]): The parts of path, quoted
+        query (Dict, optional): The query parameters. Defaults to None.
+
+    Returns:
+        str: The path. Ex: /2/instances/vm1/reboot?type=hard
+    """
+    path = '/'.join([RAPI_VERSION_PREFIX] + [quote(str(part), safe='') for part in parts])
+    query = {key: value for key, value in (query or {}).items() if value is not None}
+    if query:
+        path = '{}?{}'.format(path, urlencode(query))
+    return path
+
+
+def decode_response(response: http.client.HTTPResponse, method: str, path: str) -> Any:
+    """Read and decode the json body of response
+
+    Args:
+        response (http.client.HTTPResponse): The response
+        method (str): The method of request
+        path (str): The path of request
+
+    Raises:
+        RapiError: The status is not a success
+
+    Returns:
+        Any: The decoded body
+    """
+    body = response.read()
+    if response.status >= 300:
+        raise RapiError(
+            '{} {} failed with {}: {}'.format(
+                method, path, response.status, body.decode('utf-8', 'replace')
+            ),
+            code=response.status
+        )
+    if not body:
+        return None
+    return json.loads(body.decode('utf-8'))
+
+
+# pylint: disable=too-many-instance-attributes
+class RapiClient:
+    """RAPI client. The connections are kept alive and reused by the requests.
+    A connection is used by one thread at a time.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self, host: str, port: int = RAPI_PORT_DEFAULT, username: str = None,
+        password: str = None, scheme: str = 'https', verify: bool = True,
+        timeout: float = 60, pool_size: int = 4
+    ) -> None:
+        if scheme not in ['http', 'https']:
+            raise ValueError('Scheme must be http or https, not {}'.format(scheme))
+        self.host = host
+        self.port = port
+        self.scheme = scheme
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
+        if username is not None:
+            credentials = '{}:{}'.format(username, password or '').encode('utf-8')
+            self.headers['Authorization'] = 'Basic {}'.format(
+                base64.b64encode(credentials).decode('ascii')
+            )
+        self._ssl_context = None
+        if scheme == 'https':
+            self._ssl_context = ssl.create_default_context()
+            if not verify:
+                self._ssl_context.check_hostname = False
+                self._ssl_context.verify_mode = ssl.CERT_NONE
+        self._lock = threading.Lock()
+        self._idle = []
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    @contextmanager
+    def connection(self, fresh: bool = False):
+        """Take a connection of pool, or open a new one (always with fresh).
+        The connection go back to pool if no error occurs
+        """
+        conn = None
+        if not fresh:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._new_connection()
+        try:
+            yield conn
+        except Exception:
+            conn.close()
+            raise
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def request(self, method: str, path: str, body: Any = None) -> Any:
+        """Send a request and decode the json response.
+        A request on a connection closed by server is sent again on a new connection
+
+        Args:
+            method (str): The HTTP method
+            path (str): The path. Ex: /2/instances
+            body (Any, optional): The body, encoded in json. Defaults to None.
+
+        Raises:
+            RapiError: The request failed
+
+        Returns:
+            Any: The decoded response
+        """
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        for attempt in range(2):
+            try:
+                with self.connection() as conn:
+                    conn.request(method, path, body=payload, headers=self.headers)
+                    return decode_response(conn.getresponse(), method, path)
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) \
+                    as exception:
+                if attempt:
+                    raise RapiError('{} {} failed: {}'.format(method, path, exception)) \
+                        from exception
+            except (OSError, http.client.HTTPException) as exception:
+                raise RapiError('{} {} failed: {}'.format(method, path, exception)) \
+                    from exception
+        return None
+
+    def _build_get(self, path: str) -> bytes:
+        lines = ['GET {} HTTP/1.1'.format(path), 'Host: {}:{}'.format(self.host, self.port)]
+        lines.extend('{}: {}'.format(key, value) for key, value in self.headers.items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('ascii')
+
+    def _pipeline_responses(
+        self, conn: http.client.HTTPConnection, paths: List[str], results: List[Any]
+    ) -> None:
+        """Send the GET requests on connection, and append the decoded responses to results.
+        Stop at the response after which the server close the connection
+        """
+        if conn.sock is None:
+            conn.connect()
+        conn.sock.sendall(b''.join(self._build_get(path) for path in paths))
+        shared_fp = _SharedResponseFile(conn.sock.makefile('rb'))
+        for path in paths:
+            response = http.client.HTTPResponse(_PipelineSocket(shared_fp), method='GET')
+            response.begin()
+            results.append(decode_response(response, 'GET', path))
+            if response.will_close:
+                conn.close()
+                return
+
+    def pipeline(self, paths: List[str]) -> List[Any]:
+        """Send all GET requests on one connection before read the responses.
+        The server answer in the order of requests. If the server close the connection
+        (stale connection of pool, or Connection: close) before the last response,
+        the remaining requests are sent again on a new connection
+
+        Args:
+            paths (List[str]): The paths
+
+        Raises:
+            RapiError: One request failed, or a new connection is closed without response
+
+        Returns:
+            List[Any]: The decoded responses, in order of paths
+        """
+        results = []
+        fresh = False
+        while len(results) < len(paths):
+            done = len(results)
+            cause = None
+            try:
+                with self.connection(fresh=fresh) as conn:
+                    self._pipeline_responses(conn, paths[done:], results)
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) \
+                    as exception:
+                cause = exception
+            except (OSError, http.client.HTTPException) as exception:
+                raise RapiError('Pipelined requests failed: {}'.format(exception)) from exception
+            if fresh and len(results) == done:
+                raise RapiError(
+                    'Connection closed by server in pipeline, {} responses pending'.format(
+                        len(paths) - done
+                    )
+                ) from cause
+            fresh = True
+        return results
+
+    def query(self, what: str, fields: List[str], qfilter: List = None) -> Dict:
+        """Query objects of cluster, same result than luxi Query
+
+        Args:
+            what (str): The object type. Ex: instance, node, job
+            fields (List[str]): The fields, same names than list commands
+            qfilter (List, optional): The query filter. Defaults to None.
+
+        Returns:
+            Dict: The query result
+        """
+        if qfilter is None:
+            return self.request('GET', rapi_path('query', what, query={'fields': ','.join(fields)}))
+        return self.request(
+            'PUT', rapi_path('query', what), body={'fields': fields, 'qfilter': qfilter}
+        )
@@ -4,17 +4,20 @@ ansible gnt-instance module
 """
 
 from __future__ import (absolute_import, division, print_function)
-from functools import wraps
-from typing import Any, Dict
+from typing import Dict, List
 __metaclass__ = type  # pylint: disable=invalid-name
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.lecontesteur.ganeti_cli.plugins.\
-    module_utils.builder_command_options.builders import BuilderCommand
+    module_utils.arguments_spec import GNT_INSTANCE_MODULE_ARGS
 from ansible_collections.lecontesteur.ganeti_cli.plugins.\
-    module_utils.gnt_instance import (
-        GntInstance,
-        builder_gnt_instance_spec
+    module_utils.gnt_instance import GntInstance
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.instance_diff import InstanceDiff
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.instance_status import (
+        Instance,
+        InstanceStatus,
     )
 
 
@@ -24,31 +27,11 @@ module: lecontesteur.ganeti_cli.gnt_instance
 
 short_description: Create/Remove/Modify ganeti instance from cli
 
-options:
-    name:
-        description: The name of instance
-        required: true
-        type: str
-    state:
-        description: Instance must be present of absent
-        required: false
-        type: str
-    admin_state:
-        description: Health cycle of instance
-        required: false
-        type: str
-    reboot_if_have_any_change:
-        description: Reboot the instance if have modification onto instance
-        required: false
-        type: bool
-    options:
-        description: Ganeti instance options
-        required: false
-        type: dict
-# Specify this value according to your collection
-# in format of namespace.collection.doc_fragment_name
+description:
+    - Create, modify, restart or remove one ganeti instance with C(gnt-instance).
+
 extends_documentation_fragment:
-    - my_namespace.my_collection.my_doc_fragment_name
+    - lecontesteur.ganeti_cli.gnt_instance
 
 author:
     - LeContesteur (@LeConTesteur)
@@ -114,114 +97,20 @@ EXAMPLES = r'''
 '''
 
 RETURN = r'''
+jobs:
+    description: The id of submitted jobs, when the submit option is set
+    returned: always
+    type: list
+    elements: int
+changes:
+    description: The changed fields of modified instance, with old and new values
+        and the option of gnt-instance modify
+    returned: when the instance is modified
+    type: list
+    elements: dict
 '''
 
 
-# define available arguments/parameters a user can pass to the module
-state_choices = ['present', 'absent']
-admin_state_choices = ['restarted', 'started', 'stopped']
-module_args = {
-    "name": {"type": 'str', "required": True, "aliases": ['instance_name']},
-    "state": {"type": 'str', "required": False, "default": 'present', "choices": state_choices},
-    "options": BuilderCommand(builder_gnt_instance_spec).generate_args_spec(),
-    "admin_state": {
-        "type": 'str', "required": False, "default": 'started', "choices": admin_state_choices
-    },
-    "reboot_if_have_any_change": {"type": 'bool', "required": False, "default": False},
-}
-
-
-class Instance:
-    """This class implement method for get information of instance options
-    """
-
-    def __init__(self, params: Dict[str, Any]) -> None:
-        self.params = params
-
-    def must_be(self, attribute: str, value: Any) -> bool:
-        return self.params[attribute] == value
-
-    @property
-    def have_options(self) -> bool:
-        return bool(self.params['options'])
-
-    @property
-    def name(self) -> str:
-        return self.params['name']
-
-    @property
-    def must_be_absent(self) -> bool:
-        return self.must_be('state', 'absent')
-
-    @property
-    def must_be_present(self) -> bool:
-        return self.must_be('state', 'present')
-
-    @property
-    def must_be_reboot_if_have_difference(self) -> bool:
-        return self.params['reboot_if_have_any_change']
-
-    @property
-    def must_be_up(self) -> bool:
-        return self.must_be('admin_state', 'started')
-
-    @property
-    def must_be_down(self) -> bool:
-        return self.must_be('admin_state', 'stopped')
-
-    @property
-    def must_be_restarted(self) -> bool:
-        return self.must_be('admin_state', 'restarted')
-
-
-class InstanceStatusMissing(Exception):
-    """Exception raise when status is missing
-
-    Args:
-        Exception (str): The message
-    """
-
-
-def need_status(method):
-    @wraps(method)
-    def _impl(self, *args, **kwargs):
-        if self.status is None:
-            raise InstanceStatusMissing('No Instance status')
-        return method(self, *args, **kwargs)
-    return _impl
-
-
-class InstanceStatus:
-    """This class implement method for get status of remote instance
-    """
-
-    def __init__(self, instance: Instance, status: Dict[str, Any]) -> None:
-        self.instance = instance
-        self.status = status
-
-    @property
-    def name(self) -> str:
-        return self.instance.name
-
-    @property
-    def is_present(self) -> bool:
-        return self.status is not None and self.status['name'] == self.name
-
-    @property
-    def is_absent(self) -> bool:
-        return not self.is_present
-
-    @property
-    @need_status
-    def is_up(self) -> bool:
-        return self.status['admin_state'] == 'up'
-
-    @property
-    @need_status
-    def is_down(self) -> bool:
-        return self.status['admin_state'] == 'down'
-
-
 class ModuleActions:
     """This class implement actions of module
     """
@@ -231,6 +120,9 @@ class ModuleActions:
         self.gnt_instance = GntInstance(module.run_command, self.error)
         self.instance = Instance(self.module.params)
         self.last_status = InstanceStatus(self.instance, None)
+        self.last_info = None
+        self.last_diff = None
+        self.jobs = []
 
     def error(self, code, stdout, stderr, msg=None):
         self.module.fail_json(msg=msg, code=code, stdout=stdout, stderr=stderr)
@@ -238,55 +130,113 @@ class ModuleActions:
     def have_difference(self) -> bool:
         if not self.instance.have_options:
             return False
-        return self.gnt_instance.config_and_remote_have_difference(
-            self.instance.params,
-            self.last_status.status
+        return self.instance_diff().changed
+
+    def instance_diff(self) -> InstanceDiff:
+        """Compute the difference between options and configuration of instance.
+        The result is kept until the next refresh of status, and reused by modify
+
+        Returns:
+            InstanceDiff: The difference
+        """
+        if self.last_diff is None:
+            self.last_diff = self.gnt_instance.diff(self.instance.params, self.instance_info())
+        return self.last_diff
+
+    def report_diff(self, result: Dict):
+        """Add the changed fields in result, and the diff in ansible --diff mode
+
+        Args:
+            result (Dict): The module result
+        """
+        diff = self.instance_diff()
+        result['changes'] = diff.to_result()
+        if self.module._diff:  # pylint: disable=protected-access
+            result['diff'] = diff.to_ansible_diff(self.instance.name)
+
+    def find_instance(self, instances: List[Dict]) -> Dict:
+        """Find the instance of module in list of instances
+
+        Args:
+            instances (List[Dict]): Instances information
+
+        Returns:
+            Dict: The information of instance. None if missing
+        """
+        return next(
+            filter(
+                lambda instance: instance.get('name') == self.instance.name,
+                instances or []
+            ),
+            None
         )
 
     def refresh_instance_status(self) -> InstanceStatus:
-        def filter_by_name(instance_info: Dict) -> bool:
-            return instance_info.get('name') == self.instance.name
-        try:
-            self.last_status = InstanceStatus(
-                self.instance,
-                next(
-                    filter(
-                        filter_by_name,
-                        self.gnt_instance.info(self.instance.name) or []
-                    )
-                )
-            )
-        except StopIteration:
-            self.last_status = InstanceStatus(self.instance, None)
+        """Probe existence and state of instance with gnt-instance list.
+        The configuration is fetched only when options are compared
+
+        Returns:
+            InstanceStatus: The status
+        """
+        self.last_info = None
+        self.last_diff = None
+        self.last_status = InstanceStatus(
+            self.instance,
+            self.find_instance(self.gnt_instance.live_state(self.instance.name))
+        )
         return self.last_status
 
+    def instance_info(self) -> Dict:
+        """Get the configuration of instance with gnt-instance info --static.
+        The result is kept until the next refresh of status
+
+        Returns:
+            Dict: The configuration of instance
+        """
+        if self.last_info is None and self.last_status.is_present:
+            self.last_info = self.find_instance(
+                self.gnt_instance.info(self.instance.name, static=True)
+            )
+        return self.last_info
+
+    def track_job(self, job_id):
+        if job_id is not None:
+            self.jobs.append(job_id)
+        return job_id
+
     def create_instance(self):
-        return self.gnt_instance.add(
+        return self.track_job(self.gnt_instance.add(
             self.instance.name,
             self.instance.params
-        )
+        ))
 
     def modify_instance(self):
-        return self.gnt_instance.modify(
+        return self.track_job(self.gnt_instance.modify(
             self.instance.name,
             self.instance.params,
-            self.last_status.status
-        )
+            self.instance_info(),
+            diff=self.instance_diff()
+        ))
 
     def reboot_instance(self):
-        return self.gnt_instance.reboot(
-            self.instance.name
-        )
+        return self.track_job(self.gnt_instance.reboot(
+            self.instance.name,
+            submit=self.instance.must_be_submitted
+        ))
 
-    def stop_instance(self):
-        return self.gnt_instance.stop(
-            self.instance.name
-        )
+    def stop_instance(self, submit: bool = None):
+        if submit is None:
+            submit = self.instance.must_be_submitted
+        return self.track_job(self.gnt_instance.stop(
+            self.instance.name,
+            submit=submit
+        ))
 
     def remove_instance(self):
-        return self.gnt_instance.remove(
-            self.instance.name
-        )
+        return self.track_job(self.gnt_instance.remove(
+            self.instance.name,
+            submit=self.instance.must_be_submitted
+        ))
 
 
 def main_with_module(module: AnsibleModule) -> None:
@@ -317,26 +267,33 @@ def main_with_module(module: AnsibleModule) -> None:
             actions.create_instance()
             result['changed'] = True
         elif actions.have_difference():
+            actions.report_diff(result)
             if instance.must_be_reboot_if_have_difference:
-                actions.stop_instance()
+                # modify must be run on stopped instance, never submit the stop
+                actions.stop_instance(submit=False)
             actions.modify_instance()
             result['changed'] = True
 
-        if result['changed']:
-            status = actions.refresh_instance_status()
-
-        if instance.must_be_restarted or instance.must_be_up and not status.is_up:
-            actions.reboot_instance()
-            result['changed'] = True
-        elif instance.must_be_down and not status.is_down:
-            actions.stop_instance()
-            result['changed'] = True
+        # The submitted jobs are not finished, the power state
+        # can't be managed before the end of jobs
+        if not (result['changed'] and instance.must_be_submitted):
+            if result['changed']:
+                status = actions.refresh_instance_status()
+            if instance.must_be_restarted or instance.must_be_up and not status.is_up:
+                actions.reboot_instance()
+                result['changed'] = True
+            elif instance.must_be_down and not status.is_down:
+                actions.stop_instance()
+                result['changed'] = True
 
     if instance.must_be_absent and not status.is_absent:
-        actions.stop_instance()
+        if not instance.must_be_submitted:
+            actions.stop_instance()
         actions.remove_instance()
         result['changed'] = True
 
+    result['jobs'] = actions.jobs
+
     # if the user is working with this module in only check mode we do not
     # want to make any changes to the environment, just return the current
     # state with no modifications
@@ -357,7 +314,7 @@ def main(catch_exception: bool = True):
     # args/params passed to the execution, as well as if the module
     # supports check mode
     module = AnsibleModule(
-        argument_spec=module_args,
+        argument_spec=GNT_INSTANCE_MODULE_ARGS,
         supports_check_mode=True
     )
     try:
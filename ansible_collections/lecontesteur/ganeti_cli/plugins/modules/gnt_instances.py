@@ -0,0 +1,565 @@
+#!/usr/bin/python
+"""
+ansible gnt-instance bulk module
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from collections import OrderedDict
+from typing import Dict, List
+__metaclass__ = type  # pylint: disable=invalid-name
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.arguments_spec import GNT_INSTANCES_MODULE_ARGS
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.gnt_instance import GntInstance
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.gnt_config_data import GanetiConfigData
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.gnt_instance_create import OpportunisticCreator
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.gnt_instance_executor import InstanceOperation
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.gnt_instance_luxi import GntInstanceLuxi
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.gnt_instance_rapi import GntInstanceRapi
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.gnt_job import GntJob
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.instance_status import Instance, InstanceStatus
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.luxi import LuxiClient
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.rapi import RapiClient
+
+
+DOCUMENTATION = r'''
+---
+module: lecontesteur.ganeti_cli.gnt_instances
+
+short_description: Create/Remove/Modify many ganeti instances from cli
+
+description:
+    - Take one C(gnt-instance list) snapshot of the cluster and compute
+      the actions of every instance in memory.
+    - Only the instances which differ from their definition run ganeti commands.
+
+options:
+    instances:
+        description:
+            - List of instances definition.
+            - Each element accept the options I(name), I(state), I(admin_state),
+              I(reboot_if_have_any_change) and I(options) of
+              M(lecontesteur.ganeti_cli.gnt_instance), documented once in the
+              C(lecontesteur.ganeti_cli.gnt_instance) documentation fragment.
+        required: true
+        type: list
+        elements: dict
+    max_workers:
+        description: Max number of instances changed in parallel. 1 run all commands in serial
+        required: false
+        type: int
+        default: 1
+    max_per_node:
+        description: Max number of instances changed in parallel on each primary node
+        required: false
+        type: int
+        default: 1
+    batch_create:
+        description:
+            - Create all missing instances with C(gnt-instance batch-create),
+              grouped by iallocator, instead of one C(gnt-instance add) by instance.
+            - The instances with the submit option are still created one by one.
+        required: false
+        type: bool
+        default: false
+    opportunistic_locking:
+        description:
+            - Create the missing instances which have an iallocator by submitting all
+              C(gnt-instance add) jobs at once, with C(--opportunistic-locking).
+            - The jobs failed because the locked nodes have not enough resources
+              are resubmitted, after the end of the other jobs.
+            - The instances with the submit option are still created one by one.
+        required: false
+        type: bool
+        default: false
+    max_resubmit:
+        description:
+            - Max resubmission of the creation job of one instance, with I(opportunistic_locking)
+        required: false
+        type: int
+        default: 3
+    config_data:
+        description:
+            - Path of the ganeti configuration file, on the master node.
+              Ex. C(/var/lib/ganeti/config.data)
+            - When set, the instances are read in this file instead of
+              run C(gnt-instance list) and C(gnt-instance info).
+              The changes are always run with ganeti commands.
+        required: false
+        type: str
+    luxi_socket:
+        description:
+            - Path of the luxi socket of ganeti master daemon.
+              Ex. C(/var/run/ganeti/socket/ganeti-master)
+            - When set, the list, reboot, stop and remove commands are sent on this
+              socket, with one connection for the module run, instead of
+              run C(gnt-instance). The create and modify commands still run C(gnt-instance).
+        required: false
+        type: str
+    rapi:
+        description:
+            - Connection to the ganeti remote API.
+            - When set, the list, info, reboot, stop and remove commands are sent to RAPI,
+              on keep-alive connections, instead of run C(gnt-instance).
+              The create and modify commands still run C(gnt-instance).
+        required: false
+        type: dict
+        suboptions:
+            host:
+                description: The host of RAPI
+                required: true
+                type: str
+            port:
+                description: The port of RAPI
+                type: int
+                default: 5080
+            scheme:
+                description: The scheme of RAPI
+                type: str
+                default: https
+                choices: [http, https]
+            username:
+                description: The RAPI user
+                type: str
+            password:
+                description: The password of RAPI user
+                type: str
+            verify:
+                description: Verify the certificate of RAPI
+                type: bool
+                default: true
+
+author:
+    - LeContesteur (@LeConTesteur)
+'''
+
+EXAMPLES = r'''
+# Create many instances and remove one
+- name: Manage Instances
+  lecontesteur.ganeti_cli.gnt_instances:
+    max_workers: 4
+    instances:
+      - name: instance1
+        options: &instance_options
+          disk-template: file
+          disk: [{size: 10G}]
+          os-type: noop
+          hypervisor: fake
+      - name: instance2
+        admin_state: stopped
+        options: *instance_options
+      - name: instance3
+        state: absent
+
+# Read the instances through RAPI, from a list of definitions
+- name: Manage Instances with RAPI
+  lecontesteur.ganeti_cli.gnt_instances:
+    instances: "{{ ganeti_instances }}"
+    rapi:
+      host: ganeti-master.example.org
+      username: ansible
+      password: "{{ rapi_password }}"
+'''
+
+RETURN = r'''
+instances:
+    description: Actions run for each instance, with the changed fields of modified instances
+    returned: always
+    type: list
+    elements: dict
+jobs:
+    description: The id of all submitted jobs, when the submit option is set
+    returned: always
+    type: list
+    elements: int
+'''
+
+
+SNAPSHOT_HEADERS = ['name', 'admin_state', 'pnode']
+
+
+# pylint: disable=too-many-instance-attributes
+class InstancePlan:
+    """This class contains the actions to run for one instance
+    """
+
+    def __init__(self, instance: Instance, status: InstanceStatus) -> None:
+        self.instance = instance
+        self.status = status
+        self.info = None
+        self.diff = None
+        self.actions = []
+        self.jobs = []
+        self.done = 0
+        self.error = None
+
+    @property
+    def name(self) -> str:
+        return self.instance.name
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.actions)
+
+    @property
+    def jobs_pending(self) -> bool:
+        return self.changed and self.instance.must_be_submitted
+
+    def to_result(self) -> Dict:
+        return {
+            "name": self.name,
+            "changed": self.changed,
+            "actions": list(self.actions),
+            "jobs": list(self.jobs),
+            "error": self.error,
+            "changes": self.diff.to_result() if self.diff else [],
+        }
+
+
+class BulkModuleActions:
+    """This class implement actions of module for a list of instances
+    """
+
+    def __init__(self, module) -> None:
+        self.module = module
+        query_backend = None
+        if module.params['config_data']:
+            query_backend = GanetiConfigData(module.params['config_data'])
+        if module.params['rapi']:
+            self.gnt_instance = GntInstanceRapi(
+                module.run_command, self.error, query_backend=query_backend,
+                client=RapiClient(**module.params['rapi'])
+            )
+        elif module.params['luxi_socket']:
+            self.gnt_instance = GntInstanceLuxi(
+                module.run_command, self.error, query_backend=query_backend,
+                client=LuxiClient(module.params['luxi_socket'])
+            )
+        else:
+            self.gnt_instance = GntInstance(
+                module.run_command, self.error, query_backend=query_backend
+            )
+        self.primary_nodes = {}
+        self.plans = [
+            InstancePlan(Instance(params), None)
+            for params in self.module.params['instances']
+        ]
+
+    def error(self, code, stdout, stderr, msg=None):
+        self.module.fail_json(msg=msg, code=code, stdout=stdout, stderr=stderr)
+
+    def snapshot(self, *names: List[str]) -> Dict[str, Dict]:
+        """Get admin state of instances in one gnt-instance list
+
+        Args:
+            names (List[str]): Name of instances. All instances if empty
+
+        Returns:
+            Dict[str, Dict]: The status of instances by name
+        """
+        return {
+            status['name']: status
+            for status in self.gnt_instance.list(*names, header_names=SNAPSHOT_HEADERS) or []
+        }
+
+    def refresh_status(self, plans: List[InstancePlan], snapshot: Dict[str, Dict]):
+        self.primary_nodes.update(
+            (name, status.get('pnode')) for name, status in snapshot.items()
+        )
+        for plan in plans:
+            plan.status = InstanceStatus(plan.instance, snapshot.get(plan.name))
+
+    def infos(self, plans: List[InstancePlan]) -> Dict[str, Dict]:
+        """Get the configuration of all instances in one gnt-instance info --static
+
+        Args:
+            plans (List[InstancePlan]): Instances to fetch
+
+        Returns:
+            Dict[str, Dict]: The information of instances by name
+        """
+        if not plans:
+            return {}
+        return {
+            info['name']: info
+            for info in self.gnt_instance.info(*[plan.name for plan in plans], static=True) or []
+        }
+
+    def have_difference(self, plan: InstancePlan, info: Dict) -> bool:
+        """Compute the difference of instance, kept in plan for modify and result
+
+        Args:
+            plan (InstancePlan): The instance plan
+            info (Dict): The information of instance
+
+        Returns:
+            bool: Have difference
+        """
+        plan.diff = self.gnt_instance.diff(plan.instance.params, info)
+        return plan.diff.changed
+
+    def plan_configuration(self):
+        """Compute create, modify and remove actions of all instances
+        """
+        to_diff = [
+            plan for plan in self.plans
+            if plan.instance.must_be_present
+            and plan.status.is_present
+            and plan.instance.have_options
+        ]
+        infos = self.infos(to_diff)
+        to_diff_names = set(plan.name for plan in to_diff)
+
+        for plan in self.plans:
+            instance, status = plan.instance, plan.status
+            if instance.must_be_present:
+                if status.is_absent and not instance.have_options:
+                    self.module.fail_json(
+                        msg='The params of Instance {} must be present if instance does\'t exist'
+                        .format(instance.name)
+                    )
+                if status.is_absent:
+                    plan.actions.append('create')
+                elif plan.name in to_diff_names and self.have_difference(
+                        plan, infos.get(instance.name)):
+                    if instance.must_be_reboot_if_have_difference:
+                        plan.actions.append('stop')
+                    plan.actions.append('modify')
+                    plan.info = infos.get(instance.name)
+
+            if instance.must_be_absent and not status.is_absent:
+                if not instance.must_be_submitted:
+                    plan.actions.append('stop')
+                plan.actions.append('remove')
+
+    def plan_power(self):
+        """Compute power actions of present instances
+        """
+        for plan in self.plans:
+            instance, status = plan.instance, plan.status
+            if not instance.must_be_present or plan.jobs_pending:
+                # The power state of instance with submitted jobs
+                # can't be managed before the end of jobs
+                continue
+            if instance.must_be_restarted or instance.must_be_up and not status.is_up:
+                plan.actions.append('reboot')
+            elif instance.must_be_down and not status.is_down:
+                plan.actions.append('stop')
+
+    def predict_status(self, plan: InstancePlan) -> Dict:
+        """Predict the status of instance after configuration actions.
+        Use in check mode, when nothing is run.
+
+        Args:
+            plan (InstancePlan): The instance plan
+
+        Returns:
+            Dict: The status
+        """
+        if 'create' in plan.actions:
+            options = plan.instance.params['options'] or {}
+            return {'name': plan.name, 'admin_state': 'up' if options.get('start') else 'down'}
+        if 'stop' in plan.actions:
+            return dict(plan.status.status, admin_state='down')
+        return plan.status.status
+
+    @staticmethod
+    def must_submit(plan: InstancePlan, action: str) -> bool:
+        """Check if the action must be submitted.
+        The stop before modify is never submitted, modify must be run on stopped instance
+
+        Args:
+            plan (InstancePlan): The instance plan
+            action (str): The action
+
+        Returns:
+            bool: The action must be submitted
+        """
+        if action == 'stop' and 'modify' in plan.actions:
+            return False
+        return plan.instance.must_be_submitted
+
+    def operation(self, plan: InstancePlan, action: str) -> InstanceOperation:
+        submit = self.must_submit(plan, action)
+        if action == 'create':
+            return InstanceOperation(plan.name, 'add', plan.instance.params)
+        if action == 'modify':
+            return InstanceOperation(
+                plan.name, 'modify', plan.instance.params, plan.info, diff=plan.diff
+            )
+        if action in ['stop', 'reboot', 'remove']:
+            return InstanceOperation(plan.name, action, submit=submit)
+        raise ValueError('Unknown action {}'.format(action))
+
+    def run(self):
+        """Run the actions of plans which are not already done
+        """
+        if not self.module.check_mode:
+            if self.module.params['opportunistic_locking']:
+                self.run_opportunistic_create()
+            if self.module.params['batch_create']:
+                self.run_batch_create()
+            self.run_operations()
+        for plan in self.plans:
+            plan.done = len(plan.actions)
+
+    def run_operations(self):
+        """Run the actions of plans which are not already done, in serial or parallel
+        """
+        if self.module.params['max_workers'] > 1:
+            self.run_parallel()
+        else:
+            self.run_serial()
+
+    def plans_to_create(self) -> List[InstancePlan]:
+        """Get the plans which must run create, without submit option
+
+        Returns:
+            List[InstancePlan]: The plans
+        """
+        return [
+            plan for plan in self.plans
+            if plan.actions[plan.done:plan.done + 1] == ['create']
+            and not plan.instance.must_be_submitted
+        ]
+
+    def run_opportunistic_create(self):
+        """Create the instances with iallocator, all jobs submitted with opportunistic locking
+        """
+        plans = [
+            plan for plan in self.plans_to_create()
+            if (plan.instance.params['options'] or {}).get('iallocator')
+        ]
+        if not plans:
+            return
+        results = OpportunisticCreator(
+            self.gnt_instance,
+            GntJob(self.module.run_command, self.error),
+            max_resubmit=self.module.params['max_resubmit'],
+        ).create(OrderedDict((plan.name, plan.instance.params) for plan in plans))
+        for plan in plans:
+            plan.done += 1
+            plan.jobs.extend(results[plan.name].jobs)
+            if results[plan.name].failed:
+                plan.error = results[plan.name].error
+        self.fail_if_errors()
+
+    def run_batch_create(self):
+        """Create the instances with one gnt-instance batch-create by iallocator
+        """
+        batches = OrderedDict()
+        for plan in self.plans_to_create():
+            iallocator = (plan.instance.params['options'] or {}).get('iallocator')
+            batches.setdefault(iallocator, []).append(plan)
+        for iallocator, plans in batches.items():
+            self.gnt_instance.batch_create(
+                OrderedDict((plan.name, plan.instance.params) for plan in plans),
+                iallocator=iallocator
+            )
+            for plan in plans:
+                plan.done += 1
+
+    def run_serial(self):
+        for plan in self.plans:
+            for action in plan.actions[plan.done:]:
+                job_id = self.operation(plan, action).run(self.gnt_instance)
+                if job_id is not None:
+                    plan.jobs.append(job_id)
+
+    def run_parallel(self):
+        """Run the actions of each instance in parallel, fail if one instance have error
+        """
+        plans = OrderedDict((plan.name, plan) for plan in self.plans)
+        results = self.gnt_instance.parallel(
+            [
+                self.operation(plan, action)
+                for plan in self.plans
+                for action in plan.actions[plan.done:]
+            ],
+            max_workers=self.module.params['max_workers'],
+            max_per_node=self.module.params['max_per_node'],
+            primary_nodes=self.primary_nodes,
+        )
+        for name, result in results.items():
+            plans[name].jobs.extend(job_id for job_id in result.results if job_id is not None)
+            if result.failed:
+                plans[name].error = str(result.error)
+        self.fail_if_errors()
+
+    def fail_if_errors(self):
+        """Fail with the result of all instances if one instance have error
+        """
+        failed = [plan.name for plan in self.plans if plan.error]
+        if failed:
+            self.module.fail_json(
+                msg='Commands failed on instances {}'.format(failed),
+                instances=[plan.to_result() for plan in self.plans],
+            )
+
+
+def main_with_module(module: AnsibleModule) -> None:
+    """Main function with module parameter
+
+    Args:
+        module (AnsibleModule): Ansible Module
+    """
+    actions = BulkModuleActions(module)
+    actions.refresh_status(actions.plans, actions.snapshot())
+
+    actions.plan_configuration()
+    actions.run()
+
+    changed = [
+        plan for plan in actions.plans
+        if plan.instance.must_be_present and plan.changed and not plan.jobs_pending
+    ]
+    if changed and module.check_mode:
+        for plan in changed:
+            plan.status = InstanceStatus(plan.instance, actions.predict_status(plan))
+    elif changed:
+        actions.refresh_status(changed, actions.snapshot(*[plan.name for plan in changed]))
+
+    actions.plan_power()
+    actions.run()
+
+    result = {
+        "changed": any(plan.changed for plan in actions.plans),
+        "instances": [plan.to_result() for plan in actions.plans],
+        "jobs": [job_id for plan in actions.plans for job_id in plan.jobs],
+    }
+    if module._diff:  # pylint: disable=protected-access
+        result['diff'] = [
+            plan.diff.to_ansible_diff(plan.name) for plan in actions.plans if plan.diff
+        ]
+    module.exit_json(**result)
+
+
+def main(catch_exception: bool = True):
+    """
+    Main function
+    """
+    module = AnsibleModule(
+        argument_spec=GNT_INSTANCES_MODULE_ARGS,
+        supports_check_mode=True
+    )
+    try:
+        main_with_module(module)
+    except Exception as exception:
+        if catch_exception:
+            module.fail_json(msg=str(exception))
+        raise
+
+
+if __name__ == '__main__':
+    main()
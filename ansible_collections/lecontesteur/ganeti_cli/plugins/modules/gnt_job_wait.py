@@ -0,0 +1,145 @@
+#!/usr/bin/python
+"""
+ansible gnt-job wait module
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type  # pylint: disable=invalid-name
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.gnt_job import (
+        JOB_STATUS_SUCCESS,
+        GntJob,
+        JobsTimeout,
+        JobWaiter,
+    )
+
+
+DOCUMENTATION = r'''
+---
+module: lecontesteur.ganeti_cli.gnt_job_wait
+
+short_description: Wait the end of ganeti jobs
+
+description:
+    - Poll the status of all jobs with C(gnt-job list), by batch of jobs,
+      until the end of jobs or the timeout.
+
+options:
+    job_ids:
+        description: The id of jobs to wait
+        required: true
+        type: list
+        elements: int
+    timeout:
+        description: Max time in seconds to wait all jobs
+        required: false
+        type: int
+        default: 3600
+    poll_interval:
+        description: Time in seconds between two polls of jobs status
+        required: false
+        type: float
+        default: 2
+    batch_size:
+        description: Max number of jobs by gnt-job list
+        required: false
+        type: int
+        default: 100
+    fail_on_error:
+        description: Fail if one job is not a success
+        required: false
+        type: bool
+        default: true
+
+author:
+    - LeContesteur (@LeConTesteur)
+'''
+
+EXAMPLES = r'''
+# Create instances without wait, then wait all jobs
+- name: Create Instances
+  lecontesteur.ganeti_cli.gnt_instance:
+    name: "{{ item }}"
+    options:
+      disk-template: file
+      os-type: noop
+      submit: true
+  loop: "{{ instances }}"
+  register: created
+
+- name: Wait creation
+  lecontesteur.ganeti_cli.gnt_job_wait:
+    job_ids: "{{ created.results | map(attribute='jobs') | flatten }}"
+'''
+
+RETURN = r'''
+jobs:
+    description: The final status of each job
+    returned: always
+    type: list
+    elements: dict
+'''
+
+
+module_args = {
+    "job_ids": {"type": 'list', "elements": 'int', "required": True},
+    "timeout": {"type": 'int', "required": False, "default": 3600},
+    "poll_interval": {"type": 'float', "required": False, "default": 2},
+    "batch_size": {"type": 'int', "required": False, "default": 100},
+    "fail_on_error": {"type": 'bool', "required": False, "default": True},
+}
+
+
+def main_with_module(module: AnsibleModule) -> None:
+    """Main function with module parameter
+
+    Args:
+        module (AnsibleModule): Ansible Module
+    """
+    def error(code, stdout, stderr, msg=None):
+        module.fail_json(msg=msg, code=code, stdout=stdout, stderr=stderr)
+
+    waiter = JobWaiter(
+        GntJob(module.run_command, error),
+        module.params['job_ids'],
+        timeout=module.params['timeout'],
+        poll_interval=module.params['poll_interval'],
+        batch_size=module.params['batch_size'],
+    )
+    try:
+        statuses = waiter.wait()
+    except JobsTimeout as exception:
+        module.fail_json(msg=str(exception), jobs=[
+            {"id": job_id, "status": status} for job_id, status in waiter.statuses.items()
+        ])
+
+    result = {
+        "changed": False,
+        "jobs": [{"id": job_id, "status": status} for job_id, status in statuses.items()],
+    }
+    failed = [job['id'] for job in result['jobs'] if job['status'] != JOB_STATUS_SUCCESS]
+    if failed and module.params['fail_on_error']:
+        module.fail_json(msg='Jobs {} are not successful'.format(failed), **result)
+    module.exit_json(**result)
+
+
+def main(catch_exception: bool = True):
+    """
+    Main function
+    """
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+    try:
+        main_with_module(module)
+    except Exception as exception:
+        if catch_exception:
+            module.fail_json(msg=str(exception))
+        raise
+
+
+if __name__ == '__main__':
+    main()
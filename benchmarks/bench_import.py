@@ -0,0 +1,63 @@
+"""Benchmark of import time of modules.
+
+Each import is measured in a fresh interpreter, the field headers of
+gnt-instance list are built on first use, not at import.
+
+Run: python benchmarks/bench_import.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROUNDS = 10
+
+MODULES = [
+    'ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list',
+    'ansible_collections.lecontesteur.ganeti_cli.plugins.modules.gnt_instance',
+    'ansible_collections.lecontesteur.ganeti_cli.plugins.modules.gnt_instances',
+]
+
+STATEMENT = '''
+import time
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+{first_use}
+print(imported - start, time.perf_counter() - imported)
+'''
+
+FIRST_USE = '''
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list import field_headers
+len(field_headers)
+'''
+
+
+def import_time(module):
+    imports, first_uses = [], []
+    for _ in range(ROUNDS):
+        output = subprocess.run(
+            [sys.executable, '-c', STATEMENT.format(module=module, first_use=FIRST_USE)],
+            cwd=ROOT, env=dict(os.environ, PYTHONPATH=ROOT),
+            stdout=subprocess.PIPE, universal_newlines=True, check=True
+        ).stdout.split()
+        imports.append(float(output[0]))
+        first_uses.append(float(output[1]))
+    return min(imports), min(first_uses)
+
+
+def main():
+    start = time.perf_counter()
+    print('best of {} rounds'.format(ROUNDS))
+    for module in MODULES:
+        imported, first_use = import_time(module)
+        print('{:<20} import {:>8.2f} ms, field headers first use {:>8.2f} ms'.format(
+            module.rsplit('.', 2)[-2] + '.' + module.rsplit('.', 1)[-1],
+            imported * 1000, first_use * 1000
+        ))
+    print('total {:.1f} s'.format(time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
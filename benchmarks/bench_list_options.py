@@ -0,0 +1,76 @@
+"""Benchmark of options generation for wide NIC and disk lists.
+
+Compare the time and the peak of allocated memory of modify generations:
+- compile each time: the specification is compiled at each generation (to_options)
+- compiled plan: the flat plan of BuilderCommand, compiled once
+
+Run: python benchmarks/bench_list_options.py
+"""
+import time
+import tracemalloc
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.\
+    module_utils.builder_command_options.builders import CommandType
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance import (
+    get_builder_gnt_instance_command,
+    get_builder_gnt_instance_spec,
+)
+
+COUNT = 8
+ROUNDS = 50
+
+PARAMS = {'options': {
+    'net': [
+        {'name': 'eth{}'.format(index), 'link': 'br{}'.format(index), 'mode': 'bridged'}
+        for index in range(COUNT)
+    ],
+    'disk': [{'name': 'disk{}'.format(index), 'size': 1024} for index in range(COUNT)],
+}}
+INFO = {
+    'NICs': [
+        {'nic/{}'.format(index): None, 'name': 'eth{}'.format(index), 'link': 'br0',
+         'mode': 'bridged', 'vlan': None, 'network': None}
+        for index in range(COUNT)
+    ],
+    'Disks': [
+        {'disk/{}'.format(index): 'plain, size 1.0G', 'name': 'disk{}'.format(index)}
+        for index in range(COUNT)
+    ],
+}
+
+
+def compile_generation():
+    return ' '.join(filter(None, get_builder_gnt_instance_spec().to_options(
+        PARAMS, INFO, CommandType.MODIFY
+    )))
+
+
+def plan_generation():
+    return get_builder_gnt_instance_command().generate(
+        module_params=PARAMS, info_data=INFO, to_command=CommandType.MODIFY
+    )
+
+
+def measure(name, function):
+    function()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('{:<18} {:>10.2f} ms/generation {:>10.1f} KiB peak'.format(
+        name, elapsed * 1000 / ROUNDS, peak / 1024
+    ))
+
+
+def main():
+    assert plan_generation() == compile_generation()
+    print('{} NICs, {} disks, {} rounds'.format(COUNT, COUNT, ROUNDS))
+    measure('compile each time', compile_generation)
+    measure('compiled plan', plan_generation)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark of gnt-instance list output parsing.
+
+Compare the parsing line by line (parse_ganeti_list_output_line), the parser
+before the compiled parser, with the compiled parser: dict and compact rows
+parsed line by line with the parser of each cell, columns parsed in one pass,
+and the lazy rows when only 3 columns are used.
+The cells are str, int, boolean and list_str, without python literal, so the
+memoized literal_eval is not used and 'lines' is the time of the parser before both.
+
+Measured on 5000 rows x 100 columns: rows x1.6 to x2, compact x2.3, columns x2.5 to x3,
+lazy 3 columns x9 to x12. The columnar pass only pays off when the result is columns,
+the rows don't build the intermediate columns.
+
+Run: python benchmarks/bench_list_parser.py
+"""
+import time
+from collections import OrderedDict
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list import (
+    SEPARATOR_COL,
+    GntListOption,
+    parse_ganeti_list_output,
+    parse_ganeti_list_output_line,
+)
+
+ROWS = 5000
+COLUMNS = 100
+ROUNDS = 5
+
+CELLS = OrderedDict([
+    ('str', 'value{}-{}'.format),
+    ('int', lambda row, column: '{}'.format(row * column)),
+    ('boolean', lambda row, column: 'Y' if row % 2 else 'N'),
+    ('list_str', lambda row, column: 'bridged,openvswitch'),
+])
+TYPES = list(CELLS)
+
+HEADERS = OrderedDict(
+    ('column{}'.format(column), GntListOption('alias{}'.format(column), TYPES[column % len(TYPES)]))
+    for column in range(COLUMNS)
+)
+STDOUT = '\n'.join(
+    SEPARATOR_COL.join(
+        '-' if (row + column) % 10 == 0 else CELLS[TYPES[column % len(TYPES)]](row, column)
+        for column in range(COLUMNS)
+    )
+    for row in range(ROWS)
+) + '\n'
+
+
+def line_parse():
+    lines = map(
+        lambda line: parse_ganeti_list_output_line(headers=HEADERS, stdout=line),
+        STDOUT.strip().split('\n')
+    )
+    return [line for line in lines if line is not None]
+
+
+def row_parse():
+    return parse_ganeti_list_output(stdout=STDOUT, headers=HEADERS)
+
+
+def compact_parse():
+    return parse_ganeti_list_output(stdout=STDOUT, headers=HEADERS, compact=True)
+
+
+def column_parse():
+    return parse_ganeti_list_output(stdout=STDOUT, headers=HEADERS, as_columns=True)
+
+
+def lazy_parse():
+    return [
+        (row['column0'], row['column1'], row['column2'])
+        for row in parse_ganeti_list_output(stdout=STDOUT, headers=HEADERS, lazy=True)
+    ]
+
+
+def measure(name, function):
+    best = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print('{:<10} {:>10.1f} ms'.format(name, best * 1000))
+    return best
+
+
+def main():
+    expected = line_parse()
+    assert row_parse() == expected
+    assert compact_parse() == expected
+    assert list(column_parse()['column1']) == [row['column1'] for row in expected]
+    assert lazy_parse() == [(row['column0'], row['column1'], row['column2']) for row in expected]
+    print('{} rows, {} columns, best of {} rounds'.format(ROWS, COLUMNS, ROUNDS))
+    line = measure('lines', line_parse)
+    rows = measure('rows', row_parse)
+    compact = measure('compact', compact_parse)
+    columns = measure('columns', column_parse)
+    lazy = measure('lazy 3 col', lazy_parse)
+    print('speedup rows x{:.1f}, compact x{:.1f}, columns x{:.1f}, lazy 3 columns x{:.1f}'.format(
+        line / rows, line / compact, line / columns, line / lazy
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark of memory of gnt-instance list results kept as snapshot.
+
+Compare the peak of allocated memory of the parsed rows in OrderedDict and
+in compact ListRow (shared header index, tuple of values, interned strings)
+for all the field headers.
+
+Run: python benchmarks/bench_list_snapshot.py
+"""
+import time
+import tracemalloc
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list import (
+    SEPARATOR_COL,
+    compile_list_parser,
+    field_headers,
+    parse_ganeti_list_output,
+)
+
+INSTANCES = 10000
+
+CELLS = {
+    'str': lambda instance, name: {
+        'name': 'vm{}.example.org'.format(instance),
+        'admin_state': 'up',
+        'pnode': 'node{}.example.org'.format(instance % 20),
+        'os_type': 'debootstrap+default',
+    }.get(name, 'br{}'.format(instance % 4) if name.endswith('link') else '-'),
+    'int': lambda instance, name: '1' if name.endswith('count') else '1024',
+    'boolean': lambda instance, name: 'Y',
+    'list_str': lambda instance, name: 'bridged',
+    'list': lambda instance, name: "[u'eth0']",
+    'dict': lambda instance, name: "{'kernel_args': 'ro', 'acpi': True}",
+}
+
+
+def stdout():
+    return '\n'.join(
+        SEPARATOR_COL.join(
+            CELLS[option.type](instance, name) for name, option in field_headers.items()
+        )
+        for instance in range(INSTANCES)
+    ) + '\n'
+
+
+def measure(name, function, output):
+    compile_list_parser(field_headers)
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = function(output)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('{:<12} {:>8.1f} MiB {:>8.2f} KiB/instance {:>8.1f} ms'.format(
+        name, size / 1024 / 1024, size / 1024 / len(rows), elapsed * 1000
+    ))
+    return size
+
+
+def main():
+    output = stdout()
+    print('{} instances, {} columns, memory kept by the result'.format(
+        INSTANCES, len(field_headers)
+    ))
+    rows = measure('OrderedDict', lambda out: parse_ganeti_list_output(stdout=out), output)
+    compact = measure(
+        'ListRow', lambda out: parse_ganeti_list_output(stdout=out, compact=True), output
+    )
+    print('ratio x{:.1f}'.format(rows / compact))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(*args):
+  return subprocess.run(
+    [sys.executable] + list(args), cwd=ROOT, env=dict(os.environ, PYTHONPATH=ROOT),
+    stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=False
+  )
+
+
+def cache_size_after_import(*statements, cached):
+  """Size of the lru_cache of cached after the import statements, in a new interpreter
+  where nothing else is imported"""
+  result = run_python('-c', '\n'.join(statements + ('print({}.cache_info().currsize)'.format(cached),)))
+  if result.returncode != 0:
+    raise AssertionError(result.stderr)
+  return int(result.stdout)
+
+
+class MockRunner:
+  """run_function which return the outputs in order and record the commands"""
+
+  def __init__(self, *outputs) -> None:
+    self.outputs = list(outputs)
+    self.commands = []
+
+  def __call__(self, cmd, check_rc=False):
+    self.commands.append(cmd)
+    return self.outputs.pop(0)
@@ -1,9 +1,11 @@
+from itertools import chain
 from typing import Dict, List, Tuple
 import unittest
 
 from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.builder_command_options.builders import BuilderCommandOptionsSpecAbstract, CommandType
 from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.builder_command_options import builders
 from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.builder_command_options.prefixes import PrefixStr
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance import get_builder_gnt_instance_spec
 
 # To args spec
 
@@ -493,5 +495,120 @@ class BuilderToOptions(unittest.TestCase):
       ),
     ])
 
+  def test_BuilderCommandOptionsSpecList_element_views_shared(self):
+    sub_element = builders.BuilderCommandOptionsSpecSubElement(type='', name='name', info_key='name')
+    spec = builders.BuilderCommandOptionsSpecList(sub_element, name='test', info_key='Tests')
+    for _ in range(2):
+      self.assertEqual(
+        spec.to_options({'test': [{'name': 'foo'}, {'name': 'bar'}]}, {'Tests': [{'name': 'foo'}]}, CommandType.MODIFY),
+        ['--test 1:add,name=bar']
+      )
+    self.assertIs(spec.element(1), spec.element(1))
+    self.assertEqual(spec.element(1)._spec[0].index, 1)
+    self.assertIs(spec.element(1)._spec[0]._extra_args, sub_element._extra_args)
+    self.assertFalse(hasattr(sub_element, 'index'))
+    self.assertIs(sub_element.parent, spec)
+
+
+class BuilderCommandCompiled(unittest.TestCase):
+
+  PARAMS = [
+    {},
+    {'options': {'disk-template': 'file', 'os-type': 'noop', 'submit': True}},
+    {'options': {
+      'hypervisor-parameters': {'kernel_args': 'ro', 'acpi': False},
+      'backend-parameters': {'memory': 256, 'vcpus': 2},
+      'net': [{'link': 'br_gnt', 'name': 'eth0'}, {'link': 'br_other'}],
+      'disk': [{'size': 10240, 'name': 'root'}],
+      'install': False,
+    }},
+  ]
+  INFOS = [
+    {},
+    {
+      'Disk template': 'file', 'Operating system': 'noop',
+      'Hypervisor parameters': {'kernel_args': 'default (ro)', 'acpi': 'True'},
+      'Back-end parameters': {'memory': '256', 'vcpus': 'default (1)'},
+      'NICs': [{'nic/0': None, 'link': 'br_gnt', 'name': 'eth0', 'mode': 'bridged'}],
+      'Disks': [{'disk/0': 'file, size 10.0G', 'name': 'root'}, {'disk/1': 'file, size 1.0G', 'name': None}],
+    },
+  ]
+
+  def test_generate_same_as_to_options(self):
+    builder_gnt_instance_spec = get_builder_gnt_instance_spec()
+    command = builders.BuilderCommand(builder_gnt_instance_spec)
+    for to_command in [CommandType.CREATE, CommandType.MODIFY]:
+      for params_index, params in enumerate(self.PARAMS):
+        for info_index, info in enumerate(self.INFOS):
+          with self.subTest(to_command=to_command, params=params_index, info=info_index):
+            self.assertEqual(
+              command.generate('--extra', module_params=params, info_data=info, to_command=to_command),
+              ' '.join(filter(None, chain(
+                ['--extra'], builder_gnt_instance_spec.to_options(params, info, to_command)
+              )))
+            )
+
+  def test_diff(self):
+    builder_gnt_instance_spec = get_builder_gnt_instance_spec()
+    command = builders.BuilderCommand(builder_gnt_instance_spec)
+    params = {'options': {
+      'os-type': 'noop',
+      'hypervisor-parameters': {'kernel_args': 'ro'},
+      'disk': [{'name': 'root'}],
+    }}
+    info = {
+      'Operating system': 'debian',
+      'Hypervisor parameters': {'kernel_args': 'default (ro)'},
+      'Disks': [{'disk/0': 'file, size 10.0G', 'name': 'root'}, {'disk/1': 'file, size 1.0G', 'name': 'data'}],
+    }
+    diff = command.diff(params, info)
+    self.assertTrue(diff.changed)
+    self.assertEqual(diff.options, command.generate(module_params=params, info_data=info, to_command=CommandType.MODIFY))
+    self.assertEqual(
+      [(change.field, change.old, change.new, change.option) for change in diff.changes],
+      [
+        ('disk.1', {'disk/1': 'file, size 1.0G', 'name': 'data'}, None, '--disk 1:remove'),
+        ('os-type', 'debian', 'noop', '--os-type=noop'),
+        ('hypervisor-parameters.kernel_args', 'default (ro)', 'ro', 'kernel_args=ro'),
+      ]
+    )
+    self.assertFalse(command.diff({'options': {'os-type': 'noop'}}, {'Operating system': 'noop'}).changed)
+
+  def test_submit_is_an_action_flag(self):
+    command = builders.BuilderCommand(get_builder_gnt_instance_spec())
+    info = {'Disk template': 'file', 'Operating system': 'noop'}
+    converged = command.diff({'options': {'disk-template': 'file', 'os-type': 'noop', 'submit': True}}, info)
+    self.assertFalse(converged.changed)
+    self.assertEqual(converged.to_result(), [])
+    diff = command.diff({'options': {'disk-template': 'file', 'os-type': 'debian', 'submit': True}}, info)
+    self.assertEqual(diff.options, '--os-type=debian --submit')
+    self.assertEqual([change.field for change in diff.changes], ['os-type'])
+    self.assertIn('--submit', command.generate(
+      module_params={'options': {'disk-template': 'file', 'submit': True}}, info_data={},
+      to_command=CommandType.CREATE
+    ).split())
+
+  def test_opcode_mapping(self):
+    self.assertEqual(builders.BuilderCommandOptionsSpecElement(name='os-type').opcode_key, 'os_type')
+    install = builders.BuilderCommandOptionsSpecNoStateElement(
+      name='install', opcode=builders.Opcode('no_install', lambda value: not value))
+    self.assertEqual(install.to_opcode({'install': False}), {'no_install': True})
+    ignored = builders.BuilderCommandOptionsSpecElement(name='iallocator', opcode=builders.IGNORE_OPCODE)
+    self.assertIsNone(ignored.opcode_key)
+    self.assertEqual(ignored.to_opcode({'iallocator': 'hail'}), {})
+
+  def test_plan_compiled_once(self):
+    spec = builders.BuilderCommandOptionsRootSpec(
+      builders.BuilderCommandOptionsSpecElement(name='name', info_key='Name'),
+    )
+    command = builders.BuilderCommand(spec)
+    self.assertEqual(command.generate(module_params={'options': {'name': 'foo'}}, info_data={}), '--name=foo')
+    plan = command.plan
+    self.assertEqual(command.generate(module_params={'options': {'name': 'bar'}}, info_data={'Name': 'bar'}), '')
+    self.assertIs(command.plan, plan)
+    self.assertEqual(plan[0].names, ('options', 'name'))
+    self.assertEqual(plan[0].info_keys, ('Name',))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -67,6 +67,25 @@ class TestBuildCommandOptionsExtractors(unittest.TestCase):
       ]
     )
 
+  def test_decoded_info(self):
+    info = {'test': {'foo': '10', 'bar': 'default (True)', 'list': [{'size': '2023-02-01'}]}, 'none': None}
+    decoded = extractors.DecodedInfo.decode(info)
+    self.assertIs(extractors.DecodedInfo.decode(decoded), decoded)
+    self.assertEqual(decoded, {'test': {'foo': 10, 'bar': 'default (True)', 'list': [{'size': datetime.date(2023, 2, 1)}]}, 'none': None})
+    self.assertEqual(info['test']['foo'], '10')
+    self.assertIsInstance(decoded['test']['list'][0], extractors.DecodedInfo)
+
+  def test_value_info_extractor_decoded_same_as_raw(self):
+    info = {'test': {'foo': '10', 'bar': 'default (True)', 'date': '2023-02-01', 'dict': {'a': 'b'}}}
+    decoded = extractors.DecodedInfo.decode(info)
+    for keys in [['test', 'foo'], ['test', 'bar'], ['test', 'date'], ['test', 'dict', 'a'], ['test', 'missing', 'a'], []]:
+      for validator in [None, extractors.info_default_validator]:
+        with self.subTest(keys=keys, validator=validator):
+          self.assertEqual(
+            extractors.value_info_extractor(decoded, keys, validator),
+            extractors.value_info_extractor(info, keys, validator)
+          )
+
 class TestBuildCommandOptionsDefaultValidator(unittest.TestCase):
   def _test_validator(self, validator, data_set):
     for index, data_line in enumerate(data_set):
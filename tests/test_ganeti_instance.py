@@ -5,6 +5,8 @@ import unittest
 from unittest.mock import patch, Mock
 from ansible.module_utils import basic
 from ansible.module_utils.common.text.converters import to_bytes
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance import get_builder_gnt_instance_command
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.instance_diff import FieldChange, InstanceDiff
 from ansible_collections.lecontesteur.ganeti_cli.plugins.modules.gnt_instance import main
 
 def set_module_args(args):
@@ -35,25 +37,34 @@ def fail_json(*args, **kwargs):
     kwargs['failed'] = True
     raise AnsibleFailJson(kwargs)
 
+def make_diff(have_change):
+    if not have_change:
+        return InstanceDiff('', [])
+    return InstanceDiff('--os-type=noop', [FieldChange(('os-type',), 'debian', 'noop', '--os-type=noop')])
+
 class MockGntInstance:
     vms = {}
+    info_calls = 0
     def __init__(self, *args) -> None:
         pass
 
-    def reboot(self, name:str, timeout:bool=0):
+    def reboot(self, name:str, timeout:bool=0, submit:bool=False):
         self.vms[name]['admin_state'] = 'up'
 
-    def stop(self, name:str, timeout:int=0, force:bool=False):
+    def stop(self, name:str, timeout:int=0, force:bool=False, submit:bool=False):
         self.vms[name]['admin_state'] = 'down'
 
-    def start(self, name:str, start:bool=False):
+    def start(self, name:str, start:bool=False, submit:bool=False):
         self.vms[name]['admin_state'] = 'up'
 
-    def remove(self, name:str):
+    def remove(self, name:str, submit:bool=False):
         self.vms.pop(name)
 
     def list(self, *names, header_names = None):
-        pass
+        return [dict(vm) for name, vm in self.vms.items() if not names or name in names]
+
+    def live_state(self, *names):
+        return self.list(*names, header_names=['name', 'admin_state', 'oper_state'])
 
     def add(self, name:str, params: dict):
         self.vms[name] = {'name': name, 'admin_state':'down'}
@@ -61,15 +72,17 @@ class MockGntInstance:
     def modify(self, name:str, params: dict, vm_info: dict):
         pass
 
-    def config_and_remote_have_difference(self, params: dict, vm_info) -> bool:
+    def diff(self, params: dict, vm_info) -> InstanceDiff:
         pass
 
-    def info(self, name:str):
+    def info(self, *names, static=False):
+        MockGntInstance.info_calls += 1
         return list(self.vms.values())
 
     @classmethod
     def _set_vm_info(cls, vm_info):
         cls.vms = {}
+        cls.info_calls = 0
         for info in vm_info:
             if 'name' in info:
                 cls.vms[info['name']] = info
@@ -95,7 +108,7 @@ class TestMainGanetiInstanceCli(unittest.TestCase):
         )
         self.mock_module_helper.start()
         self.mock_gnt_instance = self.mock_gnt_instance_helper.start()
-        self.mock_gnt_instance.config_and_remote_have_difference = Mock()
+        self.mock_gnt_instance.diff = Mock()
         self.mock_gnt_instance.modify = Mock()
         self.mock_instance = self.mock_gnt_instance()
         self.addCleanup(self.mock_gnt_instance_helper.stop)
@@ -106,7 +119,7 @@ class TestMainGanetiInstanceCli(unittest.TestCase):
         set_module_args(module_args)
 
         self.mock_instance._set_vm_info(vm_info)
-        self.mock_gnt_instance.config_and_remote_have_difference.return_value = have_change
+        self.mock_gnt_instance.diff.return_value = make_diff(have_change)
         with self.assertRaises(AnsibleExitJson) as result:
             main(catch_exception=False)
         self._assertChangedEqual(result, expected_change)
@@ -203,5 +216,54 @@ class TestMainGanetiInstanceCli(unittest.TestCase):
             modify_call_count=1
         )
 
+    def test_info_only_fetched_when_options_are_compared(self):
+        set_module_args({'state': 'present', 'name': 'vm_test'})
+        self.mock_instance._set_vm_info([{'name': 'vm_test', 'admin_state':'up'}])
+        with self.assertRaises(AnsibleExitJson):
+            main(catch_exception=False)
+        self.assertEqual(MockGntInstance.info_calls, 0)
+
+        set_module_args({'state': 'present', 'name': 'vm_test', 'options': {'os-type': 'noop'}})
+        self.mock_instance._set_vm_info([{'name': 'vm_test', 'admin_state':'up'}])
+        self.mock_gnt_instance.diff.return_value = make_diff(True)
+        with self.assertRaises(AnsibleExitJson):
+            main(catch_exception=False)
+        self.assertEqual(MockGntInstance.info_calls, 1)
+
+    def test_submit_not_changed_if_instance_converged(self):
+        self.mock_gnt_instance.diff.side_effect = get_builder_gnt_instance_command().diff
+        self._call_test(
+            {
+                'state': 'present',
+                'name': 'vm_test',
+                'admin_state': 'started',
+                'options': {'disk-template': 'file', 'os-type': 'noop', 'submit': True},
+            },
+            [{'name': 'vm_test', 'admin_state': 'up', 'Disk template': 'file', 'Operating system': 'noop'}],
+            [{'name': 'vm_test', 'admin_state': 'up', 'Disk template': 'file', 'Operating system': 'noop'}],
+            expected_change=False
+        )
+
+    def test_diff_computed_once_and_reported(self):
+        set_module_args({
+            'state': 'present', 'name': 'vm_test', 'options': {'os-type': 'noop'},
+            '_ansible_diff': True,
+        })
+        self.mock_instance._set_vm_info([{'name': 'vm_test', 'admin_state':'up'}])
+        diff = make_diff(True)
+        self.mock_gnt_instance.diff.return_value = diff
+        self.mock_gnt_instance.diff.reset_mock()
+        self.mock_gnt_instance.modify.reset_mock()
+        with self.assertRaises(AnsibleExitJson) as result:
+            main(catch_exception=False)
+        self.assertEqual(self.mock_gnt_instance.diff.call_count, 1)
+        self.assertIs(self.mock_gnt_instance.modify.call_args.kwargs['diff'], diff)
+        self.assertEqual(
+            result.exception.args[0]['changes'],
+            [{'field': 'os-type', 'old': 'debian', 'new': 'noop', 'option': '--os-type=noop'}]
+        )
+        self.assertEqual(result.exception.args[0]['diff']['before'], {'os-type': 'debian'})
+        self.assertEqual(result.exception.args[0]['diff']['after'], {'os-type': 'noop'})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
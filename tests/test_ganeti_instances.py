@@ -0,0 +1,432 @@
+import json
+
+import unittest
+from unittest.mock import patch
+from ansible.module_utils import basic
+from ansible.module_utils.common.text.converters import to_bytes
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_config_data import GanetiConfigData
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_create import CreateResult
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_executor import GntInstanceExecutor
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.instance_diff import FieldChange, InstanceDiff
+from ansible_collections.lecontesteur.ganeti_cli.plugins.modules.gnt_instances import main
+
+def set_module_args(args):
+    """prepare arguments so that they will be picked up during module creation"""
+    args = json.dumps({'ANSIBLE_MODULE_ARGS': args})
+    basic._ANSIBLE_ARGS = to_bytes(args)
+
+
+class AnsibleExitJson(Exception):
+    """Exception class to be raised by module.exit_json and caught by the test case"""
+    pass
+
+
+class AnsibleFailJson(Exception):
+    """Exception class to be raised by module.fail_json and caught by the test case"""
+    pass
+
+
+def exit_json(*args, **kwargs):
+    """function to patch over exit_json; package return data into an exception"""
+    if 'changed' not in kwargs:
+        kwargs['changed'] = False
+    raise AnsibleExitJson(kwargs)
+
+
+def fail_json(*args, **kwargs):
+    """function to patch over fail_json; package return data into an exception"""
+    kwargs['failed'] = True
+    raise AnsibleFailJson(kwargs)
+
+class MockGntInstance:
+    vms = {}
+    calls = []
+    differences = set()
+    query_backend = None
+    client = None
+    def __init__(self, *args, query_backend=None, client=None) -> None:
+        MockGntInstance.query_backend = query_backend
+        MockGntInstance.client = client
+
+    def reboot(self, name:str, timeout:bool=0, submit:bool=False):
+        self.calls.append(('reboot', name))
+        self.vms[name]['admin_state'] = 'up'
+
+    def stop(self, name:str, timeout:int=0, force:bool=False, submit:bool=False):
+        self.calls.append(('stop', name))
+        self.vms[name]['admin_state'] = 'down'
+
+    def remove(self, name:str, submit:bool=False):
+        self.calls.append(('remove', name))
+        if name.startswith('fail'):
+            raise RuntimeError('remove failed')
+        self.vms.pop(name)
+
+    def list(self, *names, header_names = None):
+        self.calls.append(('list',) + names)
+        return [
+            dict(vm) for name, vm in self.vms.items()
+            if not names or name in names
+        ]
+
+    def add(self, name:str, params: dict):
+        self.calls.append(('add', name))
+        if params['options'].get('submit'):
+            return 42
+        self.vms[name] = {'name': name, 'admin_state':'down'}
+
+    def batch_create(self, instances, iallocator=None):
+        self.calls.append(('batch_create', iallocator) + tuple(instances))
+        for name in instances:
+            self.vms[name] = {'name': name, 'admin_state':'down'}
+
+    def modify(self, name:str, params: dict, vm_info: dict, diff=None):
+        self.calls.append(('modify', name))
+
+    def diff(self, params: dict, vm_info) -> InstanceDiff:
+        if params['name'] in self.differences:
+            return InstanceDiff('--os-type=noop', [FieldChange(('os-type',), 'debian', 'noop', '--os-type=noop')])
+        return InstanceDiff('', [])
+
+    def parallel(self, operations, max_workers=4, max_per_node=None, primary_nodes=None):
+        self.calls.append(('parallel', max_workers, max_per_node))
+        return GntInstanceExecutor(self, max_workers, max_per_node, primary_nodes).run(operations)
+
+    def info(self, *names, static=False):
+        self.calls.append(('info',) + names)
+        return [dict(vm) for name, vm in self.vms.items() if name in names]
+
+    @classmethod
+    def _set_vm_info(cls, vm_info, differences=None):
+        cls.vms = {}
+        cls.calls = []
+        cls.differences = set(differences or [])
+        for info in vm_info:
+            cls.vms[info['name']] = info
+
+OPTIONS = {'disk-template': 'file', 'os-type': 'noop'}
+
+class TestMainGanetiInstancesCli(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_module_helper = patch.multiple(basic.AnsibleModule,
+                                                 exit_json=exit_json,
+                                                 fail_json=fail_json)
+        self.mock_gnt_instance_helper = patch(
+            'ansible_collections.lecontesteur.ganeti_cli.plugins.modules.gnt_instances.GntInstance',
+            MockGntInstance
+        )
+        self.mock_module_helper.start()
+        self.mock_gnt_instance = self.mock_gnt_instance_helper.start()
+        self.addCleanup(self.mock_gnt_instance_helper.stop)
+        self.addCleanup(self.mock_module_helper.stop)
+
+    def _call_test(self, instances, vm_info, differences=None, check_mode=False, **kwargs):
+        args = dict(kwargs, instances=instances)
+        if check_mode:
+            args['_ansible_check_mode'] = True
+        set_module_args(args)
+        self.mock_gnt_instance._set_vm_info(vm_info, differences)
+        with self.assertRaises(AnsibleExitJson) as result:
+            main(catch_exception=False)
+        return result.exception.args[0]
+
+    def _actions(self, result):
+        return {instance['name']: instance['actions'] for instance in result['instances']}
+
+    def test_module_fail_when_required_args_missing(self):
+        with self.assertRaises(AnsibleFailJson):
+            set_module_args({})
+            main(catch_exception=False)
+
+    def test_fail_if_expected_present_and_not_exist_and_without_params(self):
+        set_module_args({'instances': [{'name': 'vm_test'}]})
+        self.mock_gnt_instance._set_vm_info([])
+        with self.assertRaises(AnsibleFailJson):
+            main(catch_exception=False)
+
+    def test_nothing_if_all_instances_are_converged(self):
+        result = self._call_test(
+            [
+                {'name': 'vm1', 'options': OPTIONS},
+                {'name': 'vm2', 'admin_state': 'stopped'},
+                {'name': 'vm3', 'state': 'absent'},
+            ],
+            [{'name': 'vm1', 'admin_state': 'up'}, {'name': 'vm2', 'admin_state': 'down'}],
+        )
+        self.assertFalse(result['changed'])
+        self.assertEqual(
+            self.mock_gnt_instance.calls,
+            [('list',), ('info', 'vm1')]
+        )
+
+    def test_only_differences_run_commands(self):
+        result = self._call_test(
+            [
+                {'name': 'vm1', 'options': OPTIONS},
+                {'name': 'vm2', 'options': OPTIONS, 'reboot_if_have_any_change': True},
+                {'name': 'vm3', 'options': OPTIONS},
+                {'name': 'vm4', 'state': 'absent'},
+                {'name': 'vm5', 'admin_state': 'stopped'},
+            ],
+            [
+                {'name': 'vm1', 'admin_state': 'up'},
+                {'name': 'vm2', 'admin_state': 'up'},
+                {'name': 'vm4', 'admin_state': 'up'},
+                {'name': 'vm5', 'admin_state': 'down'},
+            ],
+            differences=['vm2'],
+        )
+        self.assertTrue(result['changed'])
+        self.assertDictEqual(
+            self._actions(result),
+            {
+                'vm1': [],
+                'vm2': ['stop', 'modify', 'reboot'],
+                'vm3': ['create', 'reboot'],
+                'vm4': ['stop', 'remove'],
+                'vm5': [],
+            }
+        )
+        self.assertEqual(self.mock_gnt_instance.calls[0], ('list',))
+        self.assertEqual(self.mock_gnt_instance.calls[1], ('info', 'vm1', 'vm2'))
+        self.assertIn(('list', 'vm2', 'vm3'), self.mock_gnt_instance.calls)
+        self.assertEqual(
+            {name: vm['admin_state'] for name, vm in self.mock_gnt_instance.vms.items()},
+            {'vm1': 'up', 'vm2': 'up', 'vm3': 'up', 'vm5': 'down'}
+        )
+
+    def test_changes_and_diff_reported(self):
+        result = self._call_test(
+            [{'name': 'vm1', 'options': OPTIONS}, {'name': 'vm2', 'options': OPTIONS}],
+            [{'name': 'vm1', 'admin_state': 'up'}, {'name': 'vm2', 'admin_state': 'up'}],
+            differences=['vm2'],
+            _ansible_diff=True,
+        )
+        changes = {instance['name']: instance['changes'] for instance in result['instances']}
+        self.assertEqual(changes['vm1'], [])
+        self.assertEqual(changes['vm2'], [{'field': 'os-type', 'old': 'debian', 'new': 'noop', 'option': '--os-type=noop'}])
+        self.assertEqual(
+            result['diff'],
+            [{'before_header': 'vm2', 'after_header': 'vm2', 'before': {'os-type': 'debian'}, 'after': {'os-type': 'noop'}}]
+        )
+
+    def test_power_actions(self):
+        result = self._call_test(
+            [
+                {'name': 'vm1', 'admin_state': 'restarted'},
+                {'name': 'vm2', 'admin_state': 'stopped'},
+                {'name': 'vm3', 'admin_state': 'started'},
+            ],
+            [
+                {'name': 'vm1', 'admin_state': 'up'},
+                {'name': 'vm2', 'admin_state': 'up'},
+                {'name': 'vm3', 'admin_state': 'down'},
+            ],
+        )
+        self.assertDictEqual(
+            self._actions(result),
+            {'vm1': ['reboot'], 'vm2': ['stop'], 'vm3': ['reboot']}
+        )
+        self.assertEqual(self.mock_gnt_instance.calls[0], ('list',))
+        self.assertNotIn('info', [call[0] for call in self.mock_gnt_instance.calls])
+
+    def test_submit_skip_power_actions_of_changed_instances(self):
+        result = self._call_test(
+            [
+                {'name': 'vm1', 'options': dict(OPTIONS, submit=True)},
+                {'name': 'vm2', 'state': 'absent', 'options': {'submit': True}},
+            ],
+            [{'name': 'vm2', 'admin_state': 'up'}],
+        )
+        self.assertDictEqual(
+            self._actions(result),
+            {'vm1': ['create'], 'vm2': ['remove']}
+        )
+        self.assertEqual(result['jobs'], [42])
+        self.assertEqual(len([call for call in self.mock_gnt_instance.calls if call[0] == 'list']), 1)
+
+    def test_parallel_run(self):
+        result = self._call_test(
+            [
+                {'name': 'vm1', 'options': OPTIONS},
+                {'name': 'vm2', 'options': OPTIONS, 'reboot_if_have_any_change': True},
+                {'name': 'vm3', 'state': 'absent'},
+                {'name': 'vm4', 'admin_state': 'stopped'},
+            ],
+            [
+                {'name': 'vm2', 'admin_state': 'up', 'pnode': 'node1'},
+                {'name': 'vm3', 'admin_state': 'up', 'pnode': 'node1'},
+                {'name': 'vm4', 'admin_state': 'up', 'pnode': 'node2'},
+            ],
+            differences=['vm2'],
+            max_workers=4,
+            max_per_node=2,
+        )
+        self.assertDictEqual(
+            self._actions(result),
+            {
+                'vm1': ['create', 'reboot'],
+                'vm2': ['stop', 'modify', 'reboot'],
+                'vm3': ['stop', 'remove'],
+                'vm4': ['stop'],
+            }
+        )
+        self.assertIn(('parallel', 4, 2), self.mock_gnt_instance.calls)
+        self.assertLess(
+            self.mock_gnt_instance.calls.index(('stop', 'vm2')),
+            self.mock_gnt_instance.calls.index(('modify', 'vm2'))
+        )
+
+    def test_parallel_run_fail_with_errors_by_instance(self):
+        set_module_args({
+            'instances': [
+                {'name': 'fail1', 'state': 'absent'},
+                {'name': 'vm2', 'state': 'absent'},
+            ],
+            'max_workers': 2,
+        })
+        self.mock_gnt_instance._set_vm_info([
+            {'name': 'fail1', 'admin_state': 'up'},
+            {'name': 'vm2', 'admin_state': 'up'},
+        ])
+        with self.assertRaises(AnsibleFailJson) as result:
+            main(catch_exception=False)
+        errors = {
+            instance['name']: instance['error']
+            for instance in result.exception.args[0]['instances']
+        }
+        self.assertEqual(errors, {'fail1': 'remove failed', 'vm2': None})
+        self.assertNotIn('vm2', self.mock_gnt_instance.vms)
+
+    def test_check_mode_run_nothing(self):
+        result = self._call_test(
+            [
+                {'name': 'vm1', 'options': OPTIONS},
+                {'name': 'vm2', 'state': 'absent'},
+                {'name': 'vm3', 'options': OPTIONS, 'admin_state': 'stopped'},
+            ],
+            [{'name': 'vm2', 'admin_state': 'up'}],
+            check_mode=True,
+        )
+        self.assertTrue(result['changed'])
+        self.assertDictEqual(
+            self._actions(result),
+            {'vm1': ['create', 'reboot'], 'vm2': ['stop', 'remove'], 'vm3': ['create']}
+        )
+        self.assertEqual(self.mock_gnt_instance.calls, [('list',)])
+
+    def test_batch_create(self):
+        result = self._call_test(
+            [
+                {'name': 'vm1', 'options': OPTIONS},
+                {'name': 'vm2', 'options': dict(OPTIONS, iallocator='hail')},
+                {'name': 'vm3', 'options': OPTIONS, 'admin_state': 'stopped'},
+                {'name': 'vm4', 'options': dict(OPTIONS, submit=True)},
+                {'name': 'vm5', 'options': OPTIONS},
+            ],
+            [{'name': 'vm5', 'admin_state': 'up'}],
+            batch_create=True,
+        )
+        self.assertDictEqual(
+            self._actions(result),
+            {
+                'vm1': ['create', 'reboot'],
+                'vm2': ['create', 'reboot'],
+                'vm3': ['create'],
+                'vm4': ['create'],
+                'vm5': [],
+            }
+        )
+        calls = self.mock_gnt_instance.calls
+        self.assertIn(('batch_create', None, 'vm1', 'vm3'), calls)
+        self.assertIn(('batch_create', 'hail', 'vm2'), calls)
+        self.assertIn(('add', 'vm4'), calls)
+        self.assertEqual([call for call in calls if call[0] == 'add'], [('add', 'vm4')])
+        self.assertEqual(result['jobs'], [42])
+
+    def test_opportunistic_locking(self):
+        created = {}
+
+        class MockCreator:
+            def __init__(self, gnt_instance, gnt_job, max_resubmit=3):
+                created['max_resubmit'] = max_resubmit
+
+            def create(self, instances):
+                created['names'] = list(instances)
+                results = {}
+                for job_id, name in enumerate(instances, start=10):
+                    MockGntInstance.vms[name] = {'name': name, 'admin_state': 'down'}
+                    results[name] = CreateResult(name)
+                    results[name].jobs.append(job_id)
+                return results
+
+        with patch(
+            'ansible_collections.lecontesteur.ganeti_cli.plugins.modules.gnt_instances.OpportunisticCreator',
+            MockCreator
+        ):
+            result = self._call_test(
+                [
+                    {'name': 'vm1', 'options': dict(OPTIONS, iallocator='hail')},
+                    {'name': 'vm2', 'options': dict(OPTIONS, iallocator='hail')},
+                    {'name': 'vm3', 'options': OPTIONS},
+                ],
+                [],
+                opportunistic_locking=True,
+                max_resubmit=5,
+            )
+        self.assertEqual(created, {'max_resubmit': 5, 'names': ['vm1', 'vm2']})
+        self.assertEqual(
+            [call for call in self.mock_gnt_instance.calls if call[0] == 'add'],
+            [('add', 'vm3')]
+        )
+        self.assertDictEqual(
+            self._actions(result),
+            {'vm1': ['create', 'reboot'], 'vm2': ['create', 'reboot'], 'vm3': ['create', 'reboot']}
+        )
+        self.assertEqual(
+            {instance['name']: instance['jobs'] for instance in result['instances']},
+            {'vm1': [10], 'vm2': [11], 'vm3': []}
+        )
+        self.assertEqual(result['jobs'], [10, 11])
+
+    def test_config_data_backend(self):
+        self._call_test([{'name': 'vm1', 'admin_state': 'started'}], [{'name': 'vm1', 'admin_state': 'up'}])
+        self.assertIsNone(self.mock_gnt_instance.query_backend)
+
+        self._call_test(
+            [{'name': 'vm1', 'admin_state': 'started'}],
+            [{'name': 'vm1', 'admin_state': 'up'}],
+            config_data='/var/lib/ganeti/config.data',
+        )
+        self.assertIsInstance(self.mock_gnt_instance.query_backend, GanetiConfigData)
+        self.assertEqual(self.mock_gnt_instance.query_backend.path, '/var/lib/ganeti/config.data')
+
+    def test_luxi_socket(self):
+        with patch(
+            'ansible_collections.lecontesteur.ganeti_cli.plugins.modules.gnt_instances.GntInstanceLuxi',
+            MockGntInstance
+        ):
+            self._call_test(
+                [{'name': 'vm1', 'admin_state': 'started'}],
+                [{'name': 'vm1', 'admin_state': 'up'}],
+                luxi_socket='/tmp/ganeti-master',
+            )
+        self.assertEqual(self.mock_gnt_instance.client.address, '/tmp/ganeti-master')
+
+    def test_rapi(self):
+        with patch(
+            'ansible_collections.lecontesteur.ganeti_cli.plugins.modules.gnt_instances.GntInstanceRapi',
+            MockGntInstance
+        ):
+            self._call_test(
+                [{'name': 'vm1', 'admin_state': 'started'}],
+                [{'name': 'vm1', 'admin_state': 'up'}],
+                rapi={'host': 'cluster.example.com', 'username': 'admin', 'password': 'secret'},
+            )
+        self.assertEqual(self.mock_gnt_instance.client.host, 'cluster.example.com')
+        self.assertEqual(self.mock_gnt_instance.client.port, 5080)
+        self.assertIn('Authorization', self.mock_gnt_instance.client.headers)
+
+if __name__ == '__main__':
+    unittest.main()
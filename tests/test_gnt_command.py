@@ -0,0 +1,120 @@
+import json
+import os
+import shlex
+import sys
+import time
+import unittest
+from collections import OrderedDict
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_command import (
+  RunCommandException,
+  StreamCommandException,
+  iter_command_lines,
+  parse_job_id
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance import GntInstance
+from tests.helpers import MockRunner
+
+
+def python_cmd(code):
+  return '{} -c {}'.format(shlex.quote(sys.executable), shlex.quote(code))
+
+
+class TestGntCommand(unittest.TestCase):
+
+  def test_iter_command_lines(self):
+    self.assertEqual(list(iter_command_lines(python_cmd('print("a--##b"); print("c")'))), ['a--##b\n', 'c\n'])
+
+  def test_iter_command_lines_error_after_output(self):
+    lines = iter_command_lines(python_cmd('import sys; print("a"); sys.stderr.write("failed"); sys.exit(3)'))
+    self.assertEqual(next(lines), 'a\n')
+    with self.assertRaises(StreamCommandException) as context:
+      next(lines)
+    self.assertEqual(context.exception.code, 3)
+    self.assertEqual(context.exception.stderr, 'failed')
+    self.assertIsInstance(context.exception, RunCommandException)
+
+  def test_iter_command_lines_stop_early(self):
+    start = time.monotonic()
+    lines = iter_command_lines(python_cmd('import itertools\nfor i in itertools.count(): print(i, flush=True)'))
+    self.assertEqual([next(lines) for _ in range(3)], ['0\n', '1\n', '2\n'])
+    lines.close()
+    self.assertLess(time.monotonic() - start, 10)
+
+  def test_parse_job_id(self):
+    self.assertEqual(parse_job_id(stdout='JobID: 1234\n'), 1234)
+    self.assertEqual(parse_job_id(stdout='Submitted jobs\nJobID:12\n'), 12)
+    with self.assertRaises(RunCommandException):
+      parse_job_id(stdout='')
+    with self.assertRaises(RunCommandException):
+      parse_job_id(stdout='Waiting for job')
+
+  def test_instance_submit_return_job_id(self):
+    runner = MockRunner((0, 'JobID: 15\n', ''), (0, 'JobID: 16\n', ''), (0, '', ''))
+    gnt_instance = GntInstance(runner, None)
+    self.assertEqual(gnt_instance.reboot('vm1', submit=True), 15)
+    self.assertEqual(gnt_instance.remove('vm1', submit=True), 16)
+    self.assertIsNone(gnt_instance.stop('vm1'))
+    self.assertIn('--submit', runner.commands[0])
+    self.assertIn('--submit', runner.commands[1])
+    self.assertNotIn('--submit', runner.commands[2])
+
+  def test_instance_add_submit_from_options(self):
+    runner = MockRunner((0, 'JobID: 20\n', ''), (0, '', ''))
+    gnt_instance = GntInstance(runner, None)
+    self.assertEqual(
+      gnt_instance.add('vm1', {'options': {'os-type': 'noop', 'submit': True}}),
+      20
+    )
+    self.assertIsNone(gnt_instance.add('vm2', {'options': {'os-type': 'noop'}}))
+    self.assertIn('--submit', runner.commands[0])
+    self.assertNotIn('--submit', runner.commands[1])
+
+  def test_instance_add_opportunistic_locking(self):
+    runner = MockRunner((0, 'JobID: 21\n', ''))
+    gnt_instance = GntInstance(runner, None)
+    gnt_instance.add('vm1', {'options': {
+      'iallocator': 'hail', 'submit': True, 'opportunistic-locking': True
+    }})
+    self.assertIn('--opportunistic-locking', runner.commands[0])
+    self.assertIn('--iallocator=hail', runner.commands[0])
+
+  def test_instance_batch_create(self):
+    written = {}
+
+    class BatchRunner(MockRunner):
+      def __call__(self, cmd, check_rc=False):
+        path = cmd.split()[-1]
+        with open(path, 'r', encoding='utf-8') as instances_file:
+          written['instances'] = json.load(instances_file)
+        written['path'] = path
+        return super().__call__(cmd, check_rc)
+
+    runner = BatchRunner((0, '', ''))
+    gnt_instance = GntInstance(runner, None)
+    gnt_instance.batch_create(
+      OrderedDict([
+        ('vm1', {'options': {
+          'disk-template': 'file', 'disk': [{'size': 1024, 'access': 'userspace'}], 'install': False
+        }}),
+        ('vm2', {'options': {'disk-template': 'diskless', 'net': [{'link': 'br0'}], 'submit': True}}),
+      ]),
+      iallocator='hail'
+    )
+    self.assertTrue(runner.commands[0].startswith('gnt-instance batch-create --iallocator=hail '))
+    self.assertEqual(written['instances'], [
+      {
+        'disk_template': 'file', 'disks': [{'size': 1024, 'access': 'userspace'}], 'no_install': True,
+        'instance_name': 'vm1', 'mode': 'create'
+      },
+      {'disk_template': 'diskless', 'nics': [{'link': 'br0'}], 'instance_name': 'vm2', 'mode': 'create'},
+    ])
+    self.assertFalse(os.path.exists(written['path']))
+
+  def test_error_raise_without_error_function(self):
+    gnt_instance = GntInstance(MockRunner((1, '', 'error')), None)
+    with self.assertRaises(RunCommandException):
+      gnt_instance.stop('vm1')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_config_data import (
+  ConfigDataError,
+  GanetiConfigData,
+  format_size,
+  parse_vlan,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance import (
+  GntInstance,
+  parse_info_instances,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def read_fixture(name):
+  with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as fixture:
+    return fixture.read()
+
+
+class CountingOpener:
+  def __init__(self) -> None:
+    self.count = 0
+
+  def __call__(self, path):
+    self.count += 1
+    return open(path, 'r', encoding='utf-8')
+
+
+def no_run(*_, **__):
+  raise AssertionError('No command must be run')
+
+
+class TestGanetiConfigData(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, self.directory)
+    self.path = os.path.join(self.directory, 'config.data')
+    shutil.copy(os.path.join(FIXTURES, 'config.data'), self.path)
+    self.opener = CountingOpener()
+    self.config = GanetiConfigData(self.path, opener=self.opener)
+
+  def _rewrite(self, old, new, mtime):
+    with open(self.path, 'r', encoding='utf-8') as config_file:
+      content = config_file.read()
+    with open(self.path, 'w', encoding='utf-8') as config_file:
+      config_file.write(content.replace(old, new))
+    os.utime(self.path, (mtime, mtime))
+
+  def test_format_size(self):
+    self.assertEqual(format_size(512), '512M')
+    self.assertEqual(format_size(10240), '10.0G')
+    self.assertEqual(format_size(2 * 1024 * 1024), '2.0T')
+
+  def test_parse_vlan(self):
+    self.assertEqual(parse_vlan('.100'), 100)
+    self.assertEqual(parse_vlan(':100'), 100)
+    self.assertIsNone(parse_vlan(''))
+    self.assertIsNone(parse_vlan(None))
+
+  def test_list_all_instances(self):
+    instances = self.config.list()
+    self.assertEqual([instance['name'] for instance in instances], ['vm1', 'vm2'])
+    vm1 = instances[0]
+    self.assertEqual(vm1['admin_state'], 'up')
+    self.assertIsNone(vm1['oper_state'])
+    self.assertEqual(vm1['pnode'], 'node1.example.com')
+    self.assertEqual(vm1['disk_count'], 1)
+    self.assertEqual(vm1['disk_sizes'], ['10.0G'])
+    self.assertEqual(vm1['disks.0.size'], 10240)
+    self.assertIsNone(vm1['disks.1.size'])
+    self.assertEqual(vm1['nic_names'], ['eth0'])
+    self.assertEqual(vm1['nics.0.link'], 'br_gnt')
+    self.assertEqual(vm1['backend_param.vcpus'], 2)
+    self.assertEqual(vm1['backend_param.memory'], 128)
+
+  def test_list_with_headers(self):
+    self.assertEqual(
+      [dict(instance) for instance in self.config.list('vm2', 'unknown', header_names=['name', 'pnode'])],
+      [{'name': 'vm2', 'pnode': 'node2.example.com'}]
+    )
+
+  def test_info_have_same_keys_than_static_info(self):
+    infos = self.config.info()
+    cli_infos = parse_info_instances(stdout=read_fixture('gnt_instance_info_static.txt'))
+    for info, cli_info in zip(infos, cli_infos):
+      for key in ['name', 'admin_state', 'state', 'Operating system', 'Hypervisor',
+                  'Disk template', 'Back-end parameters', 'Serial number']:
+        self.assertEqual(info[key], cli_info[key], key)
+    self.assertEqual(infos[0]['Disks'][0]['disk/0'], 'file, size 10.0G')
+    self.assertEqual(infos[0]['NICs'][0]['link'], 'br_gnt')
+    self.assertIsNone(infos[1]['NICs'])
+    self.assertIsNone(infos[1]['Disks'])
+
+  def test_info_diff_like_cli_info(self):
+    gnt_instance = GntInstance(no_run, no_run, query_backend=self.config)
+    cli_info = parse_info_instances(stdout=read_fixture('gnt_instance_info_static.txt'))[0]
+    info = gnt_instance.info('vm1', static=True)[0]
+    for options in [
+        {'os-type': 'noop', 'disk-template': 'file', 'hypervisor': 'fake'},
+        {'os-type': 'debootstrap'},
+        {'backend-parameters': {'vcpus': 2}},
+        {'backend-parameters': {'vcpus': 4}},
+        {'net': [{'name': 'eth0', 'link': 'br_gnt'}]},
+        {'net': [{'name': 'eth0', 'link': 'br_other'}]},
+    ]:
+      params = {'name': 'vm1', 'options': options}
+      self.assertEqual(
+        gnt_instance.config_and_remote_have_difference(params, info),
+        gnt_instance.config_and_remote_have_difference(params, cli_info),
+        options
+      )
+
+  def test_backend_serve_list_and_static_info_only(self):
+    gnt_instance = GntInstance(no_run, no_run, query_backend=self.config)
+    self.assertEqual([i['name'] for i in gnt_instance.live_state()], ['vm1', 'vm2'])
+    self.assertEqual(gnt_instance.primary_nodes('vm1'), {'vm1': 'node1.example.com'})
+    with self.assertRaises(AssertionError):
+      gnt_instance.info('vm1')
+
+  def test_cache_by_mtime_and_serial_no(self):
+    self.config.list()
+    self.config.info()
+    self.assertEqual(self.opener.count, 1)
+
+    # File touched, same serial: the records are kept
+    records = self.config.instances()
+    self._rewrite('"cluster.example.com"', '"cluster.example.com" ', 1000)
+    self.assertIs(self.config.instances()[0], records[0])
+    self.assertEqual(self.opener.count, 2)
+
+    # New serial: the records are rebuilt
+    self._rewrite('"serial_no": 12', '"serial_no": 13', 2000)
+    self._rewrite('"admin_state": "up"', '"admin_state": "down"', 2000)
+    self.assertEqual(self.config.serial_no, 13)
+    self.assertEqual(self.config.list('vm1', header_names=['admin_state'])[0]['admin_state'], 'down')
+    self.assertEqual(self.opener.count, 3)
+
+  def test_error_if_file_missing_or_invalid(self):
+    with self.assertRaises(ConfigDataError):
+      GanetiConfigData(os.path.join(self.directory, 'missing')).list()
+    self._rewrite('"instances"', '"other"', 1000)
+    with self.assertRaises(ConfigDataError):
+      self.config.list()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,208 @@
+import os
+import unittest
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_command import StreamCommandException
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance import (
+  GntInstance,
+  iter_info_instances,
+  parse_info_instances,
+  parse_state
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list import LazyListRow, ListRow
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.parse_info_response import (
+  parse_from_stdout,
+  split_records
+)
+from tests.helpers import MockRunner
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def read_fixture(name):
+  with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as fixture:
+    return fixture.read()
+
+
+class MockStream:
+  def __init__(self, *outputs) -> None:
+    self.outputs = list(outputs)
+    self.commands = []
+    self.read = 0
+    self.closed = False
+
+  def __call__(self, cmd):
+    self.commands.append(cmd)
+    output = self.outputs.pop(0)
+    try:
+      if output is None:
+        raise StreamCommandException(cmd, 1, 'error')
+      for line in output.splitlines(True):
+        self.read += 1
+        yield line
+    finally:
+      self.closed = True
+
+
+class TestGntInstance(unittest.TestCase):
+
+  def test_parse_state(self):
+    self.assertEqual(parse_state('configured to be up, actual state is up'), ('up', 'up'))
+    self.assertEqual(parse_state('configured to be up, actual state is down'), ('up', 'down'))
+    self.assertEqual(parse_state('configured to be down'), ('down', None))
+
+  def test_parse_info_instances_static(self):
+    infos = parse_info_instances(stdout=read_fixture('gnt_instance_info_static.txt'))
+    self.assertEqual([info['name'] for info in infos], ['vm1', 'vm2'])
+    self.assertEqual([info['admin_state'] for info in infos], ['up', 'down'])
+    self.assertEqual([info['state'] for info in infos], [None, None])
+    self.assertEqual(infos[0]['NICs'][0]['link'], 'br_gnt')
+    self.assertEqual(infos[0]['Back-end parameters']['vcpus'], 2)
+    self.assertEqual(parse_info_instances(stdout=''), [])
+
+  def test_split_records(self):
+    stdout = read_fixture('gnt_instance_info_static.txt')
+    records = list(split_records(stdout))
+    self.assertEqual(len(records), 2)
+    self.assertTrue(records[0].startswith('- Instance name: vm1'))
+    self.assertTrue(records[1].startswith('- Instance name: vm2'))
+    self.assertEqual(list(split_records(stdout.splitlines())), records)
+    self.assertEqual(list(split_records('')), [])
+
+  def test_streaming_parse_same_as_full_parse(self):
+    stdout = read_fixture('gnt_instance_info_static.txt')
+    expected = parse_from_stdout(stdout=stdout)
+    infos = parse_info_instances(stdout=stdout)
+    for info in infos:
+      for key in ['name', 'state', 'admin_state']:
+        info.pop(key)
+    self.assertEqual(infos, expected)
+
+  def test_iter_info_instances_stop_when_names_found(self):
+    lines = read_fixture('gnt_instance_info_static.txt').splitlines(keepends=True)
+    consumed = []
+
+    def stream():
+      for line in lines:
+        consumed.append(line)
+        yield line
+
+    infos = list(iter_info_instances(stdout=stream(), names=['vm1']))
+    self.assertEqual([info['name'] for info in infos], ['vm1'])
+    # Only the first line of the second record is read
+    self.assertEqual(consumed[-1], '- Instance name: vm2\n')
+    self.assertLess(len(consumed), len(lines))
+
+  def test_iter_info_instances_skip_other_names(self):
+    stdout = read_fixture('gnt_instance_info_static.txt')
+    self.assertEqual(
+      [info['name'] for info in iter_info_instances(stdout=stdout, names=['vm2', 'unknown'])],
+      ['vm2']
+    )
+
+  def test_info_run_function(self):
+    runner = MockRunner((0, read_fixture('gnt_instance_info_static.txt'), ''), (1, '', 'error'))
+    gnt_instance = GntInstance(runner, None)
+    self.assertEqual([info['name'] for info in gnt_instance.info('vm1', 'vm2', static=True)], ['vm1', 'vm2'])
+    self.assertIsNone(gnt_instance.info('vm1'))
+    self.assertEqual(runner.commands[0].split(), ['gnt-instance', 'info', '--static', 'vm1', 'vm2'])
+
+  def test_info_static(self):
+    stream = MockStream(read_fixture('gnt_instance_info_static.txt'), '', None)
+    gnt_instance = GntInstance(MockRunner(), None, stream_function=stream)
+    infos = gnt_instance.info('vm1', 'vm2', static=True)
+    self.assertEqual([info['name'] for info in infos], ['vm1', 'vm2'])
+    self.assertEqual(gnt_instance.info('vm1'), [])
+    self.assertIsNone(gnt_instance.info('vm1'))
+    self.assertEqual(stream.commands[0].split(), ['gnt-instance', 'info', '--static', 'vm1', 'vm2'])
+    self.assertEqual(stream.commands[1].split(), ['gnt-instance', 'info', 'vm1'])
+    self.assertTrue(stream.closed)
+
+  def test_live_state(self):
+    runner = MockRunner((0, 'vm1--##up--##Y\nvm2--##down--##N\n', ''))
+    self.assertEqual(
+      GntInstance(runner, None).live_state('vm1', 'vm2'),
+      [
+        {'name': 'vm1', 'admin_state': 'up', 'oper_state': True},
+        {'name': 'vm2', 'admin_state': 'down', 'oper_state': False},
+      ]
+    )
+    self.assertIn('--output name,admin_state,oper_state vm1 vm2', runner.commands[0])
+
+  def test_missing_instance_return_none(self):
+    runner = MockRunner((1, '', 'Instance unknown'))
+    self.assertIsNone(GntInstance(runner, None).live_state('vm1'))
+
+  def test_list_request_only_used_nic_columns(self):
+    runner = MockRunner(
+      (0, '1\n2\n', ''),
+      (0, 'vm1--##br0--##-\nvm2--##br0--##br1\n', ''),
+    )
+    instances = GntInstance(runner, None).list('vm1', 'vm2', header_names=['name', 'nics.link'])
+    self.assertIn('--output nic.count vm1 vm2', runner.commands[0])
+    self.assertIn('--output name,nic.link/0,nic.link/1 vm1 vm2', runner.commands[1])
+    self.assertEqual(
+      [dict(instance) for instance in instances],
+      [
+        dict([('name', 'vm1'), ('nics.0.link', 'br0')] + [('nics.{}.link'.format(index), None) for index in range(1, 8)]),
+        dict([('name', 'vm2'), ('nics.0.link', 'br0'), ('nics.1.link', 'br1')] + [('nics.{}.link'.format(index), None) for index in range(2, 8)]),
+      ]
+    )
+    self.assertEqual(list(instances[0]), ['name'] + ['nics.{}.link'.format(index) for index in range(8)])
+
+  def test_list_compact(self):
+    runner = MockRunner((0, '1\n', ''), (0, 'vm1--##br0\n', ''))
+    instances = GntInstance(runner, None).list(header_names=['name', 'nics.link'], compact=True)
+    self.assertIsInstance(instances[0], ListRow)
+    self.assertEqual(instances[0], dict([('name', 'vm1'), ('nics.0.link', 'br0')] + [('nics.{}.link'.format(index), None) for index in range(1, 8)]))
+
+  def test_list_lazy(self):
+    runner = MockRunner((0, '2\n', ''), (0, 'vm1--##br0--##br1\n', ''))
+    instances = GntInstance(runner, None).list(header_names=['name', 'nics.link'], lazy=True)
+    self.assertIsInstance(instances[0], LazyListRow)
+    self.assertEqual(instances[0]['nics.1.link'], 'br1')
+    self.assertIsNone(instances[0]['nics.7.link'])
+
+  def test_iter_list(self):
+    stream = MockStream('vm1--##up\nvm2--##down\nvm3--##up\n')
+    instances = GntInstance(MockRunner(), None, stream_function=stream).iter_list(header_names=['name', 'admin_state'])
+    self.assertEqual(dict(next(instances)), {'name': 'vm1', 'admin_state': 'up'})
+    self.assertEqual(stream.read, 1)
+    instances.close()
+    self.assertTrue(stream.closed)
+    self.assertIn('--output name,admin_state', stream.commands[0])
+
+  def test_iter_list_element_columns(self):
+    runner = MockRunner((0, '1\n2\n', ''))
+    stream = MockStream('vm1--##br0--##-\nvm2--##br0--##br1\n')
+    gnt_instance = GntInstance(runner, None, stream_function=stream)
+    instances = list(gnt_instance.iter_list('vm1', 'vm2', header_names=['name', 'nics.link'], lazy=True))
+    self.assertIn('--output nic.count vm1 vm2', runner.commands[0])
+    self.assertIn('--output name,nic.link/0,nic.link/1 vm1 vm2', stream.commands[0])
+    self.assertIsInstance(instances[0], LazyListRow)
+    self.assertEqual(
+      [dict(instance) for instance in instances],
+      [dict(instance) for instance in GntInstance(
+        MockRunner((0, '1\n2\n', ''), (0, 'vm1--##br0--##-\nvm2--##br0--##br1\n', '')), None
+      ).list('vm1', 'vm2', header_names=['name', 'nics.link'])]
+    )
+
+  def test_iter_list_error(self):
+    stream = MockStream(None)
+    self.assertEqual(list(GntInstance(MockRunner(), None, stream_function=stream).iter_list(header_names=['name'])), [])
+
+  def test_list_without_list_element_columns_one_command(self):
+    runner = MockRunner((0, 'vm1--##up\n', ''))
+    GntInstance(runner, None).list(header_names=['name', 'admin_state'])
+    self.assertEqual(len(runner.commands), 1)
+
+  def test_list_without_any_element(self):
+    runner = MockRunner((0, '0--##0\n', ''))
+    self.assertEqual(
+      [dict(instance) for instance in GntInstance(runner, None).list(header_names=['disks.size', 'nics.mac'])],
+      [dict([('disks.{}.size'.format(index), None) for index in range(8)] + [('nics.{}.mac'.format(index), None) for index in range(8)])]
+    )
+    self.assertEqual(len(runner.commands), 1)
+    self.assertIn('--output nic.count,disk.count', runner.commands[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance import get_builder_gnt_instance_command
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_args_spec import GNT_INSTANCE_OPTIONS_ARGS_SPEC
+
+from tests.helpers import cache_size_after_import, run_python
+
+
+class TestGntInstanceArgsSpec(unittest.TestCase):
+
+  def test_static_spec_same_as_builder_spec(self):
+    self.assertEqual(GNT_INSTANCE_OPTIONS_ARGS_SPEC, get_builder_gnt_instance_command().generate_args_spec())
+
+  def test_static_spec_file_up_to_date(self):
+    result = run_python('tools/generate_args_spec.py', '--check')
+    self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+  def test_modules_import_without_build_builder_spec(self):
+    self.assertEqual(cache_size_after_import(
+      'from ansible_collections.lecontesteur.ganeti_cli.plugins.modules import gnt_instance, gnt_instances',
+      'from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance import get_builder_gnt_instance_spec',
+      cached='get_builder_gnt_instance_spec'
+    ), 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_create import (
+  OpportunisticCreator,
+  is_temporary_failure,
+  opportunistic_params,
+)
+
+TEMP_ERROR = "[['OpPrereqError', ['Can not compute nodes using iallocator', 'temp_insufficient_resources']]]"
+
+
+class MockGntInstance:
+  def __init__(self) -> None:
+    self.adds = []
+
+  def add(self, name, params):
+    self.adds.append((name, params))
+    return len(self.adds)
+
+
+class MockGntJob:
+  """Final status and result of jobs, by instance name and attempt"""
+
+  def __init__(self, gnt_instance, outcomes) -> None:
+    self.gnt_instance = gnt_instance
+    self.outcomes = outcomes
+
+  def _outcome(self, job_id):
+    name = self.gnt_instance.adds[job_id - 1][0]
+    attempt = [add[0] for add in self.gnt_instance.adds[:job_id]].count(name) - 1
+    outcomes = self.outcomes.get(name, [])
+    return outcomes[attempt] if attempt < len(outcomes) else ('success', None)
+
+  def statuses(self, *job_ids, batch_size=100):
+    return {job_id: self._outcome(job_id)[0] for job_id in job_ids}
+
+  def results(self, *job_ids):
+    return {job_id: self._outcome(job_id)[1] for job_id in job_ids}
+
+
+class TestOpportunisticCreator(unittest.TestCase):
+
+  def _create(self, names, outcomes, max_resubmit=3):
+    gnt_instance = MockGntInstance()
+    creator = OpportunisticCreator(
+      gnt_instance, MockGntJob(gnt_instance, outcomes), max_resubmit=max_resubmit,
+      sleep=lambda _: None
+    )
+    results = creator.create({name: {'name': name, 'options': {'iallocator': 'hail'}} for name in names})
+    return gnt_instance, results
+
+  def test_is_temporary_failure(self):
+    self.assertTrue(is_temporary_failure(TEMP_ERROR))
+    self.assertFalse(is_temporary_failure("[['OpPrereqError', ['Disk template invalid', 'wrong_input']]]"))
+    self.assertFalse(is_temporary_failure(None))
+
+  def test_opportunistic_params(self):
+    params = {'name': 'vm1', 'options': {'iallocator': 'hail'}}
+    self.assertEqual(
+      opportunistic_params(params)['options'],
+      {'iallocator': 'hail', 'submit': True, 'opportunistic-locking': True}
+    )
+    self.assertEqual(params['options'], {'iallocator': 'hail'})
+
+  def test_all_jobs_submitted_before_wait(self):
+    gnt_instance, results = self._create(['vm1', 'vm2', 'vm3'], {})
+    self.assertEqual([add[0] for add in gnt_instance.adds], ['vm1', 'vm2', 'vm3'])
+    self.assertTrue(all(add[1]['options']['opportunistic-locking'] for add in gnt_instance.adds))
+    self.assertEqual({name: result.jobs for name, result in results.items()},
+                     {'vm1': [1], 'vm2': [2], 'vm3': [3]})
+    self.assertFalse(any(result.failed for result in results.values()))
+
+  def test_resubmit_temporary_failures(self):
+    gnt_instance, results = self._create(
+      ['vm1', 'vm2', 'vm3'],
+      {'vm2': [('error', TEMP_ERROR), ('error', TEMP_ERROR)], 'vm3': [('error', 'wrong_input')]}
+    )
+    self.assertEqual([add[0] for add in gnt_instance.adds], ['vm1', 'vm2', 'vm3', 'vm2', 'vm2'])
+    self.assertEqual(results['vm2'].jobs, [2, 4, 5])
+    self.assertFalse(results['vm2'].failed)
+    self.assertTrue(results['vm3'].failed)
+    self.assertIn('wrong_input', results['vm3'].error)
+
+  def test_max_resubmit(self):
+    _, results = self._create(['vm1'], {'vm1': [('error', TEMP_ERROR)] * 5}, max_resubmit=2)
+    self.assertEqual(results['vm1'].jobs, [1, 2, 3])
+    self.assertTrue(results['vm1'].failed)
+
+
+if __name__ == '__main__':
+  unittest.main()
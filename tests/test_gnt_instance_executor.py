@@ -0,0 +1,129 @@
+import threading
+import time
+import unittest
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_command import RunCommandException
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance import GntInstance
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_executor import (
+  GntInstanceExecutor,
+  InstanceOperation,
+  NodeLimiter,
+  group_by_instance,
+  interleave_by_node
+)
+
+
+class MockConcurrentGntInstance:
+  def __init__(self, primary_nodes, duration=0.02) -> None:
+    self.primary_nodes = primary_nodes
+    self.duration = duration
+    self.lock = threading.Lock()
+    self.running = {}
+    self.max_running = {}
+    self.calls = []
+
+  def _call(self, method, name):
+    node = self.primary_nodes.get(name)
+    with self.lock:
+      self.calls.append((method, name))
+      self.running[node] = self.running.get(node, 0) + 1
+      self.max_running[node] = max(self.max_running.get(node, 0), self.running[node])
+    time.sleep(self.duration)
+    with self.lock:
+      self.running[node] -= 1
+    if name.startswith('fail'):
+      raise RunCommandException('{} failed'.format(method))
+    return '{}:{}'.format(method, name)
+
+  def stop(self, name, submit=False):
+    return self._call('stop', name)
+
+  def modify(self, name, params, info):
+    return self._call('modify', name)
+
+  def reboot(self, name, submit=False):
+    return self._call('reboot', name)
+
+
+class TestGntInstanceExecutor(unittest.TestCase):
+
+  def test_operation_method_must_be_allowed(self):
+    with self.assertRaises(ValueError):
+      InstanceOperation('vm1', 'info')
+
+  def test_group_by_instance_keep_order(self):
+    operations = [
+      InstanceOperation('vm1', 'stop'),
+      InstanceOperation('vm2', 'reboot'),
+      InstanceOperation('vm1', 'modify', {}, {}),
+    ]
+    grouped = group_by_instance(operations)
+    self.assertEqual(list(grouped), ['vm1', 'vm2'])
+    self.assertEqual([op.method for op in grouped['vm1']], ['stop', 'modify'])
+
+  def test_interleave_by_node(self):
+    self.assertEqual(
+      list(interleave_by_node(
+        ['a1', 'a2', 'a3', 'b1', 'c1', 'b2'],
+        {'a1': 'a', 'a2': 'a', 'a3': 'a', 'b1': 'b', 'b2': 'b', 'c1': 'c'}
+      )),
+      ['a1', 'b1', 'c1', 'a2', 'b2', 'a3']
+    )
+
+  def test_node_limiter(self):
+    with self.assertRaises(ValueError):
+      NodeLimiter(0)
+    limiter = NodeLimiter(1)
+    with limiter.limit(None):
+      with limiter.limit(None):
+        pass
+
+  def test_run_with_node_cap(self):
+    primary_nodes = {'vm{}'.format(i): 'node{}'.format(i % 2) for i in range(6)}
+    gnt_instance = MockConcurrentGntInstance(primary_nodes)
+    results = GntInstanceExecutor(
+      gnt_instance, max_workers=6, max_per_node=1, primary_nodes=primary_nodes
+    ).run([InstanceOperation(name, 'reboot') for name in primary_nodes])
+    self.assertEqual(list(results), list(primary_nodes))
+    self.assertEqual(gnt_instance.max_running, {'node0': 1, 'node1': 1})
+    self.assertEqual(results['vm3'].results, ['reboot:vm3'])
+
+  def test_run_in_parallel(self):
+    primary_nodes = {'vm{}'.format(i): 'node{}'.format(i) for i in range(4)}
+    gnt_instance = MockConcurrentGntInstance(primary_nodes, duration=0.1)
+    start = time.monotonic()
+    GntInstanceExecutor(gnt_instance, max_workers=4, max_per_node=1, primary_nodes=primary_nodes).run(
+      [InstanceOperation(name, 'reboot') for name in primary_nodes]
+    )
+    self.assertLess(time.monotonic() - start, 0.35)
+
+  def test_errors_by_instance(self):
+    gnt_instance = MockConcurrentGntInstance({}, duration=0)
+    results = GntInstanceExecutor(gnt_instance, max_workers=2).run([
+      InstanceOperation('fail1', 'stop'),
+      InstanceOperation('fail1', 'modify', {}, {}),
+      InstanceOperation('vm2', 'stop'),
+      InstanceOperation('vm2', 'modify', {}, {}),
+    ])
+    self.assertTrue(results['fail1'].failed)
+    self.assertEqual(results['fail1'].to_result()['error'], 'stop failed')
+    self.assertNotIn(('modify', 'fail1'), gnt_instance.calls)
+    self.assertFalse(results['vm2'].failed)
+    self.assertEqual(results['vm2'].results, ['stop:vm2', 'modify:vm2'])
+
+  def test_gnt_instance_parallel_raise_errors(self):
+    def runner(cmd, check_rc=False):
+      if cmd.endswith('vm2'):
+        return 1, '', 'error'
+      return 0, '', ''
+    def error_function(*args, **kwargs):
+      raise AssertionError('error function must not be called')
+    results = GntInstance(runner, error_function).parallel(
+      [InstanceOperation('vm1', 'stop'), InstanceOperation('vm2', 'stop')],
+      max_workers=2
+    )
+    self.assertFalse(results['vm1'].failed)
+    self.assertIsInstance(results['vm2'].error, RunCommandException)
+
+if __name__ == '__main__':
+    unittest.main()
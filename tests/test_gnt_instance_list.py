@@ -1,16 +1,28 @@
+import ast
 import unittest
+from unittest.mock import Mock, patch
 
 from collections import OrderedDict, namedtuple
 
 from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list import (
   parse_ganeti_list_output_line,
+  parse_ganeti_list_output,
   build_gnt_instance_list_arguments,
   subheaders,
   GntListOption,
   merge_alias_headers,
-  field_headers
+  field_headers,
+  get_field_headers,
+  LazyFieldHeaders,
+  compile_list_parser,
+  literal_eval,
+  ListRow,
+  LazyListRow,
+  PARSERS,
+  iter_ganeti_list_output,
+  query_list,
 )
-
+from tests.helpers import cache_size_after_import
 
 TestCaseData = namedtuple('TestCaseData', ['input', 'expected'])
 
@@ -64,6 +76,17 @@ class TestGanetiInstanceList(unittest.TestCase):
         parse_ganeti_list_output_line(stdout=data.input, headers=headers)
       )
 
+  def test_parse_output_with_headers(self):
+    headers = subheaders('name', 'admin_state')
+    self.assertEqual(
+      parse_ganeti_list_output(stdout="vm1--##up\nvm2--##down\n\n", headers=headers),
+      [
+        OrderedDict(name='vm1', admin_state='up'),
+        OrderedDict(name='vm2', admin_state='down'),
+      ]
+    )
+    self.assertEqual(parse_ganeti_list_output(stdout="", headers=headers), [])
+
   def test_build_gnt_instance_list_arguments_multi_headers_and_names(self):
     self.assertEqual(
       build_gnt_instance_list_arguments('toto', 'test', header_names=['name', 'nic_names', 'nic_modes']),
@@ -89,5 +112,200 @@ class TestGanetiInstanceList(unittest.TestCase):
       ['test']
     )
 
+  def test_subheaders_logical_fields(self):
+    self.assertEqual(
+      list(subheaders('nics.name, admin_state')),
+      ['nic_names', 'admin_state']
+    )
+    self.assertEqual(
+      list(subheaders('nics.link', 'name')),
+      ['nics.{}.link'.format(index) for index in range(8)] + ['name']
+    )
+    self.assertEqual(list(subheaders('backend_param')), ['backend_param.memory', 'backend_param.vcpus'])
+    self.assertEqual(list(subheaders('disks.0')), ['disks.0.size', 'disks.0.spindles'])
+    self.assertEqual(list(subheaders('name', 'name, nic_count', 'nics.count')), ['name', 'nic_count'])
+    self.assertEqual(len(subheaders('nics')), 8 * 6)
+    with self.assertRaises(KeyError):
+      subheaders('nics.unknown')
+
+  def test_build_gnt_instance_list_arguments_logical_fields(self):
+    self.assertEqual(
+      build_gnt_instance_list_arguments('test', header_names=['nics.mode', 'admin_state']),
+      gnt_instance_list_base + [','.join(['nic.mode/{}'.format(index) for index in range(8)] + ['admin_state']), 'test']
+    )
+
+  def test_parse_projected_columns(self):
+    self.assertEqual(
+      parse_ganeti_list_output(stdout="vm1--##[None, 'eth1']--##up\n", headers=subheaders('name', 'nics.name', 'admin_state')),
+      [OrderedDict([('name', 'vm1'), ('nic_names', [None, 'eth1']), ('admin_state', 'up')])]
+    )
+
+  def test_parse_columns(self):
+    headers = OrderedDict([
+      ('name', GntListOption('name', 'str')),
+      ('nic_count', GntListOption('nic.count', 'int')),
+      ('oper_state', GntListOption('oper_state', 'boolean')),
+      ('nic_modes', GntListOption('nic.modes', 'list_str')),
+      ('nic_vlans', GntListOption('nic.vlans', 'list')),
+    ])
+    stdout = "vm1--##2--##Y--##bridged,openvswitch--##[None, '']\n vm2 --## - --##n--##---##-\n\n"
+    self.assertEqual(
+      parse_ganeti_list_output(stdout=stdout, headers=headers, as_columns=True),
+      OrderedDict([
+        ('name', ['vm1', 'vm2']),
+        ('nic_count', [2, None]),
+        ('oper_state', [True, False]),
+        ('nic_modes', [['bridged', 'openvswitch'], None]),
+        ('nic_vlans', [[None, ''], None]),
+      ])
+    )
+    self.assertEqual(
+      parse_ganeti_list_output(stdout=stdout, headers=headers),
+      [parse_ganeti_list_output_line(line, headers=headers) for line in stdout.strip().split('\n')]
+    )
+    self.assertEqual(parse_ganeti_list_output(stdout='', headers=headers, as_columns=True), OrderedDict((name, []) for name in headers))
+    self.assertEqual(parse_ganeti_list_output(stdout='\n', headers=headers), [])
+
+  def test_parse_columns_errors(self):
+    headers = OrderedDict([('name', GntListOption('name', 'str')), ('oper_state', GntListOption('oper_state', 'boolean'))])
+    with self.assertRaises(ValueError):
+      parse_ganeti_list_output(stdout='vm1\n', headers=headers)
+    with self.assertRaises(ValueError):
+      parse_ganeti_list_output(stdout='vm1--##maybe\n', headers=headers)
+
+  def test_compile_list_parser_cached(self):
+    self.assertIs(compile_list_parser(subheaders('name', 'nics.link')), compile_list_parser(subheaders('name', 'nics.link')))
+
+  def test_literal_eval_same_as_ast(self):
+    values = [
+      "[None, None]", "[None, u'']", "[]", "{}", "[1, -2, 0, 3.5, True, False]", "['a, b', u\"it's\", 'x]']",
+      "{'a': 1, u'b': None, 'c': 'd: e', 'f': -0.5,}", "{1: 'one', None: False}",
+      "['with \\'escape']", "[[1, 2], {'a': [3]}]", "(1, [2])", "{1, 2}", "[1e3]", "'str'", "5",
+      data_tests_full_headers[0].input.split('--##')[-1],
+    ]
+    for value in values:
+      with self.subTest(value=value):
+        self.assertEqual(literal_eval(value), ast.literal_eval(value))
+        self.assertEqual(type(literal_eval(value)), type(ast.literal_eval(value)))
+    for value in ["[01]", "[None", "{'a':}", "[os.system]"]:
+      with self.subTest(value=value):
+        with self.assertRaises((ValueError, SyntaxError)):
+          literal_eval(value)
+
+  def test_literal_eval_result_copied(self):
+    value = "{'a': [1, {'b': 2}], 'c': 'd'}"
+    first = literal_eval(value)
+    first['a'][1]['b'] = 3
+    first['a'].append(4)
+    first['e'] = 5
+    self.assertEqual(literal_eval(value), {'a': [1, {'b': 2}], 'c': 'd'})
+    hvparams = parse_ganeti_list_output(stdout=data_tests_full_headers[0].input, headers=subheaders(*expected_headers))
+    hvparams[0]['hvparams']['acpi'] = 'changed'
+    self.assertTrue(parse_ganeti_list_output(stdout=data_tests_full_headers[0].input, headers=subheaders(*expected_headers))[0]['hvparams']['acpi'])
+
+  def test_parse_compact_rows(self):
+    headers = subheaders(*expected_headers)
+    stdout = '\n'.join(data.input for data in data_tests_full_headers)
+    rows = parse_ganeti_list_output(stdout=stdout, headers=headers)
+    compact = parse_ganeti_list_output(stdout=stdout, headers=headers, compact=True)
+    self.assertEqual(compact, rows)
+    self.assertIsInstance(compact[0], ListRow)
+    self.assertEqual(list(compact[0]), expected_headers)
+    self.assertEqual(compact[0].to_dict(), rows[0])
+    self.assertEqual(compact[1]['nic_modes'], ['bridged', 'openvswitch', 'openvswitch', 'openvswitch'])
+    self.assertIsNone(compact[0].get('unknown'))
+    self.assertNotIn('unknown', compact[0])
+    with self.assertRaises(KeyError):
+      compact[0]['unknown']
+    with self.assertRaises(TypeError):
+      compact[0]['name'] = 'vm'
+    with self.assertRaises(AttributeError):
+      compact[0].other = 1
+
+  def test_parse_compact_rows_shared_index_and_interned(self):
+    headers = subheaders('name', 'pnode')
+    compact = parse_ganeti_list_output(stdout='vm1--##node1\nvm2--##node1\n', headers=headers, compact=True)
+    self.assertIs(compact[0]._index, compact[1]._index)
+    self.assertIs(compact[0]['pnode'], compact[1]['pnode'])
+
+  def test_parse_lazy_rows(self):
+    headers = subheaders(*expected_headers)
+    stdout = '\n'.join(data.input for data in data_tests_full_headers)
+    lazy = parse_ganeti_list_output(stdout=stdout, headers=headers, lazy=True)
+    self.assertIsInstance(lazy[0], LazyListRow)
+    self.assertEqual(lazy, parse_ganeti_list_output(stdout=stdout, headers=headers))
+    self.assertEqual(lazy[2].to_dict(), parse_ganeti_list_output(stdout=stdout, headers=headers)[2])
+    self.assertEqual(list(lazy[0]), expected_headers)
+    self.assertIn('hvparams', lazy[0])
+    self.assertIsNone(lazy[0].get('unknown'))
+
+  def test_parse_lazy_rows_decode_on_access(self):
+    headers = subheaders('name', 'oper_state', 'hvparams')
+    mock_dict = Mock(return_value={'acpi': True})
+    with patch.dict(PARSERS, {'dict': mock_dict}):
+      row = parse_ganeti_list_output(stdout="vm1--##maybe--##{'acpi': True}\n", headers=headers, lazy=True)[0]
+      self.assertEqual(row['name'], 'vm1')
+      mock_dict.assert_not_called()
+      self.assertIs(row['hvparams'], row['hvparams'])
+      mock_dict.assert_called_once_with("{'acpi': True}")
+    with self.assertRaises(ValueError):
+      row['oper_state']
+
+  def test_query_list(self):
+    queried = []
+
+    def query(fields):
+      queried.append(fields)
+      return [['vm1', 'node1', ['br0']]]
+
+    headers = ['name', 'pnode', 'nics.0.link']
+    self.assertEqual(
+      query_list(query, headers),
+      [OrderedDict([('name', 'vm1'), ('pnode', 'node1'), ('nics.0.link', ['br0'])])]
+    )
+    self.assertEqual(queried, [['name', 'pnode', 'nic.link/0']])
+    for option in ({'compact': True}, {'lazy': True}):
+      rows = query_list(query, headers, **option)
+      self.assertIsInstance(rows[0], ListRow)
+      self.assertEqual(rows[0], {'name': 'vm1', 'pnode': 'node1', 'nics.0.link': ['br0']})
+    self.assertIsNone(query_list(lambda fields: None, headers, lazy=True))
+
+  def test_lazy_row_with_headers(self):
+    row = parse_ganeti_list_output(stdout='vm1--##br0\n', headers=subheaders('name', 'nics.0.link'), lazy=True)[0]
+    self.assertEqual(
+      row.with_headers(subheaders('name', 'nics.0.link', 'nics.1.link')),
+      {'name': 'vm1', 'nics.0.link': 'br0', 'nics.1.link': None}
+    )
+
+  def test_iter_ganeti_list_output(self):
+    headers = subheaders(*expected_headers)
+    stdout = '\n'.join(data.input for data in data_tests_full_headers) + '\n\n'
+    expected = parse_ganeti_list_output(stdout=stdout, headers=headers)
+    lines = iter(stdout.splitlines(True))
+    rows = iter_ganeti_list_output(stdout=lines, headers=headers)
+    self.assertEqual(next(rows), expected[0])
+    self.assertEqual(len(list(lines)), len(data_tests_full_headers))  # the other lines and the empty line are not read
+    self.assertEqual(list(iter_ganeti_list_output(stdout=stdout, headers=headers)), expected)
+    compact = list(iter_ganeti_list_output(stdout=stdout, headers=headers, compact=True))
+    self.assertIsInstance(compact[0], ListRow)
+    self.assertEqual(compact, expected)
+    lazy = list(iter_ganeti_list_output(stdout=stdout.splitlines(True), headers=headers, lazy=True))
+    self.assertIsInstance(lazy[0], LazyListRow)
+    self.assertEqual(lazy, expected)
+
+  def test_field_headers_lazy(self):
+    self.assertIsInstance(field_headers, LazyFieldHeaders)
+    self.assertEqual(list(field_headers.keys()), sorted(field_headers.keys()))
+    self.assertEqual(dict(field_headers), dict(get_field_headers()))
+    self.assertIs(get_field_headers(), get_field_headers())
+    self.assertEqual(field_headers['nic_count'], GntListOption('nic.count', 'int'))
+
+  def test_field_headers_not_built_at_import(self):
+    self.assertEqual(cache_size_after_import(
+      'from ansible_collections.lecontesteur.ganeti_cli.plugins.modules import gnt_instance',
+      'from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list import get_field_headers',
+      cached='get_field_headers'
+    ), 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
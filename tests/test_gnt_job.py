@@ -0,0 +1,94 @@
+import unittest
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_job import (
+  GntJob,
+  JobWaiter,
+  JobsTimeout,
+  batches,
+  parse_job_list_output
+)
+
+
+class MockGntJob:
+  def __init__(self, *steps) -> None:
+    self.steps = list(steps)
+
+  def statuses(self, *job_ids, batch_size=100):
+    step = self.steps.pop(0) if len(self.steps) > 1 else self.steps[0]
+    return {job_id: step.get(job_id, 'unknown') for job_id in job_ids}
+
+
+class MockClock:
+  def __init__(self) -> None:
+    self.now = 0
+
+  def __call__(self):
+    return self.now
+
+  def sleep(self, duration):
+    self.now += duration
+
+
+class TestGntJob(unittest.TestCase):
+
+  def test_batches(self):
+    self.assertEqual(list(batches([], 2)), [])
+    self.assertEqual(list(batches([1, 2, 3], 2)), [[1, 2], [3]])
+    self.assertEqual(list(batches([1, 2, 3], 5)), [[1, 2, 3]])
+    with self.assertRaises(ValueError):
+      list(batches([1], 0))
+
+  def test_parse_job_list_output(self):
+    self.assertEqual(
+      parse_job_list_output(stdout='12--##success\n13--##running\n14--##-\n'),
+      [
+        {'id': 12, 'status': 'success'},
+        {'id': 13, 'status': 'running'},
+        {'id': 14, 'status': 'unknown'},
+      ]
+    )
+
+  def test_statuses_by_batch(self):
+    commands = []
+    def runner(cmd, check_rc=False):
+      commands.append(cmd)
+      ids = cmd.split(' ')[-2:] if cmd.endswith('2') else cmd.split(' ')[-1:]
+      return 0, '\n'.join('{}--##success'.format(i) for i in ids if i != '2'), ''
+    statuses = GntJob(runner, None).statuses(1, 2, 3, batch_size=2)
+    self.assertEqual(len(commands), 2)
+    self.assertTrue(commands[0].startswith('gnt-job list --no-headers'))
+    self.assertEqual(statuses, {1: 'success', 2: 'unknown', 3: 'success'})
+
+  def test_waiter_poll_until_end(self):
+    clock = MockClock()
+    gnt_job = MockGntJob(
+      {1: 'running', 2: 'queued', 3: 'running'},
+      {1: 'success', 2: 'running', 3: 'running'},
+      {2: 'error', 3: 'running'},
+      {3: 'success'},
+    )
+    waiter = JobWaiter(gnt_job, [1, 2, 3], timeout=60, poll_interval=2, batch_size=10,
+                       sleep=clock.sleep, clock=clock)
+    self.assertEqual(waiter.wait(), {1: 'success', 2: 'error', 3: 'success'})
+    self.assertEqual(clock.now, 6)
+
+  def test_waiter_timeout(self):
+    clock = MockClock()
+    gnt_job = MockGntJob({1: 'running', 2: 'running'})
+    waiter = JobWaiter(gnt_job, [1, 2], timeout=10, poll_interval=3, batch_size=10,
+                       sleep=clock.sleep, clock=clock)
+    with self.assertRaises(JobsTimeout):
+      waiter.wait()
+
+  def test_waiter_timeout_last_job_never_finish(self):
+    clock = MockClock()
+    gnt_job = MockGntJob({1: 'running', 2: 'running'}, {1: 'success', 2: 'running'})
+    waiter = JobWaiter(gnt_job, [1, 2], timeout=10, poll_interval=3, batch_size=10,
+                       sleep=clock.sleep, clock=clock)
+    with self.assertRaises(JobsTimeout):
+      waiter.wait()
+    self.assertEqual(waiter.pending, [2])
+    self.assertEqual(clock.now, 10)
+
+if __name__ == '__main__':
+    unittest.main()
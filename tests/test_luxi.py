@@ -0,0 +1,173 @@
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_command import RunCommandException
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_luxi import GntInstanceLuxi
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list import ListRow
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.luxi import (
+  LuxiClient,
+  LuxiError,
+  build_names_filter,
+  query_result_to_rows,
+)
+
+
+class LuxiReplayServer:
+  """Stand-in of master daemon: replay the recorded responses, in order"""
+
+  def __init__(self, path, responses) -> None:
+    self.responses = list(responses)
+    self.requests = []
+    self.connections = 0
+    self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    self.server.bind(path)
+    self.server.listen(1)
+    self.thread = threading.Thread(target=self._serve, daemon=True)
+    self.thread.start()
+
+  def _serve(self):
+    while True:
+      try:
+        connection, _ = self.server.accept()
+      except OSError:
+        return
+      self.connections += 1
+      with connection:
+        buffer = b''
+        while True:
+          data = connection.recv(4096)
+          if not data:
+            break
+          buffer += data
+          while b'\x03' in buffer:
+            message, buffer = buffer.split(b'\x03', 1)
+            self.requests.append(json.loads(message.decode('utf-8')))
+            response = self.responses.pop(0)
+            connection.sendall(json.dumps(response).encode('utf-8') + b'\x03')
+
+  def close(self):
+    self.server.close()
+
+
+def ok(result):
+  return {'success': True, 'result': result}
+
+
+def no_run(*_, **__):
+  raise AssertionError('No command must be run')
+
+
+class TestLuxi(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, self.directory)
+    self.path = os.path.join(self.directory, 'ganeti-master')
+
+  def _server(self, *responses):
+    server = LuxiReplayServer(self.path, responses)
+    self.addCleanup(server.close)
+    client = LuxiClient(self.path, timeout=5)
+    self.addCleanup(client.close)
+    return server, client
+
+  def test_build_names_filter(self):
+    self.assertIsNone(build_names_filter('name'))
+    self.assertEqual(
+      build_names_filter('name', 'vm1', 'vm2'),
+      ['|', ['=', 'name', 'vm1'], ['=', 'name', 'vm2']]
+    )
+
+  def test_query_result_to_rows(self):
+    self.assertEqual(
+      query_result_to_rows({'fields': [], 'data': [[[0, 'vm1'], [2, None]], [[0, 'vm2'], [0, True]]]}),
+      [['vm1', None], ['vm2', True]]
+    )
+
+  def test_connection_reused_for_all_calls(self):
+    server, client = self._server(
+      ok({'fields': [], 'data': [[[0, 'vm1']]]}),
+      ok(12),
+      ok([['success', [None]]]),
+    )
+    self.assertEqual(client.query('instance', ['name']), [['vm1']])
+    self.assertEqual(client.submit_job({'OP_ID': 'OP_INSTANCE_STARTUP', 'instance_name': 'vm1'}), 12)
+    self.assertEqual(client.query_jobs([12], ['status', 'opresult']), [['success', [None]]])
+    self.assertEqual(server.connections, 1)
+    self.assertEqual(
+      [request['method'] for request in server.requests],
+      ['Query', 'SubmitJob', 'QueryJobs']
+    )
+    self.assertEqual(server.requests[0]['args'], ['instance', ['name'], None])
+
+  def test_call_failed(self):
+    _, client = self._server({'success': False, 'result': ['OpPrereqError', 'Unknown instance']})
+    with self.assertRaises(LuxiError):
+      client.call('Query', 'instance', ['name'], None)
+
+  def test_connect_failed(self):
+    with self.assertRaises(LuxiError):
+      LuxiClient(self.path).call('Query')
+
+  def test_gnt_instance_list(self):
+    server, client = self._server(
+      ok({'fields': [], 'data': [[[0, 'vm1'], [0, 'up'], [0, True]]]}),
+    )
+    gnt_instance = GntInstanceLuxi(no_run, None, client=client)
+    self.assertEqual(
+      [dict(instance) for instance in gnt_instance.live_state('vm1')],
+      [{'name': 'vm1', 'admin_state': 'up', 'oper_state': True}]
+    )
+    self.assertEqual(
+      server.requests[0]['args'],
+      ['instance', ['name', 'admin_state', 'oper_state'], ['|', ['=', 'name', 'vm1']]]
+    )
+
+  def test_gnt_instance_list_compact(self):
+    _, client = self._server(
+      ok({'fields': [], 'data': [[[0, 'vm1'], [0, 'node1']]]}),
+    )
+    instances = GntInstanceLuxi(no_run, None, client=client).list('vm1', header_names=['name', 'pnode'], compact=True)
+    self.assertIsInstance(instances[0], ListRow)
+    self.assertEqual(instances[0], {'name': 'vm1', 'pnode': 'node1'})
+
+  def test_gnt_instance_jobs(self):
+    server, client = self._server(
+      ok(20),
+      ok(21),
+      ok([['running', [None]]]),
+      ok([['success', [None]]]),
+      ok(22),
+      ok([['error', ['Instance vm1 is down']]]),
+    )
+    sleeps = []
+    gnt_instance = GntInstanceLuxi(no_run, None, client=client, sleep=sleeps.append)
+    self.assertEqual(gnt_instance.reboot('vm1', submit=True), 20)
+    self.assertIsNone(gnt_instance.stop('vm1', timeout=10))
+    self.assertEqual(len(sleeps), 1)
+    with self.assertRaises(RunCommandException):
+      gnt_instance.remove('vm1')
+    self.assertEqual(server.connections, 1)
+    self.assertEqual(
+      server.requests[1]['args'],
+      [[{'OP_ID': 'OP_INSTANCE_SHUTDOWN', 'instance_name': 'vm1', 'timeout': 10, 'force': False}]]
+    )
+
+  def test_gnt_instance_job_error_function(self):
+    _, client = self._server({'success': False, 'result': 'Job queue full'})
+    errors = []
+    gnt_instance = GntInstanceLuxi(
+      no_run, lambda *args, **kwargs: errors.append((args, kwargs)), client=client
+    )
+    gnt_instance.start('vm1')
+    self.assertEqual(len(errors), 1)
+    self.assertIn('OP_INSTANCE_STARTUP', errors[0][1]['msg'])
+
+
+if __name__ == '__main__':
+  unittest.main()
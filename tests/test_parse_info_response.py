@@ -0,0 +1,89 @@
+import datetime
+import os
+import unittest
+
+import yaml
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.parse_info_response import (
+  InfoFormatError,
+  InfoLineParser,
+  load_scalar,
+  parse,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+RUNTIME_INFO = """- Instance name: vm1
+  UUID: 8d1e1c6a-7d3c-4c8c-a8f0-0d5d7a1c2b3e
+  Serial number: 12
+  Creation time: 2023-02-01 10:12:03
+  State: configured to be up, actual state is up
+  Nodes:
+    - primary: node1.example.com
+      group: default (UUID 1f2e)
+    - secondaries:
+  Hypervisor parameters:
+    migration_mode: default (live)
+    kernel_args: ro
+  Back-end parameters:
+    vcpus: 2
+    memory: default (128)
+    auto_balance: default (True)
+  NICs:
+    - nic/0:
+      MAC: aa:00:00:35:d6:4f
+      IP: None
+      vlan:
+  Disks:
+    - disk/0: file, size 10.0G
+      on primary: /srv/ganeti/vm1/disk0 (252:0)
+- Instance name: vm2
+  State: configured to be down, actual state is down
+  Disks:
+"""
+
+
+def read_fixture(name):
+  with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as fixture:
+    return fixture.read()
+
+
+class TestParseInfoResponse(unittest.TestCase):
+
+  def test_line_parser_same_as_yaml(self):
+    for name, info in [
+      ('static', read_fixture('gnt_instance_info_static.txt')),
+      ('runtime', RUNTIME_INFO),
+    ]:
+      with self.subTest(name=name):
+        self.assertEqual(InfoLineParser(info).parse(), yaml.safe_load(info))
+
+  def test_default_annotations_kept(self):
+    instance = parse(RUNTIME_INFO)[0]
+    self.assertEqual(instance['Back-end parameters']['memory'], 'default (128)')
+    self.assertEqual(instance['Hypervisor parameters']['migration_mode'], 'default (live)')
+    self.assertEqual(instance['Nodes'][1], {'secondaries': None})
+
+  def test_load_scalar_same_as_yaml(self):
+    for value in ['10', '1.5', 'True', 'false', 'None', 'null', '~', '', '2023-02-01',
+                  'aa:00:00:35:d6:4f', 'default (True)', '[1, 2]', "'quoted'", '0x10']:
+      with self.subTest(value=value):
+        self.assertEqual(load_scalar(value), yaml.safe_load(value))
+    self.assertEqual(load_scalar('2023-02-01'), datetime.date(2023, 2, 1))
+
+  def test_load_scalar_flow_value_not_shared(self):
+    load_scalar('[1, 2]').append(3)
+    self.assertEqual(load_scalar('[1, 2]'), [1, 2])
+
+  def test_unknown_layout_fall_back_to_yaml(self):
+    info = "- Instance name: vm1\n  Tags: {a: 1, b: [x, y]}\n  Flow:\n    {c: 2}\n"
+    with self.assertRaises(InfoFormatError):
+      InfoLineParser(info).parse()
+    self.assertEqual(parse(info), yaml.safe_load(info))
+
+  def test_empty(self):
+    self.assertIsNone(parse(''))
+
+
+if __name__ == '__main__':
+  unittest.main()
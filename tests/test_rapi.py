@@ -0,0 +1,239 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_command import RunCommandException
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_list import ListRow
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance_rapi import (
+  GntInstanceRapi,
+  rapi_instance_to_info,
+)
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.rapi import (
+  RapiClient,
+  RapiError,
+  rapi_path,
+)
+
+
+VM1 = {
+  'name': 'vm1', 'uuid': 'uuid-vm1', 'serial_no': 4, 'admin_state': 'up', 'oper_state': True,
+  'pnode': 'node1.example.com', 'snodes': [], 'os': 'noop', 'hypervisor': 'fake',
+  'hvparams': {'migration_mode': 'live'}, 'custom_hvparams': {},
+  'beparams': {'vcpus': 2, 'memory': 128}, 'custom_beparams': {'vcpus': 2},
+  'disk_template': 'file', 'disk.sizes': [10240], 'disk.names': [None], 'disk.uuids': ['uuid-disk0'],
+  'nic.macs': ['aa:00:00:35:d6:4f'], 'nic.ips': [None], 'nic.modes': ['bridged'],
+  'nic.links': ['br_gnt'], 'nic.names': ['eth0'], 'nic.uuids': ['uuid-nic0'], 'nic.networks': [None],
+}
+
+
+class StubRapiServer:
+  """Stub of RAPI: answer from routes, count connections and requests"""
+
+  def __init__(self, routes, close_after=None, announce_close=True) -> None:
+    self.routes = routes
+    self.requests = []
+    self.connections = 0
+    stub = self
+
+    class Handler(BaseHTTPRequestHandler):
+      protocol_version = 'HTTP/1.1'
+
+      def setup(self):
+        super().setup()
+        stub.connections += 1
+        self.answered = 0
+
+      def log_message(self, *_):
+        pass
+
+      def _answer(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        stub.requests.append((self.command, self.path, body, self.headers.get('Authorization')))
+        route = stub.routes.get((self.command, self.path))
+        status, payload = route(body) if callable(route) else (route or (404, 'Not found'))
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.answered += 1
+        if close_after is not None and self.answered >= close_after:
+          if announce_close:
+            self.send_header('Connection', 'close')
+          self.close_connection = True
+        self.end_headers()
+        self.wfile.write(data)
+
+      do_GET = do_PUT = do_POST = do_DELETE = _answer
+
+    self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    self.port = self.server.server_address[1]
+    threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+  def close(self):
+    self.server.shutdown()
+    self.server.server_close()
+
+
+def no_run(*_, **__):
+  raise AssertionError('No command must be run')
+
+
+class TestRapi(unittest.TestCase):
+
+  def _server(self, routes, **kwargs):
+    server = StubRapiServer(routes, **kwargs)
+    self.addCleanup(server.close)
+    client = RapiClient('127.0.0.1', server.port, username='admin', password='secret', scheme='http')
+    self.addCleanup(client.close)
+    return server, client
+
+  def test_rapi_path(self):
+    self.assertEqual(rapi_path('instances'), '/2/instances')
+    self.assertEqual(rapi_path('instances', 'vm 1', 'reboot', query={'type': 'hard', 'x': None}),
+                     '/2/instances/vm%201/reboot?type=hard')
+
+  def test_connection_kept_alive(self):
+    server, client = self._server({('GET', '/2/info'): (200, {'name': 'cluster'})})
+    for _ in range(3):
+      self.assertEqual(client.request('GET', '/2/info'), {'name': 'cluster'})
+    self.assertEqual(server.connections, 1)
+    self.assertTrue(all(request[3].startswith('Basic ') for request in server.requests))
+
+  def test_request_error(self):
+    _, client = self._server({})
+    with self.assertRaises(RapiError) as error:
+      client.request('GET', '/2/instances/unknown')
+    self.assertEqual(error.exception.code, 404)
+
+  def test_pipeline(self):
+    server, client = self._server({
+      ('GET', '/2/jobs/1'): (200, {'status': 'success'}),
+      ('GET', '/2/jobs/2'): (200, {'status': 'running'}),
+      ('GET', '/2/info'): (200, {'name': 'cluster'}),
+    })
+    self.assertEqual(
+      client.pipeline(['/2/jobs/1', '/2/jobs/2', '/2/jobs/1']),
+      [{'status': 'success'}, {'status': 'running'}, {'status': 'success'}]
+    )
+    # The connection stay usable after the pipeline
+    self.assertEqual(client.request('GET', '/2/info'), {'name': 'cluster'})
+    self.assertEqual(server.connections, 1)
+    self.assertEqual(len(server.requests), 4)
+
+  def test_pipeline_connection_closed_by_server(self):
+    jobs = {
+      ('GET', '/2/jobs/1'): (200, {'status': 'success'}),
+      ('GET', '/2/jobs/2'): (200, {'status': 'running'}),
+    }
+    _, client = self._server(jobs, close_after=1)
+    self.assertEqual(client.request('GET', '/2/jobs/1'), {'status': 'success'})
+    self.assertEqual(client.pipeline(['/2/jobs/1']), [{'status': 'success'}])
+    # The pending responses are requested again on a new connection
+    server, client = self._server(jobs, close_after=2)
+    self.assertEqual(
+      client.pipeline(['/2/jobs/1', '/2/jobs/2', '/2/jobs/1']),
+      [{'status': 'success'}, {'status': 'running'}, {'status': 'success'}]
+    )
+    self.assertEqual(server.connections, 2)
+    self.assertEqual(len(server.requests), 3)
+
+  def test_pipeline_stale_connection_retried(self):
+    server, client = self._server(
+      {('GET', '/2/jobs/1'): (200, {'status': 'success'})}, close_after=1, announce_close=False
+    )
+    self.assertEqual(client.request('GET', '/2/jobs/1'), {'status': 'success'})
+    # The pooled connection is closed by server without notice
+    self.assertEqual(client.pipeline(['/2/jobs/1']), [{'status': 'success'}])
+    self.assertEqual(server.connections, 2)
+
+  def test_rapi_instance_to_info(self):
+    info = rapi_instance_to_info(VM1)
+    self.assertEqual(info['name'], 'vm1')
+    self.assertEqual(info['admin_state'], 'up')
+    self.assertEqual(info['Back-end parameters'], {'memory': 'default (128)', 'vcpus': 2})
+    disks, nics = info['Disks'] or [], info['NICs'] or []
+    self.assertEqual(disks[0]['disk/0'], 'file, size 10.0G')
+    self.assertEqual(nics[0]['link'], 'br_gnt')
+
+  def test_gnt_instance_list_and_info(self):
+    server, client = self._server({
+      ('GET', '/2/query/instance?fields=name%2Cadmin_state%2Coper_state'): (
+        200, {'fields': [], 'data': [[[0, 'vm1'], [0, 'up'], [0, True]]]}
+      ),
+      ('GET', '/2/instances/vm1'): (200, VM1),
+      ('GET', '/2/instances/vm2'): (200, dict(VM1, name='vm2')),
+    })
+    gnt_instance = GntInstanceRapi(no_run, None, client=client)
+    self.assertEqual(
+      [dict(instance) for instance in gnt_instance.live_state()],
+      [{'name': 'vm1', 'admin_state': 'up', 'oper_state': True}]
+    )
+    infos = gnt_instance.info('vm1', 'vm2', static=True)
+    self.assertEqual([info['name'] for info in infos], ['vm1', 'vm2'])
+    self.assertEqual(infos[0]['Operating system'], 'noop')
+    self.assertEqual(infos[0]['Back-end parameters']['vcpus'], 2)
+    self.assertEqual(server.connections, 1)
+
+  def test_gnt_instance_list_with_names(self):
+    server, client = self._server({
+      ('PUT', '/2/query/instance'): (200, {'fields': [], 'data': [[[0, 'vm1'], [0, 'node1']]]}),
+    })
+    gnt_instance = GntInstanceRapi(no_run, None, client=client)
+    self.assertEqual(gnt_instance.primary_nodes('vm1'), {'vm1': 'node1'})
+    self.assertEqual(
+      server.requests[0][2],
+      {'fields': ['name', 'pnode'], 'qfilter': ['|', ['=', 'name', 'vm1']]}
+    )
+
+  def test_gnt_instance_list_lazy(self):
+    _, client = self._server({
+      ('GET', '/2/query/instance?fields=name%2Cpnode'): (200, {'fields': [], 'data': [[[0, 'vm1'], [0, 'node1']]]}),
+    })
+    gnt_instance = GntInstanceRapi(no_run, None, client=client)
+    instances = gnt_instance.list(header_names=['name', 'pnode'], lazy=True)
+    self.assertIsInstance(instances[0], ListRow)
+    self.assertEqual(instances, [{'name': 'vm1', 'pnode': 'node1'}])
+    self.assertEqual(list(gnt_instance.iter_list(header_names=['name', 'pnode'], lazy=True)), instances)
+
+  def test_gnt_instance_list_disk_sizes_like_cli(self):
+    _, client = self._server({
+      ('GET', '/2/query/instance?fields=name%2Cdisk.sizes'): (
+        200, {'fields': [], 'data': [[[0, 'vm1'], [0, [10240, 512]]], [[0, 'vm2'], [2, None]]]}
+      ),
+    })
+    gnt_instance = GntInstanceRapi(no_run, None, client=client)
+    self.assertEqual(
+      gnt_instance.list(header_names=['name', 'disk_sizes']),
+      [{'name': 'vm1', 'disk_sizes': ['10.0G', '512M']}, {'name': 'vm2', 'disk_sizes': None}]
+    )
+
+  def test_gnt_instance_list_request_error(self):
+    _, client = self._server({})
+    self.assertIsNone(GntInstanceRapi(no_run, None, client=client).list(header_names=['name']))
+
+  def test_gnt_instance_jobs(self):
+    statuses = iter(['running', 'success'])
+    server, client = self._server({
+      ('POST', '/2/instances/vm1/reboot?type=hard&shutdown_timeout=0'): (200, '10'),
+      ('PUT', '/2/instances/vm1/shutdown'): (200, '11'),
+      ('GET', '/2/jobs/11'): lambda _: (200, {'status': next(statuses), 'opresult': [None]}),
+      ('DELETE', '/2/instances/vm1'): (200, '12'),
+      ('GET', '/2/jobs/12'): (200, {'status': 'error', 'opresult': ['failed']}),
+    })
+    sleeps = []
+    gnt_instance = GntInstanceRapi(no_run, None, client=client, sleep=sleeps.append)
+    self.assertEqual(gnt_instance.reboot('vm1', submit=True), 10)
+    self.assertIsNone(gnt_instance.stop('vm1', timeout=5))
+    self.assertEqual(len(sleeps), 1)
+    with self.assertRaises(RunCommandException):
+      gnt_instance.remove('vm1')
+    self.assertIn(
+      ('PUT', '/2/instances/vm1/shutdown', {'timeout': 5, 'force': False}), [r[:3] for r in server.requests]
+    )
+    self.assertEqual(server.connections, 1)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,77 @@
+"""Generate the static argument spec of gnt-instance options.
+
+The modules use the static spec, they don't build the builder specification at startup.
+Run after each change of builder specification: make args-spec
+"""
+import os
+import sys
+
+from ansible_collections.lecontesteur.ganeti_cli.plugins.module_utils.gnt_instance import (
+    get_builder_gnt_instance_command,
+)
+
+TARGET = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'ansible_collections', 'lecontesteur', 'ganeti_cli', 'plugins', 'module_utils',
+    'gnt_instance_args_spec.py'
+)
+MAX_LINE_LENGTH = 100
+
+HEADER = '''"""
+Static argument spec of gnt-instance options.
+Generated by tools/generate_args_spec.py from the builder specification, do not edit.
+"""
+
+GNT_INSTANCE_OPTIONS_ARGS_SPEC = '''
+
+
+def render(value, indent: int = 0, offset: int = 0) -> str:
+    """Render the value as python literal, the dict and list which don't fit in line are split
+
+    Args:
+        value (Any): The value
+        indent (int, optional): The indentation of value. Defaults to 0.
+        offset (int, optional): The length of line before the value. Defaults to 0.
+
+    Returns:
+        str: The python literal
+    """
+    inline = repr(value)
+    if not isinstance(value, (dict, list)) or offset + len(inline) + 1 <= MAX_LINE_LENGTH:
+        return inline
+    padding = ' ' * (indent + 4)
+    if isinstance(value, list):
+        lines = ['['] + ['{}{!r},'.format(padding, item) for item in value] + [' ' * indent + ']']
+        return '\n'.join(lines)
+    lines = ['{']
+    for key, item in value.items():
+        prefix = '{}{!r}: '.format(padding, key)
+        lines.append('{}{},'.format(prefix, render(item, indent + 4, len(prefix))))
+    lines.append('{}}}'.format(' ' * indent))
+    return '\n'.join(lines)
+
+
+def generate() -> str:
+    """Generate the content of static argument spec module
+
+    Returns:
+        str: The python module
+    """
+    return HEADER + render(
+        get_builder_gnt_instance_command().generate_args_spec(), offset=len(HEADER.splitlines()[-1])
+    ) + '\n'
+
+
+def main():
+    content = generate()
+    if '--check' in sys.argv[1:]:
+        with open(TARGET, 'r', encoding='utf-8') as target:
+            if target.read() != content:
+                sys.exit('{} is not up to date, run make args-spec'.format(TARGET))
+        return
+    with open(TARGET, 'w', encoding='utf-8') as target:
+        target.write(content)
+
+
+if __name__ == '__main__':
+    main()